@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+
+"""Runs offline end-to-end benchmarks on synthetic NetCDF files.
+
+Each benchmark runs in a fresh Python process, so that its peak resident
+memory (RSS) is measured independently of the others. Throughput is reported
+in source pixels per second, over all variables. Peak RSS includes worker
+processes and requires Linux.
+
+Usage, from the repository root:
+    python -m benchmarks.benchmark [--workdir DIR] [--scale 0.0625]
+        [--tile-dim 4050] [--workers 1] [--json results.json] [BENCHMARK ...]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.synthetic import synthetic_netcdf_path, write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
+
+ROOT = Path(__file__).parent.parent
+
+
+@dataclass
+class Result:
+    name: str
+    seconds: float
+    pixels: Optional[int]
+    peak_rss_bytes: int
+
+    @property
+    def pixels_per_second(self) -> Optional[float]:
+        if self.pixels is None or self.seconds == 0:
+            return None
+        return self.pixels / self.seconds
+
+
+def _tile_pixels(tile_dim: int, tiles: int) -> int:
+    return tile_dim * tile_dim * tiles * len(constants.DATA_VARIABLES)
+
+
+def bench_make_cog_tiles(nc_path: str, out_dir: str, args: Dict[str, Any]) -> int:
+    from stactools.esa_cci_lc.cog.cog import make_cog_tiles
+
+    tiles = make_cog_tiles(
+        nc_path,
+        out_dir,
+        args["tile_dim"],
+        args["tile_col_row"],
+        workers=args["workers"],
+        queue_depth=args["queue_depth"],
+    )
+    return _tile_pixels(args["tile_dim"], len(tiles))
+
+
+def bench_create_items(nc_path: str, out_dir: str, args: Dict[str, Any]) -> int:
+    from stactools.esa_cci_lc.cog.stac import create_items
+
+    items = create_items(
+        nc_path,
+        out_dir,
+        cog_tile_dim=args["tile_dim"],
+        tile_col_row=args["tile_col_row"],
+        workers=args["workers"],
+        queue_depth=args["queue_depth"],
+    )
+    return _tile_pixels(args["tile_dim"], len(items))
+
+
+def bench_netcdf_create_item(nc_path: str, out_dir: str, args: Dict[str, Any]) -> int:
+    from stactools.esa_cci_lc.netcdf.stac import create_item
+
+    create_item(nc_path)
+    # The Item describes the whole grid of every variable
+    height, width = constants.NETCDF_DATA_SHAPE
+    return height * width * len(constants.DATA_VARIABLES)
+
+
+def bench_create_collections(
+    nc_path: str, out_dir: str, args: Dict[str, Any]
+) -> Optional[int]:
+    from stactools.esa_cci_lc.cog.stac import create_collection as cog_collection
+    from stactools.esa_cci_lc.netcdf.stac import create_collection as netcdf_collection
+
+    cog_collection().to_dict()
+    netcdf_collection().to_dict()
+    return None
+
+
+BENCHMARKS: Dict[str, Callable[[str, str, Dict[str, Any]], Optional[int]]] = {
+    "make_cog_tiles": bench_make_cog_tiles,
+    "create_items": bench_create_items,
+    "netcdf_create_item": bench_netcdf_create_item,
+    "create_collections": bench_create_collections,
+}
+
+
+def run_one(name: str, nc_path: str, args: Dict[str, Any]) -> Result:
+    """Runs a single benchmark in this process."""
+    with tempfile.TemporaryDirectory(dir=args["workdir"]) as out_dir:
+        start = time.perf_counter()
+        pixels = BENCHMARKS[name](nc_path, out_dir, args)
+        seconds = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux. Worker processes are included once they
+    # have been waited for.
+    peak_kib = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    return Result(name, seconds, pixels, peak_kib * 1024)
+
+
+def run(names: List[str], nc_path: str, args: Dict[str, Any]) -> List[Result]:
+    """Runs benchmarks, each in a fresh process."""
+    results = []
+    for name in names:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.benchmark", "--run-one", name]
+            + ["--nc-path", nc_path]
+            + [f"--{key.replace('_', '-')}={value}" for key, value in _cli(args)],
+            cwd=ROOT,
+            check=True,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        data = json.loads(completed.stdout.strip().splitlines()[-1])
+        results.append(Result(**data))
+    return results
+
+
+def _cli(args: Dict[str, Any]) -> List[Any]:
+    tile_col_row = args["tile_col_row"]
+    return [
+        ("workdir", args["workdir"]),
+        ("tile_dim", args["tile_dim"]),
+        ("workers", args["workers"]),
+        ("queue_depth", args["queue_depth"]),
+        (
+            "tile_col_row",
+            "all" if tile_col_row is None else ",".join(map(str, tile_col_row)),
+        ),
+    ]
+
+
+def print_table(results: List[Result]) -> None:
+    print(f"{'benchmark':<22}{'seconds':>10}{'Mpixels/s':>12}{'peak RSS MiB':>14}")
+    for result in results:
+        throughput = result.pixels_per_second
+        rate = "-" if throughput is None else f"{throughput / 1e6:.1f}"
+        print(
+            f"{result.name:<22}{result.seconds:>10.2f}{rate:>12}"
+            f"{result.peak_rss_bytes / 1024**2:>14.0f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "benchmarks",
+        nargs="*",
+        help=f"Benchmarks to run, defaults to all: {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument(
+        "--workdir",
+        default=str(Path(tempfile.gettempdir()) / "esa-cci-lc-benchmarks"),
+        help="Directory for the synthetic NetCDF file and outputs. An existing "
+        "synthetic file of the same scale is reused.",
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1 / 16,
+        help="Fraction of each grid dimension filled with data, default 1/16",
+    )
+    parser.add_argument("--tile-dim", type=int, default=4050)
+    parser.add_argument(
+        "--tile-col-row",
+        default="0,0",
+        help="Tile to create, as 'column,row', or 'all' for the whole grid",
+    )
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument(
+        "--queue-depth",
+        type=int,
+        default=constants.QUEUE_DEPTH,
+        help="Queue depth of the tiling pipeline, 0 to read and encode in turn",
+    )
+    parser.add_argument("--json", help="Optional path to write the results to")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)
+    parser.add_argument("--nc-path", help=argparse.SUPPRESS)
+    parsed = parser.parse_args()
+    unknown = set(parsed.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    args = {
+        "workdir": parsed.workdir,
+        "tile_dim": parsed.tile_dim,
+        "tile_col_row": (
+            None
+            if parsed.tile_col_row == "all"
+            else [int(index) for index in parsed.tile_col_row.split(",")]
+        ),
+        "workers": parsed.workers,
+        "queue_depth": parsed.queue_depth,
+    }
+
+    if parsed.run_one:
+        result = run_one(parsed.run_one, parsed.nc_path, args)
+        print(json.dumps(asdict(result)))
+        return
+
+    Path(parsed.workdir).mkdir(parents=True, exist_ok=True)
+    nc_dir = str(Path(parsed.workdir) / f"scale-{parsed.scale:g}")
+    nc_path = synthetic_netcdf_path(nc_dir, 2018, constants.V2)
+    if not Path(nc_path).exists():
+        print(f"Writing synthetic NetCDF file {nc_path}", file=sys.stderr)
+        # Written next to its final location first, so that an interrupted
+        # write is never reused
+        with tempfile.TemporaryDirectory(dir=parsed.workdir) as tmp_dir:
+            tmp_path = write_synthetic_netcdf(tmp_dir, scale=parsed.scale)
+            Path(nc_dir).mkdir(exist_ok=True)
+            Path(tmp_path).replace(nc_path)
+
+    results = run(parsed.benchmarks or list(BENCHMARKS), nc_path, args)
+    print_table(results)
+    if parsed.json:
+        with open(parsed.json, "w") as f:
+            json.dump(
+                [
+                    {**asdict(result), "pixels_per_second": result.pixels_per_second}
+                    for result in results
+                ],
+                f,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+"""Measures the startup cost of the plugin, i.e., importing it and creating
+its command tree, which the stactools CLI does for every command.
+
+Each run is a fresh Python process, in which click is imported beforehand as
+the CLI has imported it already. The fastest run is compared against a time
+budget, and the run fails if the budget is exceeded or if any module that
+should only be imported when an esa-cci-lc subcommand runs was imported.
+
+Usage, from the repository root:
+    python -m benchmarks.startup [--repeat 5] [--budget 0.1]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Set
+
+ROOT = Path(__file__).parent.parent
+# Budget for importing the plugin and creating its command tree
+STARTUP_BUDGET_SECONDS = 0.1
+# Modules that are only imported when a subcommand runs
+LAZY_MODULES = [
+    "netCDF4",
+    "numpy",
+    "pystac",
+    "rasterio",
+    "shapely",
+    "stactools.core",
+    "stactools.esa_cci_lc.cog",
+    "stactools.esa_cci_lc.netcdf",
+    "stactools.esa_cci_lc.zarr",
+    "zarr",
+]
+
+_STARTUP_SCRIPT = """
+import json
+import sys
+import time
+
+import click
+
+start = time.perf_counter()
+from stactools.esa_cci_lc import commands
+
+commands.create_esaccilc_command(click.Group())
+seconds = time.perf_counter() - start
+print(json.dumps({"seconds": seconds, "modules": sorted(sys.modules)}))
+"""
+
+
+@dataclass
+class StartupResult:
+    seconds: float
+    lazy_modules_imported: List[str]
+
+
+def measure_startup(repeat: int = 5) -> StartupResult:
+    """Measures the plugin startup in fresh processes.
+
+    Args:
+        repeat (int): Number of runs.
+
+    Returns:
+        StartupResult: The time of the fastest run, and the modules of
+            ``LAZY_MODULES`` that were imported.
+    """
+    times = []
+    imported: Set[str] = set()
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-c", _STARTUP_SCRIPT],
+            cwd=ROOT,
+            check=True,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        data = json.loads(completed.stdout.strip().splitlines()[-1])
+        times.append(data["seconds"])
+        imported.update(name for name in data["modules"] if _is_lazy(name))
+    return StartupResult(min(times), sorted(imported))
+
+
+def _is_lazy(name: str) -> bool:
+    return any(name == lazy or name.startswith(f"{lazy}.") for lazy in LAZY_MODULES)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=STARTUP_BUDGET_SECONDS,
+        help=f"Time budget in seconds, default {STARTUP_BUDGET_SECONDS}",
+    )
+    parsed = parser.parse_args()
+
+    result = measure_startup(parsed.repeat)
+    print(
+        f"startup {result.seconds * 1000:.1f} ms, budget {parsed.budget * 1000:.0f} ms"
+    )
+    failed = False
+    if result.lazy_modules_imported:
+        print(f"Imported at startup: {', '.join(result.lazy_modules_imported)}")
+        failed = True
+    if result.seconds > parsed.budget:
+        print("Startup exceeds the budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
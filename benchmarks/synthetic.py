@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+
+"""Writes synthetic ESA CCI Land Cover NetCDF files for offline benchmarks.
+
+The files have the real data shape, variable names, data types, chunking and
+global attributes, so that they can be used wherever a real file is expected.
+Only a configurable fraction of the grid is filled with synthetic data, the
+remaining chunks hold the fill values and are never written, which keeps
+files small and quick to create.
+
+Usage, from the repository root:
+    python -m benchmarks.synthetic OUTPUT_DIR [--scale 0.0625] [--year 2018]
+"""
+
+import argparse
+import math
+from datetime import date
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from netCDF4 import Dataset
+
+from stactools.esa_cci_lc import classes, constants
+
+CHUNK_SIZE = 2025
+# Edge length in pixels of the patches of a single synthetic value, which give
+# the data a spatial structure that compresses similar to real data
+PATCH_SIZE = 15
+
+# Data type and fill value of each variable in the source NetCDF files
+VARIABLES: Dict[str, Tuple[str, int]] = {
+    "change_count": ("u1", 0),
+    "current_pixel_state": ("i1", -1),
+    "lccs_class": ("u1", 0),
+    "observation_count": ("u2", 0),
+    "processed_flag": ("i1", -1),
+}
+LONG_NAMES = {
+    "change_count": "number of class changes",
+    "current_pixel_state": "LC pixel type mask",
+    "lccs_class": "Land cover class defined in LCCS",
+    "observation_count": "number of valid observations",
+    "processed_flag": "LC map processed area flag",
+}
+FILE_NAMES = {
+    constants.V1: "ESACCI-LC-L4-LCCS-Map-300m-P1Y-{year}-v2.0.7cds.nc",
+    constants.V2: "C3S-LC-L4-LCCS-Map-300m-P1Y-{year}-v2.1.1.nc",
+}
+
+
+def synthetic_netcdf_path(output_dir: str, year: int, version: str) -> str:
+    """Returns the path of a synthetic NetCDF file named like a real one."""
+    return str(Path(output_dir) / FILE_NAMES[version].format(year=year))
+
+
+def write_synthetic_netcdf(
+    output_dir: str,
+    year: int = 2018,
+    version: str = constants.V2,
+    scale: float = 1 / 16,
+    seed: int = 0,
+    shape: Optional[Sequence[int]] = None,
+) -> str:
+    """Writes a synthetic NetCDF file.
+
+    Args:
+        output_dir (str): Directory of the file, which is named like a real
+            file of the given year and version.
+        year (int): Year of the land cover map.
+        version (str): Product version, one of ``constants.VERSIONS``.
+        scale (float): Fraction of each grid dimension, starting at the upper
+            left corner, that is filled with synthetic data. Rounded up to
+            whole chunks. 1 fills the whole grid.
+        seed (int): Seed of the random data.
+        shape (Optional[Sequence[int]]): Height and width of the global grid,
+            with square pixels the width is twice the height. Defaults to the
+            real data shape, smaller grids give quick tests.
+
+    Returns:
+        str: Path to the written file.
+    """
+    if not 0 < scale <= 1:
+        raise ValueError(f"Scale must be in (0, 1], got '{scale}'.")
+    if version not in constants.VERSIONS:
+        raise ValueError(f"Unsupported version '{version}'.")
+
+    if shape is None:
+        shape = constants.NETCDF_DATA_SHAPE
+    height, width = shape
+    path = synthetic_netcdf_path(output_dir, year, version)
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    with Dataset(path, "w", format="NETCDF4") as dataset:
+        _write_header(dataset, year, version, height, width)
+        chunk_rows = math.ceil(height * scale / CHUNK_SIZE)
+        chunk_cols = math.ceil(width * scale / CHUNK_SIZE)
+        rng = np.random.default_rng(seed)
+        for chunk_row in range(chunk_rows):
+            for chunk_col in range(chunk_cols):
+                rows = slice(chunk_row * CHUNK_SIZE, (chunk_row + 1) * CHUNK_SIZE)
+                cols = slice(chunk_col * CHUNK_SIZE, (chunk_col + 1) * CHUNK_SIZE)
+                for variable, data in _chunk_data(rng).items():
+                    chunk_height = len(range(height)[rows])
+                    chunk_width = len(range(width)[cols])
+                    dataset.variables[variable][0, rows, cols] = data[
+                        :chunk_height, :chunk_width
+                    ]
+    return path
+
+
+def _write_header(
+    dataset: Dataset, year: int, version: str, height: int, width: int
+) -> None:
+    resolution = 180 / height
+
+    dataset.id = Path(FILE_NAMES[version].format(year=year)).stem
+    dataset.product_version = version
+    dataset.time_coverage_start = f"{year}0101"
+    dataset.time_coverage_end = f"{year}1231"
+    dataset.history = (
+        "amorgos-4,0, lc-sdr-1.0, lc-sr-1.0, lc-classification-1.0,"
+        "lc-user-tools-3.13,lc-user-tools-4.3"
+    )
+    dataset.source = "MERIS FR L1B version 5.05, MERIS RR L1B version 8.0, SPOT VGT P"
+    dataset.creation_date = f"{year + 1}0710T071532Z"
+
+    dataset.createDimension("time", 1)
+    dataset.createDimension("lat", height)
+    dataset.createDimension("lon", width)
+    dataset.createDimension("bounds", 2)
+
+    crs = dataset.createVariable("crs", "i4")
+    crs.wkt = (
+        'GEOGCS["WGS 84",DATUM["WGS_1984",SPHEROID["WGS 84",6378137,298.257223563]],'
+        'PRIMEM["Greenwich",0],UNIT["degree",0.0174532925199433]]'
+    )
+    crs.i2m = f"{resolution},0.0,0.0,-{resolution},-180.0,90.0"
+
+    time = dataset.createVariable("time", "i4", ("time",))
+    time.standard_name = "time"
+    time.long_name = "time"
+    time.units = "days since 1970-01-01 00:00:00"
+    time.axis = "T"
+    time[:] = [(date(year, 1, 1) - date(1970, 1, 1)).days]
+
+    lat = dataset.createVariable("lat", "f8", ("lat",))
+    lat.standard_name = "latitude"
+    lat.long_name = "latitude"
+    lat.units = "degrees_north"
+    lat.axis = "Y"
+    lat.valid_min = -90.0
+    lat.valid_max = 90.0
+    lat[:] = 90 - resolution / 2 - np.arange(height) * resolution
+
+    lon = dataset.createVariable("lon", "f8", ("lon",))
+    lon.standard_name = "longitude"
+    lon.long_name = "longitude"
+    lon.units = "degrees_east"
+    lon.axis = "X"
+    lon.valid_min = -180.0
+    lon.valid_max = 180.0
+    lon[:] = -180 + resolution / 2 + np.arange(width) * resolution
+
+    for variable, (dtype, fill_value) in VARIABLES.items():
+        var = dataset.createVariable(
+            variable,
+            dtype,
+            ("time", "lat", "lon"),
+            zlib=True,
+            complevel=1,
+            chunksizes=(1, min(CHUNK_SIZE, height), min(CHUNK_SIZE, width)),
+            fill_value=fill_value,
+        )
+        var.long_name = LONG_NAMES[variable]
+
+
+def _chunk_data(rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """Creates synthetic data of a single chunk for every variable."""
+    patches = math.ceil(CHUNK_SIZE / PATCH_SIZE)
+    lccs_values = np.array([row[0] for row in classes.TABLE if row[0] != 0])
+    pixel_states = np.array([row[0] for row in classes.CURRENT_PIXEL_STATE_TABLE])
+
+    def patched(values: np.ndarray) -> np.ndarray:
+        data = np.repeat(np.repeat(values, PATCH_SIZE, axis=0), PATCH_SIZE, axis=1)
+        return data[:CHUNK_SIZE, :CHUNK_SIZE]
+
+    shape = (patches, patches)
+    return {
+        "change_count": patched(rng.integers(0, 4, shape, dtype=np.uint8)),
+        "current_pixel_state": patched(rng.choice(pixel_states, shape).astype(np.int8)),
+        "lccs_class": patched(rng.choice(lccs_values, shape).astype(np.uint8)),
+        # Observation counts vary per pixel, like in the real data
+        "observation_count": rng.integers(
+            0, 400, (CHUNK_SIZE, CHUNK_SIZE), dtype=np.uint16
+        ),
+        "processed_flag": patched(
+            rng.choice(np.array([0, 1], dtype=np.int8), shape, p=[0.05, 0.95])
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("output_dir", help="Directory of the NetCDF file")
+    parser.add_argument("--year", type=int, default=2018)
+    parser.add_argument("--version", choices=constants.VERSIONS, default=constants.V2)
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1 / 16,
+        help="Fraction of each grid dimension filled with data, default 1/16",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(
+        write_synthetic_netcdf(
+            args.output_dir, args.year, args.version, args.scale, args.seed
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
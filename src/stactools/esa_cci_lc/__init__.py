@@ -1,10 +1,12 @@
-import stactools.core
-from stactools.cli.registry import Registry
+from typing import TYPE_CHECKING
 
-stactools.core.use_fsspec()
+if TYPE_CHECKING:
+    from stactools.cli.registry import Registry
 
 
-def register_plugin(registry: Registry) -> None:
+def register_plugin(registry: "Registry") -> None:
+    # Subcommands and their dependencies are imported when they are used, so
+    # that registering the plugin doesn't slow down the start of every command
     from stactools.esa_cci_lc import commands
 
     registry.register_subcommand(commands.create_esaccilc_command)
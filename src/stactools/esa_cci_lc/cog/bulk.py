@@ -0,0 +1,263 @@
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pystac
+from pystac import Asset, Item
+from pystac.extensions.projection import ProjectionExtension
+from pystac.utils import datetime_to_str, make_absolute_href
+from stactools.core.io import ReadHrefModifier
+
+from .. import constants, profiling
+from .cog import create_cog_asset, iter_cog_tiles_batch
+from .preview import create_preview_asset
+from .stac import check_asset_list, map_cog_tiles, netcdf_item_href, tile_metadata
+from .statistics import BandStatistics
+
+
+class ItemDictFactory:
+    """Creates COG tile Items as plain STAC Item dicts, for bulk output to
+    NDJSON or stac-geoparquet, without building pystac objects.
+
+    Everything that is the same for all tiles, i.e., the asset dicts with
+    their classification classes, raster bands and media types, the STAC
+    extensions and the projection code, is computed once through pystac
+    when the factory is created. Each Item then only fills in the fields of
+    its tile, so the dicts are equal to the output of
+    :func:`stactools.esa_cci_lc.cog.stac.create_item_from_asset_list` with
+    ``to_dict(include_self_link=False, transform_hrefs=False)``.
+
+    Values of the templates that don't depend on the tile, e.g., the
+    classification classes of an asset without statistics, are shared by
+    all created dicts and must not be modified in place.
+    """
+
+    def __init__(self) -> None:
+        template = _template_item()
+        ProjectionExtension.ext(template, add_if_missing=True)
+        # The key order of pystac's serialization, which differs between
+        # pystac versions
+        self.keys = list(template.to_dict(include_self_link=False))
+        self.stac_version = pystac.get_stac_version()
+        self.stac_extensions = template.stac_extensions + [
+            constants.CLASSIFICATION_EXTENSION,
+            constants.RASTER_EXTENSION,
+        ]
+        self.assets = {
+            key: _asset_template(create_cog_asset(key)) for key in constants.COG_ASSETS
+        }
+        self.assets.update(
+            {
+                key: _asset_template(create_preview_asset(key))
+                for key in constants.PREVIEW_ASSETS
+            }
+        )
+        self._epsg_properties: Dict[int, Dict[str, Any]] = {}
+
+    def create_item_dict(
+        self,
+        cog_hrefs: List[str],
+        *,
+        nc_api_url: Optional[str] = None,
+        read_href_modifier: Optional[ReadHrefModifier] = None,
+        cog_tile_dim: Optional[int] = None,
+        verify_fraction: float = 0.0,
+        statistics: Optional[Dict[str, BandStatistics]] = None,
+        preview_hrefs: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """Generates a STAC Item dict from a list of HREFs to a single tile's
+        COGs.
+
+        Takes the same arguments as
+        :func:`stactools.esa_cci_lc.cog.stac.create_item_from_asset_list`.
+
+        Returns:
+            Dict[str, Any]: The STAC Item dict.
+        """
+        check_asset_list(cog_hrefs, verify_fraction)
+
+        with profiling.stage("item") as record:
+            metadata = tile_metadata(
+                cog_hrefs, read_href_modifier, cog_tile_dim, verify_fraction
+            )
+            properties = {
+                "start_datetime": metadata.start_datetime,
+                "end_datetime": metadata.end_datetime,
+                "esa_cci_lc:version": metadata.version,
+                "esa_cci_lc:tile": metadata.tile,
+                "created": datetime_to_str(datetime.now(tz=timezone.utc)),
+                "title": metadata.title,
+                **self._projection_code(metadata.epsg),
+                "proj:shape": metadata.proj_shape,
+                "proj:transform": metadata.proj_transform,
+                "datetime": None,
+            }
+
+            statistics = statistics or {}
+            assets = {}
+            for cog_href in cog_hrefs:
+                key = Path(cog_href).stem.split("-")[-1]
+                assets[key] = self._cog_asset(key, cog_href, statistics.get(key))
+            for key, href in (preview_hrefs or {}).items():
+                assets[key] = dict(self.assets[key], href=make_absolute_href(href))
+
+            links = []
+            if nc_api_url:
+                links.append(
+                    {
+                        "rel": "derived_from",
+                        "href": netcdf_item_href(cog_hrefs[0], nc_api_url),
+                        "type": pystac.MediaType.JSON,
+                        "title": "Source NetCDF",
+                    }
+                )
+
+            record.tile = metadata.tile
+            record.pixels = (
+                metadata.proj_shape[0] * metadata.proj_shape[1] * len(cog_hrefs)
+            )
+
+        item_dict = {
+            "type": "Feature",
+            "stac_version": self.stac_version,
+            "stac_extensions": list(self.stac_extensions),
+            "id": metadata.id,
+            "geometry": metadata.geometry,
+            "bbox": metadata.bbox,
+            "properties": properties,
+            "links": links,
+            "assets": assets,
+        }
+        return {key: item_dict[key] for key in self.keys}
+
+    def _cog_asset(
+        self, key: str, cog_href: str, statistics: Optional[BandStatistics]
+    ) -> Dict[str, Any]:
+        asset = dict(self.assets[key], href=make_absolute_href(cog_href))
+        if statistics is not None:
+            # Only the values that differ between tiles are copied
+            band = dict(asset["raster:bands"][0], statistics=statistics.to_raster())
+            asset["raster:bands"] = [band]
+            if "classification:classes" in asset:
+                stac_classes = [dict(c) for c in asset["classification:classes"]]
+                statistics.add_counts(stac_classes)
+                asset["classification:classes"] = stac_classes
+        return asset
+
+    def _projection_code(self, epsg: int) -> Dict[str, Any]:
+        # Older versions of the projection extension hold an 'epsg' code
+        # rather than a 'code' string, so the property is taken from pystac
+        if epsg not in self._epsg_properties:
+            template = _template_item()
+            ProjectionExtension.ext(template, add_if_missing=True).epsg = epsg
+            self._epsg_properties[epsg] = {
+                k: v for k, v in template.properties.items() if k.startswith("proj:")
+            }
+        return self._epsg_properties[epsg]
+
+
+@lru_cache(maxsize=None)
+def get_item_dict_factory() -> ItemDictFactory:
+    """Returns the :class:`ItemDictFactory` of this process, whose templates
+    are created on the first call.
+
+    Returns:
+        ItemDictFactory: The factory.
+    """
+    return ItemDictFactory()
+
+
+def iter_item_dicts_batch(
+    nc_paths: List[str],
+    cog_dir: str,
+    *,
+    cog_tile_dim: int = constants.COG_TILE_DIM,
+    tile_col_row: Optional[List[int]] = None,
+    nc_api_url: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    constant_tiles: str = "encode",
+    queue_depth: int = constants.QUEUE_DEPTH,
+    resume: bool = False,
+    bbox: Optional[List[float]] = None,
+    aoi: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Tiles the NetCDF variables of one or more files to COGs and yields a
+    STAC Item dict for each tile, as created by :class:`ItemDictFactory`.
+
+    Takes the same arguments as
+    :func:`stactools.esa_cci_lc.cog.stac.iter_items_batch`.
+
+    Returns:
+        Iterator[Dict[str, Any]]: The STAC Item dicts, file by file in the
+            given order and in tile grid order within a file.
+    """
+    factory = get_item_dict_factory()
+    for cog_tile in iter_cog_tiles_batch(
+        nc_paths,
+        cog_dir,
+        cog_tile_dim,
+        tile_col_row,
+        workers=workers,
+        max_memory=max_memory,
+        constant_tiles=constant_tiles,
+        queue_depth=queue_depth,
+        resume=resume,
+        bbox=bbox,
+        aoi=aoi,
+    ):
+        yield factory.create_item_dict(
+            cog_tile.hrefs,
+            nc_api_url=nc_api_url,
+            cog_tile_dim=cog_tile_dim,
+            statistics=cog_tile.statistics,
+            preview_hrefs=cog_tile.previews,
+        )
+
+
+def iter_item_dicts_from_cogs(
+    cog_hrefs: Iterable[str],
+    *,
+    nc_api_url: Optional[str] = None,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    cog_tile_dim: Optional[int] = None,
+    verify_fraction: float = 0.0,
+    threads: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Creates a STAC Item dict for each tile of existing COGs on a thread
+    pool and yields them in order.
+
+    Takes the same arguments as
+    :func:`stactools.esa_cci_lc.cog.stac.create_items_from_cogs`.
+
+    Returns:
+        Iterator[Dict[str, Any]]: The STAC Item dicts, sorted by ID.
+    """
+    return map_cog_tiles(
+        partial(
+            get_item_dict_factory().create_item_dict,
+            nc_api_url=nc_api_url,
+            read_href_modifier=read_href_modifier,
+            cog_tile_dim=cog_tile_dim,
+            verify_fraction=verify_fraction,
+        ),
+        cog_hrefs,
+        threads,
+    )
+
+
+def _template_item() -> Item:
+    # With a geometry and bbox, so that they are part of the serialization
+    return Item(
+        "template",
+        {"type": "Point", "coordinates": [0.0, 0.0]},
+        [0.0, 0.0, 0.0, 0.0],
+        datetime.now(tz=timezone.utc),
+        {},
+    )
+
+
+def _asset_template(asset: Dict[str, Any]) -> Dict[str, Any]:
+    # The key order of pystac's serialization, with a placeholder HREF
+    return Asset.from_dict(dict(asset, href="")).to_dict()
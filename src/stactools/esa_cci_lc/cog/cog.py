@@ -1,32 +1,94 @@
+import itertools
 import logging
-from dataclasses import dataclass
+import multiprocessing
+import os
+import queue
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from contextlib import ExitStack, closing
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, Generator, Iterator, List, Optional, Tuple, cast
 
 import numpy as np
 import rasterio
 import rasterio.crs
 import rasterio.shutil
 from pystac.utils import make_absolute_href
-from rasterio.io import MemoryFile
+from rasterio.io import DatasetReader, DatasetWriter
+from rasterio.transform import Affine
 from rasterio.windows import Window
 from shapely.geometry import box, mapping
 from stactools.core.io import ReadHrefModifier
 
-from .. import classes, constants
+from .. import classes, constants, profiling
+from ..profiling import StageRecord
+from .grid import TileGrid, geometry_from_geojson, get_tile_grid
+from .manifest import CogRecord, TilingManifest
+from .memory import NETCDF_CHUNK_HEIGHT, plan_memory
+from .preview import PreviewSampler, preview_paths
+from .statistics import BandStatistics, StatisticsAccumulator
+from .transforms import COLORMAP, TRANSFORMS
 
 logger = logging.getLogger(__name__)
 
+# A strip window with the data and read seconds of each variable
+_Strip = Tuple[Window, Dict[str, np.ndarray], Dict[str, float]]
+
 COG_PROFILE = {
     "compress": "deflate",
     "blocksize": 512,
     "driver": "COG",
     "overview_resampling": "average",
 }
+CONSTANT_TILE_POLICIES = constants.CONSTANT_TILE_POLICIES
+# Used for COGs of constant windows, which don't benefit from overviews
+COMPACT_COG_PROFILE = {
+    "overview_count": 1,
+}
+SCRATCH_PROFILE = {
+    "driver": "GTiff",
+    "tiled": True,
+    "blockxsize": 512,
+    "blockysize": 512,
+    "compress": "lzw",
+}
+
+
+@dataclass(frozen=True)
+class CogTile:
+    """The COGs created for a single tile, in ``constants.DATA_VARIABLES``
+    order, the band statistics of each variable computed while creating them,
+    and the preview images of the tile, keyed by asset key."""
+
+    tile: str
+    hrefs: List[str]
+    resumed: bool = False
+    statistics: Dict[str, BandStatistics] = field(default_factory=dict)
+    previews: Dict[str, str] = field(default_factory=dict)
 
 
 def make_cog_tiles(
-    nc_path: str, cog_dir: str, tile_dim: int, tile_col_row: Optional[List[int]] = None
+    nc_path: str,
+    cog_dir: str,
+    tile_dim: int,
+    tile_col_row: Optional[List[int]] = None,
+    workers: Optional[int] = None,
+    strip_height: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    constant_tiles: str = "encode",
+    resume: bool = False,
+    bbox: Optional[List[float]] = None,
+    aoi: Optional[Dict[str, Any]] = None,
+    queue_depth: int = constants.QUEUE_DEPTH,
 ) -> List[List[str]]:
     """Generates tiled COGs from NetCDF variables. There are five variables of
     interest, so five COGs are generated for each tile.
@@ -39,134 +101,1220 @@ def make_cog_tiles(
         tile_col_row (Optional[List[int]]): Optional tile grid column and row
             indices. Use to create an Item and COGs for a single tile. Indices
             are 0 based.
+        workers (Optional[int]): Number of worker processes. With more than
+            one worker, each (variable, tile) COG is created in a separate job
+            on a process pool. Defaults to 1, i.e., all COGs are created in this
+            process, unless ``max_memory`` is given.
+        strip_height (Optional[int]): Number of rows read and written at a
+            time when creating a COG. Defaults to the NetCDF chunk height.
+        max_memory (Optional[int]): Optional memory budget in bytes. If given,
+            the strip height, the number of workers (up to ``workers`` or the
+            number of CPUs) and the number of tiles in flight are planned to
+            stay within the budget.
+        constant_tiles (str): How to handle windows in which a variable holds
+            a single value. One of ``CONSTANT_TILE_POLICIES``: "encode" creates
+            the COG as usual, "compact" creates it with a single overview
+            level, and "skip" creates no COGs at all for a tile in which every
+            variable is constant. Skipped tiles are recorded in the tiling
+            manifest and left out of the result. Defaults to "encode".
+        resume (bool): Whether to resume an earlier run. Every completed COG
+            is recorded with its size and checksum in the tiling manifest in
+            ``cog_dir``. When resuming, COGs that match their record are kept
+            and only missing or partially written COGs are created. Skipped
+            tiles are not checked again with the "skip" policy.
+        bbox (Optional[List[float]]): Optional west, south, east and north
+            coordinates in degrees. Use to create COGs for the tiles
+            intersecting the bounding box only.
+        aoi (Optional[Dict[str, Any]]): Optional GeoJSON geometry, Feature or
+            FeatureCollection. Use to create COGs for the tiles intersecting
+            the area of interest only.
+        queue_depth (int): Depth of the queues between the stages of the
+            tiling pipeline. A reader thread reads up to ``queue_depth``
+            strips ahead of their processing, and with a single worker up to
+            ``queue_depth`` tiles are encoded to COGs on encoder threads while
+            the next tiles are read, so that reading and encoding overlap.
+            Each queued strip holds a strip of every variable in memory. 0
+            runs every stage in turn. Defaults to ``constants.QUEUE_DEPTH``.
 
     Returns:
         List[List[str]]: List of lists of tiled COG paths. Each inner list
             contains the five COG paths for a single tile.
     """
-    windows = get_windows(tile_dim, tile_col_row)
-    cog_paths: Dict[str, List[str]] = {window["tile"]: [] for window in windows}
-    for variable in constants.DATA_VARIABLES:
-        with rasterio.open(f"netcdf:{nc_path}:{variable}") as src:
+    return [
+        cog_tile.hrefs
+        for cog_tile in iter_cog_tiles(
+            nc_path,
+            cog_dir,
+            tile_dim,
+            tile_col_row,
+            workers=workers,
+            strip_height=strip_height,
+            max_memory=max_memory,
+            constant_tiles=constant_tiles,
+            resume=resume,
+            bbox=bbox,
+            aoi=aoi,
+            queue_depth=queue_depth,
+        )
+    ]
+
+
+def iter_cog_tiles(
+    nc_path: str,
+    cog_dir: str,
+    tile_dim: int,
+    tile_col_row: Optional[List[int]] = None,
+    workers: Optional[int] = None,
+    strip_height: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    constant_tiles: str = "encode",
+    resume: bool = False,
+    bbox: Optional[List[float]] = None,
+    aoi: Optional[Dict[str, Any]] = None,
+    queue_depth: int = constants.QUEUE_DEPTH,
+) -> Iterator[CogTile]:
+    """Generates tiled COGs from NetCDF variables tile by tile, yielding each
+    tile as soon as its five COGs exist.
+
+    Tiles are processed in tile-major order: the five variables are opened
+    once and all five are read together for a tile's window, strip by strip,
+    before the COGs are encoded and the next window is processed. Each region
+    of the NetCDF file is thus read in a single pass and the working set is
+    bounded by a single strip. The band statistics and class pixel counts of
+    each COG, and the thumbnail and preview images of the land cover classes,
+    are made from the same strips.
+
+    Args:
+        nc_path (str): Local path to NetCDF file.
+        cog_dir (str): Local directory to store created COGs.
+        tile_dim (int): COG tile dimension in pixels.
+        tile_col_row (Optional[List[int]]): Optional tile grid column and row
+            indices. Use to create COGs for a single tile. Indices are 0 based.
+        workers (Optional[int]): Number of worker processes. With more than
+            one worker, each (variable, tile) COG is created in a separate job
+            on a process pool and tiles are yielded in grid order once all
+            their jobs are done. Defaults to 1, unless ``max_memory`` is given.
+        strip_height (Optional[int]): Number of rows read and written at a
+            time when creating a COG. Defaults to the NetCDF chunk height.
+        max_memory (Optional[int]): Optional memory budget in bytes. If given,
+            the strip height, the number of workers (up to ``workers`` or the
+            number of CPUs) and the number of tiles in flight are planned to
+            stay within the budget. An explicit ``strip_height`` takes
+            precedence over the planned one.
+        constant_tiles (str): How to handle windows in which a variable holds
+            a single value, see :func:`make_cog_tiles`. Defaults to "encode".
+        resume (bool): Whether to resume an earlier run, see
+            :func:`make_cog_tiles`. Tiles whose COGs are all complete are
+            yielded with ``resumed`` set.
+        bbox (Optional[List[float]]): Optional bounding box, see
+            :func:`make_cog_tiles`.
+        aoi (Optional[Dict[str, Any]]): Optional GeoJSON area of interest,
+            see :func:`make_cog_tiles`.
+        queue_depth (int): Depth of the queues between the stages of the
+            tiling pipeline, see :func:`make_cog_tiles`.
+
+    Returns:
+        Iterator[CogTile]: The created COGs and their statistics for each
+            tile, in grid order. Statistics of resumed COGs are taken from the
+            tiling manifest and are missing if it has none.
+    """
+    yield from iter_cog_tiles_batch(
+        [nc_path],
+        cog_dir,
+        tile_dim,
+        tile_col_row,
+        workers=workers,
+        strip_height=strip_height,
+        max_memory=max_memory,
+        constant_tiles=constant_tiles,
+        resume=resume,
+        bbox=bbox,
+        aoi=aoi,
+        queue_depth=queue_depth,
+    )
+
+
+def iter_cog_tiles_batch(
+    nc_paths: List[str],
+    cog_dir: str,
+    tile_dim: int,
+    tile_col_row: Optional[List[int]] = None,
+    workers: Optional[int] = None,
+    strip_height: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    constant_tiles: str = "encode",
+    resume: bool = False,
+    bbox: Optional[List[float]] = None,
+    aoi: Optional[Dict[str, Any]] = None,
+    queue_depth: int = constants.QUEUE_DEPTH,
+) -> Iterator[CogTile]:
+    """Generates tiled COGs from the NetCDF variables of several files, e.g.,
+    one per year, as a single run.
+
+    The tile grid and memory plan are computed once for all files. With more
+    than one worker, the (file, tile, variable) COGs of all files share a
+    single process pool queue, so workers don't idle between files.
+
+    Args:
+        nc_paths (List[str]): Local paths to NetCDF files. File names must be
+            unique, since COG names are derived from them.
+        cog_dir (str): Local directory to store created COGs.
+        tile_dim (int): COG tile dimension in pixels.
+        tile_col_row (Optional[List[int]]): Optional tile grid column and row
+            indices. Use to create COGs for a single tile of each file.
+        workers (Optional[int]): Number of worker processes, see
+            :func:`iter_cog_tiles`.
+        strip_height (Optional[int]): Number of rows read and written at a
+            time when creating a COG. Defaults to the NetCDF chunk height.
+        max_memory (Optional[int]): Optional memory budget in bytes, see
+            :func:`iter_cog_tiles`.
+        constant_tiles (str): How to handle windows in which a variable holds
+            a single value, see :func:`make_cog_tiles`. Defaults to "encode".
+        resume (bool): Whether to resume an earlier run, see
+            :func:`make_cog_tiles`.
+        bbox (Optional[List[float]]): Optional bounding box, see
+            :func:`make_cog_tiles`.
+        aoi (Optional[Dict[str, Any]]): Optional GeoJSON area of interest,
+            see :func:`make_cog_tiles`.
+        queue_depth (int): Depth of the queues between the stages of the
+            tiling pipeline, see :func:`make_cog_tiles`.
+
+    Returns:
+        Iterator[CogTile]: The created COGs for each tile, file by file in the
+            given order and in grid order within a file.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError(f"Number of workers must be at least 1, got '{workers}'.")
+    if constant_tiles not in CONSTANT_TILE_POLICIES:
+        raise ValueError(
+            f"Invalid constant tile policy '{constant_tiles}'. Valid policies "
+            f"are {', '.join(CONSTANT_TILE_POLICIES)}."
+        )
+    if queue_depth < 0:
+        raise ValueError(f"Queue depth must not be negative, got '{queue_depth}'.")
+
+    windows = get_windows(tile_dim, tile_col_row, bbox, aoi)
+    tiles_in_flight = len(windows)
+    gdal_cache: Optional[int] = None
+    if max_memory is not None:
+        plan = plan_memory(
+            max_memory,
+            [[window["window"].height, window["window"].width] for window in windows],
+            workers,
+            queue_depth=queue_depth,
+        )
+        logger.info(f"Planned tiling within {max_memory} bytes: {plan}")
+        workers = plan.workers
+        if strip_height is None:
+            strip_height = plan.strip_height
+        tiles_in_flight = plan.tiles_in_flight
+        gdal_cache = plan.gdal_cache
+    elif workers is None:
+        workers = 1
+
+    stems = [Path(nc_path).stem for nc_path in nc_paths]
+    if len(set(stems)) != len(stems):
+        raise ValueError(f"NetCDF file names must be unique, got '{nc_paths}'.")
+
+    os.makedirs(cog_dir, exist_ok=True)
+    options = _TileOptions(
+        strip_height,
+        gdal_cache,
+        constant_tiles,
+        profile=profiling.enabled(),
+        queue_depth=queue_depth,
+    )
+    # The manifests are only ever written by this process, jobs on the process
+    # pool report the size and checksum of their COGs back
+    manifests = {
+        nc_path: TilingManifest.for_source(nc_path, cog_dir, tile_dim)
+        for nc_path in nc_paths
+    }
+
+    if workers == 1:
+        with _gdal_env(gdal_cache):
+            for nc_path in nc_paths:
+                yield from _iter_serial(
+                    nc_path, cog_dir, windows, options, manifests[nc_path], resume
+                )
+    else:
+        yield from _iter_parallel(
+            nc_paths,
+            cog_dir,
+            windows,
+            options,
+            manifests,
+            resume,
+            workers,
+            tiles_in_flight,
+        )
+
+
+def _iter_serial(
+    nc_path: str,
+    cog_dir: str,
+    windows: List[Dict[str, Any]],
+    options: "_TileOptions",
+    manifest: TilingManifest,
+    resume: bool,
+) -> Iterator[CogTile]:
+    """Creates the COGs of a NetCDF file in this process, tile by tile.
+
+    The strips of all tiles are read as a single stream. With a queue depth,
+    they are read on a reader thread up to ``options.queue_depth`` strips
+    ahead, across tile boundaries, and the COGs of a tile are encoded from its
+    scratch files on encoder threads while the next tiles are read. Up to
+    ``options.queue_depth`` tiles are encoded at a time. Tiles are finished,
+    i.e., checksummed and recorded in the manifest, in grid order on this
+    thread.
+    """
+    with ExitStack() as stack:
+        sources = {
+            variable: stack.enter_context(rasterio.open(f"netcdf:{nc_path}:{variable}"))
+            for variable in constants.DATA_VARIABLES
+        }
+        tiles = []
+        for window in windows:
+            cog_paths = _cog_paths(nc_path, cog_dir, window["tile"])
+            missing = _missing_variables(
+                window["tile"], cog_paths, manifest, options, resume
+            )
+            if missing is not None:
+                tiles.append((window, cog_paths, missing))
+
+        encoder = None
+        if options.queue_depth:
+            # Exiting the executor waits for the encoding tiles, e.g., when the
+            # iteration is stopped early, so that no scratch file is left behind
+            encoder = stack.enter_context(
+                ThreadPoolExecutor(
+                    max_workers=len(constants.DATA_VARIABLES),
+                    thread_name_prefix="cog-encoder",
+                )
+            )
+        # The reader is stopped before the sources are closed
+        strips = stack.enter_context(
+            closing(
+                _read_strips(
+                    [
+                        (
+                            {variable: sources[variable] for variable in missing},
+                            window["window"],
+                        )
+                        for window, _, missing in tiles
+                        if missing
+                    ],
+                    _strip_height(sources, options),
+                    options.queue_depth,
+                )
+            )
+        )
+        pending: Deque[
+            Tuple[str, Dict[str, str], Optional[_TileEncoding], _TileOptions]
+        ] = deque()
+        for window, cog_paths, missing in tiles:
+            if not missing:
+                # Tiles are yielded in order, so a complete tile waits for the
+                # tiles before it
+                pending.append((window["tile"], cog_paths, None, options))
+            else:
+                tile_options = _resumed_options(options, missing)
+                encoding = _write_cogs(
+                    {variable: sources[variable] for variable in missing},
+                    window["window"],
+                    window["tile"],
+                    {variable: cog_paths[variable] for variable in missing},
+                    tile_options,
+                    encoder,
+                    strips,
+                )
+                pending.append((window["tile"], cog_paths, encoding, tile_options))
+            while len(pending) > options.queue_depth:
+                cog_tile = _finish_encoded_tile(*pending.popleft(), manifest=manifest)
+                if cog_tile is not None:
+                    yield cog_tile
+        while pending:
+            cog_tile = _finish_encoded_tile(*pending.popleft(), manifest=manifest)
+            if cog_tile is not None:
+                yield cog_tile
+
+
+def _iter_parallel(
+    nc_paths: List[str],
+    cog_dir: str,
+    windows: List[Dict[str, Any]],
+    options: "_TileOptions",
+    manifests: Dict[str, TilingManifest],
+    resume: bool,
+    workers: int,
+    tiles_in_flight: int,
+) -> Iterator[CogTile]:
+    """Creates the COGs of NetCDF files on a process pool, with one job per
+    (file, tile, variable). Jobs of all files share the pool's queue."""
+    # GDAL does not play well with forked processes, so workers are spawned
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        # Only a limited number of tiles is submitted at a time, which bounds
+        # the scratch files and results held by the pool
+        pending: Deque[
+            Tuple[str, Dict[str, Any], Dict[str, "Future[Any]"], _TileOptions]
+        ] = deque()
+        for nc_path in nc_paths:
             for window in windows:
-                window_transform = src.window_transform(window["window"])
-                window_data = src.read(1, window=window["window"])
-
-                dst_profile = {
-                    "driver": "GTiff",
-                    "width": window["window"].width,
-                    "height": window["window"].height,
-                    "count": 1,
-                    "dtype": window_data.dtype,
-                    "transform": window_transform,
-                    "crs": "EPSG:4326",
-                }
-
-                if variable == "current_pixel_state" or variable == "processed_flag":
-                    window_data[window_data == -1] = 100
-                    window_data = np.uint8(window_data)
-                    window_data[window_data == 100] = 255
-                    dst_profile.update({"dtype": "uint8", "nodata": 255})
-                if variable == "lccs_class":
-                    dst_profile.update({"nodata": 0})
-
-                cog_path = (
-                    Path(cog_dir)
-                    / f"{Path(nc_path).stem}-{window['tile']}-{variable}.tif"
+                cog_paths = _cog_paths(nc_path, cog_dir, window["tile"])
+                missing = _missing_variables(
+                    window["tile"], cog_paths, manifests[nc_path], options, resume
+                )
+                if missing is None:
+                    continue
+                if not missing:
+                    # Tiles are yielded in order, so a complete tile waits for
+                    # the tiles before it
+                    pending.append((nc_path, window, {}, options))
+                else:
+                    tile_options = _resumed_options(options, missing)
+                    futures = {
+                        variable: executor.submit(
+                            _make_cog_job,
+                            nc_path,
+                            cog_dir,
+                            variable,
+                            window["window"],
+                            window["tile"],
+                            tile_options,
+                        )
+                        for variable in missing
+                    }
+                    pending.append((nc_path, window, futures, tile_options))
+                if len(pending) >= tiles_in_flight:
+                    cog_tile = _finish_job_tile(
+                        *pending.popleft(), cog_dir=cog_dir, manifests=manifests
+                    )
+                    if cog_tile is not None:
+                        yield cog_tile
+        while pending:
+            cog_tile = _finish_job_tile(
+                *pending.popleft(), cog_dir=cog_dir, manifests=manifests
+            )
+            if cog_tile is not None:
+                yield cog_tile
+
+
+@dataclass(frozen=True)
+class _TileOptions:
+    """Options shared by all COGs of a tiling run."""
+
+    strip_height: Optional[int]
+    gdal_cache: Optional[int]
+    constant_tiles: str
+    profile: bool = False
+    queue_depth: int = 0
+
+
+@dataclass(frozen=True)
+class _CogResult:
+    """Outcome of creating a single COG: the value of the window if it is
+    constant, the record of the COG unless it was skipped, the band statistics
+    of the window, and the stage metrics of a job on the process pool."""
+
+    value: Optional[int]
+    record: Optional[CogRecord]
+    statistics: Optional[BandStatistics] = None
+    records: List[StageRecord] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _TileEncoding:
+    """The COGs of a tile whose strips have been written to scratch files:
+    the value of each variable if it is constant in the window, the band
+    statistics of each variable, and the encoding of each COG, which may
+    still be running on an encoder thread."""
+
+    values: Dict[str, Optional[int]]
+    statistics: Dict[str, BandStatistics]
+    encodings: Dict[str, "Future[StageRecord]"] = field(default_factory=dict)
+
+    def wait(self) -> None:
+        """Waits for the COGs to be encoded and emits their stage records."""
+        # All COGs are waited on before an error is raised, so that no
+        # encoding runs on after its tile has been given up
+        records = []
+        errors = []
+        for encoding in self.encodings.values():
+            try:
+                records.append(encoding.result())
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise errors[0]
+        for record in records:
+            profiling.emit(record)
+
+
+def _missing_variables(
+    tile: str,
+    cog_paths: Dict[str, str],
+    manifest: TilingManifest,
+    options: _TileOptions,
+    resume: bool,
+) -> Optional[List[str]]:
+    """Returns the variables of a tile whose COGs need to be created, or None
+    if the tile has been skipped before and is skipped again. Without
+    ``resume``, all variables are created."""
+    if not resume:
+        return list(cog_paths)
+    if options.constant_tiles == "skip" and tile in manifest.skipped:
+        logger.info(f"Skipped tile {tile}, it was skipped before.")
+        return None
+    missing = [
+        variable
+        for variable, cog_path in cog_paths.items()
+        if not manifest.is_complete(tile, variable, cog_path)
+    ]
+    if missing:
+        logger.info(f"Resuming tile {tile}, missing {', '.join(missing)}.")
+    return missing
+
+
+def _resumed_options(options: _TileOptions, missing: List[str]) -> _TileOptions:
+    # A tile with completed COGs has not been skipped, so with the "skip"
+    # policy its remaining constant COGs are compact, as in a tile that is
+    # created at once
+    if options.constant_tiles == "skip" and len(missing) < len(
+        constants.DATA_VARIABLES
+    ):
+        return replace(options, constant_tiles="compact")
+    return options
+
+
+def _finish_job_tile(
+    nc_path: str,
+    window: Dict[str, Any],
+    futures: Dict[str, "Future[_CogResult]"],
+    options: _TileOptions,
+    *,
+    cog_dir: str,
+    manifests: Dict[str, TilingManifest],
+) -> Optional[CogTile]:
+    manifest = manifests[nc_path]
+    cog_paths = _cog_paths(nc_path, cog_dir, window["tile"])
+    if not futures:
+        return _resumed_tile(window["tile"], cog_paths, manifest)
+
+    # Waiting on the futures in grid order keeps the output independent of the
+    # order in which the workers finish their jobs
+    results = {variable: future.result() for variable, future in futures.items()}
+    for result in results.values():
+        for record in result.records:
+            profiling.emit(record)
+
+    values = {variable: result.value for variable, result in results.items()}
+    if options.constant_tiles == "skip" and not _all_constant(values):
+        # Jobs only see a single variable and leave out constant ones, which
+        # are needed after all since the tile is not skipped as a whole. Their
+        # transform comes from the tile grid, without opening the NetCDF file.
+        grid = get_tile_grid(window["window"].width)
+        window_transform = grid.transform(*grid.col_row(window["tile"]))
+        for variable, result in results.items():
+            if result.value is not None:
+                _write_constant_cog(
+                    result.value,
+                    window["window"],
+                    window_transform,
+                    variable,
+                    cog_paths[variable],
+                )
+                results[variable] = _CogResult(
+                    result.value,
+                    CogRecord.from_file(cog_paths[variable]),
+                    result.statistics,
                 )
 
-                with MemoryFile() as mem_file:
-                    with mem_file.open(**dst_profile) as mem:
-                        mem.write(window_data, 1)
-                        if variable == "lccs_class":
-                            mem.write_colormap(1, _get_colormap())
-                            cog_profile_mode = COG_PROFILE.copy()
-                            cog_profile_mode["overview_resampling"] = "mode"
-                            rasterio.shutil.copy(mem, cog_path, **cog_profile_mode)
-                        else:
-                            rasterio.shutil.copy(mem, cog_path, **COG_PROFILE)
+    return _finish_tile(window["tile"], cog_paths, results, options, manifest)
 
-                cog_paths[window["tile"]].append(str(cog_path))
 
-    return [value for value in cog_paths.values()]
+def _finish_encoded_tile(
+    tile: str,
+    cog_paths: Dict[str, str],
+    encoding: Optional[_TileEncoding],
+    options: _TileOptions,
+    *,
+    manifest: TilingManifest,
+) -> Optional[CogTile]:
+    if encoding is None:
+        return _resumed_tile(tile, cog_paths, manifest)
+    encoding.wait()
+    # The COGs of a tile that is skipped as a whole are not encoded
+    results = {
+        variable: _cog_result(
+            cog_paths[variable],
+            value,
+            encoding.statistics[variable],
+            tile,
+            variable,
+            variable in encoding.encodings,
+        )
+        for variable, value in encoding.values.items()
+    }
+    return _finish_tile(tile, cog_paths, results, options, manifest)
+
+
+def _finish_tile(
+    tile: str,
+    cog_paths: Dict[str, str],
+    results: Dict[str, _CogResult],
+    options: _TileOptions,
+    manifest: TilingManifest,
+) -> Optional[CogTile]:
+    values = {variable: result.value for variable, result in results.items()}
+    if options.constant_tiles == "skip" and _all_constant(values):
+        logger.info(f"Skipped tile {tile}, all variables hold a single value.")
+        manifest.skip(tile, cast(Dict[str, int], values))
+        manifest.save()
+        return None
+
+    manifest.unskip(tile)
+    for variable, result in results.items():
+        if result.record is not None:
+            manifest.complete(tile, variable, result.record, result.statistics)
+    manifest.save()
+    # COGs kept from an earlier run have the statistics recorded back then
+    statistics = dict(manifest.statistics.get(tile, {}))
+    for variable, result in results.items():
+        if result.statistics is not None:
+            statistics[variable] = result.statistics
+    return CogTile(
+        tile,
+        list(cog_paths.values()),
+        statistics=statistics,
+        previews=_existing_previews(cog_paths),
+    )
+
+
+def _resumed_tile(
+    tile: str, cog_paths: Dict[str, str], manifest: TilingManifest
+) -> CogTile:
+    return CogTile(
+        tile,
+        list(cog_paths.values()),
+        True,
+        dict(manifest.statistics.get(tile, {})),
+        _existing_previews(cog_paths),
+    )
+
+
+def _existing_previews(cog_paths: Dict[str, str]) -> Dict[str, str]:
+    # Previews are written before the COG of their variable is completed, but
+    # are missing for tiles created before previews existed
+    return {
+        key: path
+        for key, path in preview_paths(cog_paths[constants.PREVIEW_VARIABLE]).items()
+        if os.path.exists(path)
+    }
+
+
+def _cog_result(
+    cog_path: str,
+    value: Optional[int],
+    statistics: BandStatistics,
+    tile: str,
+    variable: str,
+    written: bool,
+) -> _CogResult:
+    # A COG that has not been written, i.e., of a tile that is skipped as a
+    # whole or of a constant variable left out by a job, has no record.
+    # Every COG on disk is recorded, including compact ones of kept tiles.
+    if not written:
+        return _CogResult(value, None, statistics)
+    with profiling.stage("checksum", variable, tile) as record:
+        cog_record = CogRecord.from_file(cog_path)
+        record.bytes_read = cog_record.size
+    return _CogResult(value, cog_record, statistics)
+
+
+def _all_constant(values: Dict[str, Optional[int]]) -> bool:
+    return all(value is not None for value in values.values())
+
+
+def _gdal_env(gdal_cache: Optional[int]) -> rasterio.Env:
+    if gdal_cache is None:
+        return rasterio.Env()
+    return rasterio.Env(GDAL_CACHEMAX=gdal_cache)
+
+
+def _make_cog_job(
+    nc_path: str,
+    cog_dir: str,
+    variable: str,
+    window: Window,
+    tile: str,
+    options: _TileOptions,
+) -> _CogResult:
+    """Process pool entry point creating the COG for a single variable and
+    tile."""
+    cog_path = _cog_path(nc_path, cog_dir, tile, variable)
+    with _gdal_env(options.gdal_cache):
+        with rasterio.open(f"netcdf:{nc_path}:{variable}") as src:
+            with profiling.collect() as records:
+                encoding = _write_cogs(
+                    {variable: src}, window, tile, {variable: cog_path}, options
+                )
+                encoding.wait()
+                result = _cog_result(
+                    cog_path,
+                    encoding.values[variable],
+                    encoding.statistics[variable],
+                    tile,
+                    variable,
+                    variable in encoding.encodings,
+                )
+    # Metrics hooks of the parent process don't exist in workers, so the stage
+    # records are sent back with the result
+    if options.profile:
+        result.records.extend(records)
+    return result
+
+
+def _cog_path(nc_path: str, cog_dir: str, tile: str, variable: str) -> str:
+    return str(Path(cog_dir) / f"{Path(nc_path).stem}-{tile}-{variable}.tif")
+
+
+def _cog_paths(nc_path: str, cog_dir: str, tile: str) -> Dict[str, str]:
+    return {
+        variable: _cog_path(nc_path, cog_dir, tile, variable)
+        for variable in constants.DATA_VARIABLES
+    }
+
+
+def _write_cogs(
+    sources: Dict[str, DatasetReader],
+    window: Window,
+    tile: str,
+    cog_paths: Dict[str, str],
+    options: _TileOptions,
+    encoder: Optional[Executor] = None,
+    strips: Optional[Iterator[_Strip]] = None,
+) -> _TileEncoding:
+    """Creates a COG of a window for each of the given variables.
+
+    The window is read strip by strip, all variables together, and each strip
+    is written to an on-disk tiled scratch GeoTIFF next to the COG. The COGs
+    are then built from the scratch files, so peak memory depends on the
+    strip size rather than the window size.
+
+    With ``options.queue_depth``, the strips are read on a reader thread up to
+    that many strips ahead of their processing, so that reading overlaps with
+    remapping and writing the scratch files, unless the strips are taken from
+    a reader shared by several windows. Given an ``encoder``, the COGs
+    are encoded from the scratch files on the encoder, which removes each
+    scratch file once its COG is complete, and this function returns without
+    waiting for them.
+
+    While streaming, each variable is checked for holding a single value in
+    the whole window. Depending on ``options.constant_tiles``, such COGs are
+    encoded as usual, encoded with a single overview level ("compact"), or
+    not created at all if all given variables are constant ("skip").
+
+    The band statistics of each variable are computed from the same strips,
+    with a single vectorized pass over each strip of COG values. Strips of a
+    constant window only add to the count of their value. If the preview
+    variable is created, a decimated copy of its strips is kept, from which
+    the thumbnail and preview images are written next to its COG.
+
+    Args:
+        sources (Dict[str, DatasetReader]): Open NetCDF variables, keyed by
+            variable name.
+        window (Window): Window of the tile to create.
+        tile (str): Tile ID, used for stage metrics.
+        cog_paths (Dict[str, str]): Output COG path for each variable.
+        options (_TileOptions): Options of the tiling run. The strip height
+            defaults to the NetCDF chunk height, so that every chunk is read
+            once.
+        encoder (Optional[Executor]): Thread pool to encode the COGs on.
+            Defaults to encoding them before returning.
+        strips (Optional[Iterator[_Strip]]): Strips of :func:`_read_strips`
+            whose next strips are those of this window. Defaults to reading
+            the window on its own.
+
+    Returns:
+        _TileEncoding: The value of each variable if it is constant in the
+            window, None otherwise, the band statistics of each variable in
+            the window, and the encoding of each created COG.
+    """
+    strip_height = _strip_height(sources, options)
+
+    with ExitStack() as stack:
+        # Each scratch file has its own exit stack, which is handed over to its
+        # encoding so that the file is removed once the COG is complete
+        scratch_stacks = {
+            variable: stack.enter_context(ExitStack()) for variable in sources
+        }
+        scratches = {
+            variable: open_scratch(
+                scratch_stacks[variable],
+                cog_paths[variable],
+                window,
+                src.window_transform(window),
+                variable,
+            )
+            for variable, src in sources.items()
+        }
+
+        # Strip buffers are allocated once and reused for every strip
+        max_height = min(strip_height, window.height)
+        out_buffers = {
+            variable: np.empty(
+                (max_height, window.width), dtype=TRANSFORMS[variable].dtype
+            )
+            for variable in sources
+            if TRANSFORMS[variable].lut is not None
+        }
+        # Constant windows are only looked for if they are treated specially
+        constant = {
+            variable: options.constant_tiles != "encode" for variable in sources
+        }
+        first_values: Dict[str, int] = {}
+        accumulators = {
+            variable: StatisticsAccumulator(
+                TRANSFORMS[variable].dtype,
+                TRANSFORMS[variable].nodata,
+                variable in constants.TABLES,
+            )
+            for variable in sources
+        }
+        # Stage metrics are summed up over the strips of each variable
+        stages = {
+            variable: {
+                name: StageRecord(name, variable, tile)
+                for name in ["read", "remap", "statistics", "scratch_write"]
+            }
+            for variable in sources
+        }
+        sampler = None
+        preview_record = StageRecord("preview", constants.PREVIEW_VARIABLE, tile)
+        if constants.PREVIEW_VARIABLE in sources:
+            sampler = PreviewSampler(
+                window, TRANSFORMS[constants.PREVIEW_VARIABLE].dtype
+            )
+        if strips is None:
+            # The reader is stopped before the sources can be closed, also if
+            # processing a strip fails
+            strips = stack.enter_context(
+                closing(
+                    _read_strips([(sources, window)], strip_height, options.queue_depth)
+                )
+            )
+        window_strips = itertools.islice(
+            strips, len(list(_get_strips(window, strip_height)))
+        )
+        for strip, strip_datas, read_seconds in window_strips:
+            dst_window = Window(
+                0, strip.row_off - window.row_off, strip.width, strip.height
+            )
+            for variable, strip_data in strip_datas.items():
+                record = stages[variable]["read"]
+                record.seconds += read_seconds[variable]
+                record.bytes_read += strip_data.nbytes
+                record.pixels += strip_data.size
+                with stages[variable]["remap"].measure() as record:
+                    out = out_buffers.get(variable)
+                    strip_data = TRANSFORMS[variable].apply(
+                        strip_data, out=None if out is None else out[: strip.height]
+                    )
+                    if constant[variable]:
+                        value = first_values.setdefault(
+                            variable, strip_data.flat[0].item()
+                        )
+                        constant[variable] = _is_constant(strip_data, value)
+                    record.pixels += strip_data.size
+                with stages[variable]["statistics"].measure() as record:
+                    if constant[variable]:
+                        accumulators[variable].add_constant(
+                            first_values[variable], strip_data.size
+                        )
+                    else:
+                        accumulators[variable].add(strip_data)
+                    record.pixels += strip_data.size
+                if sampler is not None and variable == constants.PREVIEW_VARIABLE:
+                    with preview_record.measure():
+                        sampler.add(strip, strip_data)
+                with stages[variable]["scratch_write"].measure() as record:
+                    scratches[variable].write(strip_data, 1, window=dst_window)
+                    record.bytes_written += strip_data.nbytes
+                    record.pixels += strip_data.size
+        for records in stages.values():
+            for record in records.values():
+                profiling.emit(record)
+
+        values = {
+            variable: first_values[variable] if constant[variable] else None
+            for variable in sources
+        }
+        statistics = {
+            variable: accumulator.finish()
+            for variable, accumulator in accumulators.items()
+        }
+
+        skip = options.constant_tiles == "skip" and _all_constant(values)
+        if sampler is not None:
+            if not skip:
+                with preview_record.measure() as record:
+                    sampler.write(preview_paths(cog_paths[constants.PREVIEW_VARIABLE]))
+                    record.pixels = sampler.sample.size
+            profiling.emit(preview_record)
+        encoding = _TileEncoding(values, statistics)
+        for variable, scratch in scratches.items():
+            scratch.close()
+            if not skip:
+                compact = options.constant_tiles != "encode" and constant[variable]
+                args = (
+                    scratch_stacks[variable].pop_all(),
+                    scratch.name,
+                    cog_paths[variable],
+                    variable,
+                    compact,
+                    tile,
+                    window.width * window.height,
+                )
+                if encoder is None:
+                    future: "Future[StageRecord]" = Future()
+                    future.set_result(_encode_cog(*args))
+                else:
+                    future = encoder.submit(_encode_cog, *args)
+                encoding.encodings[variable] = future
+
+    return encoding
+
+
+def _read_strips(
+    reads: List[Tuple[Dict[str, DatasetReader], Window]],
+    strip_height: int,
+    queue_depth: int,
+) -> Generator[_Strip, None, None]:
+    """Yields the strips of one or more windows in turn, with the data of each
+    strip and variable, and the seconds spent reading them.
+
+    The data is read into buffers that are reused once the next strip is
+    requested. With a queue depth, the strips are read on a reader thread into
+    ``queue_depth + 1`` sets of buffers, so that the thread reads up to
+    ``queue_depth`` strips ahead while the consumer holds a strip, also across
+    windows. The reader stops when the iteration ends, and an error of the
+    reader is raised by the iteration.
+
+    Args:
+        reads (List[Tuple[Dict[str, DatasetReader], Window]]): Open NetCDF
+            variables, keyed by variable name, and the window to read of each
+            window in turn.
+        strip_height (int): Strip height, see :func:`_get_strips`.
+        queue_depth (int): Number of strips read ahead.
+
+    Returns:
+        Generator[_Strip, None, None]: The strip window, the data of each
+            variable and the read seconds of each variable of each strip.
+    """
+    strips = [
+        (sources, strip)
+        for sources, window in reads
+        for strip in _get_strips(window, strip_height)
+    ]
+    if not strips:
+        return
+    # A buffer holds the largest strip of its variable, and smaller strips
+    # are read into a contiguous part of it
+    sizes: Dict[str, int] = {}
+    dtypes: Dict[str, str] = {}
+    for sources, strip in strips:
+        for variable, src in sources.items():
+            sizes[variable] = max(sizes.get(variable, 0), strip.height * strip.width)
+            dtypes[variable] = src.dtypes[0]
+    buffer_sets = [
+        {
+            variable: np.empty(size, dtype=dtypes[variable])
+            for variable, size in sizes.items()
+        }
+        for _ in range(queue_depth + 1)
+    ]
+    if not queue_depth:
+        for sources, strip in strips:
+            yield (strip, *_read_strip(sources, strip, buffer_sets[0]))
+        return
+
+    free: "queue.Queue[Optional[Dict[str, np.ndarray]]]" = queue.Queue()
+    filled: "queue.Queue[Any]" = queue.Queue()
+    for buffers in buffer_sets:
+        free.put(buffers)
+    stop = threading.Event()
+
+    def read() -> None:
+        try:
+            for sources, strip in strips:
+                buffers = free.get()
+                if buffers is None or stop.is_set():
+                    return
+                filled.put((strip, buffers, *_read_strip(sources, strip, buffers)))
+        except BaseException as error:
+            filled.put(error)
+
+    thread = threading.Thread(target=read, name="strip-reader", daemon=True)
+    thread.start()
+    try:
+        for _ in strips:
+            item = filled.get()
+            if isinstance(item, BaseException):
+                raise item
+            strip, buffers, strip_datas, read_seconds = item
+            yield strip, strip_datas, read_seconds
+            free.put(buffers)
+    finally:
+        stop.set()
+        free.put(None)
+        # The NetCDF variables must not be read by two threads at a time
+        thread.join()
+
+
+def _read_strip(
+    sources: Dict[str, DatasetReader],
+    strip: Window,
+    buffers: Dict[str, np.ndarray],
+) -> Tuple[Dict[str, np.ndarray], Dict[str, float]]:
+    strip_datas = {}
+    read_seconds = {}
+    for variable, src in sources.items():
+        start = time.perf_counter()
+        out = buffers[variable][: strip.height * strip.width]
+        strip_datas[variable] = src.read(
+            1, window=strip, out=out.reshape(strip.height, strip.width)
+        )
+        read_seconds[variable] = time.perf_counter() - start
+    return strip_datas, read_seconds
+
+
+def _strip_height(sources: Dict[str, DatasetReader], options: _TileOptions) -> int:
+    # Defaults to the NetCDF chunk height, so that every chunk is read once
+    if options.strip_height is not None:
+        return options.strip_height
+    return int(next(iter(sources.values())).block_shapes[0][0])
+
+
+def _encode_cog(
+    scratch_stack: ExitStack,
+    scratch_path: str,
+    cog_path: str,
+    variable: str,
+    compact: bool,
+    tile: str,
+    pixels: int,
+) -> StageRecord:
+    """Encodes a COG from its closed scratch file and removes the scratch
+    file, e.g., on an encoder thread. Returns the stage record, which the
+    caller emits."""
+    with scratch_stack:
+        record = StageRecord("cog_copy", variable, tile)
+        with record.measure():
+            copy_cog(scratch_path, cog_path, variable, compact)
+            record.bytes_read = os.path.getsize(scratch_path)
+            record.bytes_written = os.path.getsize(cog_path)
+            record.pixels = pixels
+    return record
+
+
+def _write_constant_cog(
+    value: int,
+    window: Window,
+    window_transform: Affine,
+    variable: str,
+    cog_path: str,
+) -> None:
+    """Creates a compact COG of a window that holds a single value, and the
+    preview images if the variable has them."""
+    if variable == constants.PREVIEW_VARIABLE:
+        sampler = PreviewSampler(window, TRANSFORMS[variable].dtype)
+        sampler.fill(value)
+        sampler.write(preview_paths(cog_path))
+    with ExitStack() as stack:
+        scratch = open_scratch(stack, cog_path, window, window_transform, variable)
+        for strip in _get_strips(window, NETCDF_CHUNK_HEIGHT):
+            strip_data = np.full(
+                (strip.height, strip.width), value, dtype=TRANSFORMS[variable].dtype
+            )
+            scratch.write(
+                strip_data,
+                1,
+                window=Window(
+                    0, strip.row_off - window.row_off, strip.width, strip.height
+                ),
+            )
+        scratch.close()
+        copy_cog(scratch.name, cog_path, variable, compact=True)
+
+
+def open_scratch(
+    stack: ExitStack,
+    cog_path: str,
+    window: Window,
+    window_transform: Affine,
+    variable: str,
+) -> DatasetWriter:
+    """Opens a tiled scratch GeoTIFF next to a COG, to which the COG values of
+    a variable are written before the COG is built with :func:`copy_cog`.
+
+    Args:
+        stack (ExitStack): Exit stack that closes and removes the scratch file
+            when it unwinds.
+        cog_path (str): Path of the COG.
+        window (Window): Window of the COG, which gives the scratch file size.
+        window_transform (Affine): Transform of the window.
+        variable (str): NetCDF variable, which gives the data type, nodata
+            value and colormap.
+
+    Returns:
+        DatasetWriter: The open scratch file.
+    """
+    fd, scratch_path = tempfile.mkstemp(
+        prefix=f".{Path(cog_path).stem}-", suffix=".tif", dir=Path(cog_path).parent
+    )
+    os.close(fd)
+    stack.callback(os.remove, scratch_path)
+    scratch = stack.enter_context(
+        rasterio.open(
+            scratch_path,
+            "w",
+            **_scratch_profile(window, window_transform, variable),
+        )
+    )
+    if TRANSFORMS[variable].colormap:
+        scratch.write_colormap(1, COLORMAP)
+    return scratch
+
+
+def copy_cog(
+    scratch_path: str,
+    cog_path: str,
+    variable: str,
+    compact: bool,
+    overview_resampling: Optional[str] = None,
+) -> None:
+    """Builds a COG from a closed scratch file with the overview resampling
+    of its variable. The COG is written under a temporary name and renamed
+    once complete.
+
+    Args:
+        scratch_path (str): Path of the scratch file.
+        cog_path (str): Path of the COG.
+        variable (str): NetCDF variable.
+        compact (bool): Whether to create a single overview level only, e.g.,
+            for a COG holding a single value.
+        overview_resampling (Optional[str]): Resampling method of the COG
+            overviews. Defaults to the one of the variable's transform.
+    """
+    if overview_resampling is None:
+        overview_resampling = TRANSFORMS[variable].overview_resampling
+    profile = {
+        **COG_PROFILE,
+        "overview_resampling": overview_resampling,
+    }
+    if compact:
+        profile.update(COMPACT_COG_PROFILE)
+    # The COG is written under a temporary name and renamed once complete, so
+    # an interrupted run never leaves a partial file under the COG's name
+    partial_path = str(Path(cog_path).with_name(f".{Path(cog_path).name}.partial"))
+    try:
+        rasterio.shutil.copy(scratch_path, partial_path, **profile)
+        os.replace(partial_path, cog_path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+def _is_constant(data: np.ndarray, value: int) -> bool:
+    # A coarse sample rejects most non-constant strips without a full pass
+    if not (data[::64, ::64] == value).all():
+        return False
+    return bool((data == value).all())
+
+
+def _scratch_profile(
+    window: Window, window_transform: Affine, variable: str
+) -> Dict[str, Any]:
+    transform = TRANSFORMS[variable]
+    profile = {
+        **SCRATCH_PROFILE,
+        "width": window.width,
+        "height": window.height,
+        "count": 1,
+        "dtype": transform.dtype,
+        "transform": window_transform,
+        "crs": "EPSG:4326",
+    }
+    if transform.nodata is not None:
+        profile["nodata"] = transform.nodata
+    return profile
+
+
+def _get_strips(window: Window, strip_height: int) -> Iterator[Window]:
+    """Splits a window into full-width strips whose boundaries fall on
+    multiples of ``strip_height`` in the source raster."""
+    row = window.row_off
+    end = window.row_off + window.height
+    while row < end:
+        next_row = min((row // strip_height + 1) * strip_height, end)
+        yield Window(window.col_off, row, window.width, next_row - row)
+        row = next_row
 
 
 def get_windows(
-    tile_dim: int, tile_col_row: Optional[List[int]] = None
+    tile_dim: int,
+    tile_col_row: Optional[List[int]] = None,
+    bbox: Optional[List[float]] = None,
+    aoi: Optional[Dict[str, Any]] = None,
 ) -> List[Dict[str, Any]]:
     """Creates rasterio ``Window`` objects and tile ID strings. The tile IDs are
     the geographic coordinates of the lower left tile corner rounded to the
-    nearest degree. Unless ``tile_col_row`` is passed, objects and IDs will be
-    generated for all tiles in a tile grid defined by ``tile_dim``.
+    nearest degree. Unless ``tile_col_row``, ``bbox`` or ``aoi`` is passed,
+    objects and IDs will be generated for all tiles in a tile grid defined by
+    ``tile_dim``.
 
     Args:
-        cog_tile_dim (Optional[int]): Optional COG tile dimension in pixels.
-            Defaults to ``constants.COG_TILE_DIM``.
+        tile_dim (int): COG tile dimension in pixels.
         tile_col_row (Optional[List[int]]): Optional tile grid column and row
             indices. Use to create an Item and COGs for a single tile. Indices
             are 0 based.
+        bbox (Optional[List[float]]): Optional west, south, east and north
+            coordinates in degrees. Use to create Items and COGs for the tiles
+            intersecting the bounding box.
+        aoi (Optional[Dict[str, Any]]): Optional GeoJSON geometry, Feature or
+            FeatureCollection. Use to create Items and COGs for the tiles
+            intersecting the area of interest. Can be combined with ``bbox``.
 
     Returns:
         List[Dict[str, Any]]: List of dictionaries containing a rasterio
             ``Window`` object and Tile ID string.
     """
-    for dim in constants.NETCDF_DATA_SHAPE:
-        if dim % tile_dim:
-            raise ValueError(
-                f"Source data shape '{constants.NETCDF_DATA_SHAPE}' is not evenly "
-                "divisible by the tile dimension '{tile_dim}'."
-            )
-
-    num_cols = int(constants.NETCDF_DATA_SHAPE[1] / tile_dim)
-    cols = list(range(0, num_cols))
-    num_rows = int(constants.NETCDF_DATA_SHAPE[0] / tile_dim)
-    rows = list(range(0, num_rows))
-
-    if 360 % num_cols:
-        logger.warning(
-            "Non-integer tile degree increment. Lower left corner coordinates "
-            "in tile file names will be rounded to nearest integer degree."
-        )
-    deg_increment = 360 / num_cols
-
+    grid = TileGrid(tile_dim)
     if tile_col_row is not None:
-        col, row = tile_col_row
-        if col not in cols or row not in rows:
+        if bbox is not None or aoi is not None:
             raise ValueError(
-                f"Specified tile column ({col}) or row ({row}) falls outside of "
-                f"tile grid. Valid columns = 0 to {cols[-1]}, valid rows = "
-                f"0 to {rows[-1]}."
+                "A tile column and row can't be combined with a bbox or an AOI."
             )
-        cols = [col]
-        rows = [row]
-
-    windows = []
-    for c in cols:
-        for r in rows:
-            window = {}
-            window["window"] = Window(c * tile_dim, r * tile_dim, tile_dim, tile_dim)
-
-            bottom = round(90 - (r + 1) * deg_increment)
-            bottom_text = f"{'S' if bottom < 0 else 'N'}{abs(bottom):02d}"
-            left = round((c * deg_increment) - 180)
-            left_text = f"{'W' if left < 0 else 'E'}{abs(left):03d}"
-            window["tile"] = f"{bottom_text}{left_text}"
-
-            windows.append(window)
-
-    return windows
-
+        col, row = tile_col_row
+        grid.check(col, row)
+        tiles = [(col, row)]
+    else:
+        geometry = None if aoi is None else geometry_from_geojson(aoi)
+        tiles = grid.intersecting(bbox, geometry)
+        if not tiles:
+            raise ValueError("The bbox or AOI does not intersect the tile grid.")
 
-def _get_colormap() -> Dict[str, Tuple[int, ...]]:
-    colors: Dict[str, Tuple[int, ...]] = {}
-    for row in classes.TABLE:
-        colors[row[0]] = tuple([*row[1], 255])
-    return colors
+    return [
+        {"window": grid.window(col, row), "tile": grid.tile_id(col, row)}
+        for col, row in tiles
+    ]
 
 
 def create_cog_asset(
     key: str,
     cog_href: Optional[str] = None,
+    statistics: Optional[BandStatistics] = None,
 ) -> Dict[str, Any]:
     """
     Creates a basic COG asset dict with shared core properties and optionally an
@@ -176,6 +1324,8 @@ def create_cog_asset(
     Args:
         key (str):
         cog_href (str): The URL to the asset
+        statistics (Optional[BandStatistics]): Optional statistics of the COG,
+            added to its band and to its classes as pixel counts
 
     Returns:
         Dict: Basic Asset object
@@ -187,6 +1337,8 @@ def create_cog_asset(
     if key in constants.TABLES:
         table = constants.TABLES[key]
         asset["classification:classes"] = classes.to_stac(table)
+        if statistics is not None:
+            statistics.add_counts(asset["classification:classes"])
 
     nodata = asset.pop("nodata", None)
     data_type = asset.pop("data_type")
@@ -197,6 +1349,8 @@ def create_cog_asset(
     }
     if nodata is not None:
         band["nodata"] = nodata
+    if statistics is not None:
+        band["statistics"] = statistics.to_raster()
 
     asset["raster:bands"] = [band]
 
@@ -221,17 +1375,60 @@ class COGMetadata:
     def from_cog(
         cls, href: str, read_href_modifier: Optional[ReadHrefModifier]
     ) -> "COGMetadata":
+        """Reads the metadata of a tile from a COG's header and file name.
+
+        Args:
+            href (str): HREF of one of the tile's COGs.
+            read_href_modifier (Optional[ReadHrefModifier]): An optional
+                function to modify the HREF, e.g., to add a token to a URL.
+
+        Returns:
+            COGMetadata: The metadata.
+        """
         if read_href_modifier:
             modified_href = read_href_modifier(href)
         else:
             modified_href = href
         with rasterio.open(modified_href) as dataset:
             bbox = dataset.bounds
-            geometry = mapping(box(*bbox))
             shape = dataset.shape
             transform = list(dataset.transform)[0:6]
             epsg = dataset.crs.to_epsg()
 
+        return cls._from_file_name(href, list(bbox), list(shape), transform, epsg)
+
+    @classmethod
+    def from_tile_grid(cls, href: str, tile_dim: int) -> "COGMetadata":
+        """Computes the metadata of a tile from a COG's file name and the tile
+        grid, without any I/O.
+
+        Args:
+            href (str): HREF of one of the tile's COGs.
+            tile_dim (int): COG tile dimension in pixels the COG was created
+                with.
+
+        Returns:
+            COGMetadata: The metadata.
+        """
+        grid = get_tile_grid(tile_dim)
+        col, row = grid.col_row(Path(href).stem.split("-")[-2])
+        return cls._from_file_name(
+            href,
+            list(grid.bounds(col, row)),
+            [tile_dim, tile_dim],
+            list(grid.transform(col, row))[0:6],
+            constants.EPSG_CODE,
+        )
+
+    @classmethod
+    def _from_file_name(
+        cls,
+        href: str,
+        bbox: List[float],
+        shape: List[int],
+        transform: List[float],
+        epsg: int,
+    ) -> "COGMetadata":
         fileparts = Path(href).stem.split("-")
         id = "-".join(fileparts[:-1])
         start_datetime = f"{fileparts[-4]}-01-01T00:00:00Z"
@@ -243,8 +1440,8 @@ class COGMetadata:
         return COGMetadata(
             id=id,
             title=title,
-            geometry=geometry,
-            bbox=list(bbox),
+            geometry=mapping(box(*bbox)),
+            bbox=bbox,
             start_datetime=start_datetime,
             end_datetime=end_datetime,
             version=version,
@@ -253,3 +1450,34 @@ class COGMetadata:
             proj_shape=shape,
             proj_transform=transform,
         )
+
+    def verify(
+        self, href: str, read_href_modifier: Optional[ReadHrefModifier] = None
+    ) -> None:
+        """Checks the metadata against a COG's header, e.g., metadata computed
+        with :meth:`from_tile_grid`. Raises a ValueError on a mismatch.
+
+        Args:
+            href (str): HREF of one of the tile's COGs.
+            read_href_modifier (Optional[ReadHrefModifier]): An optional
+                function to modify the HREF, e.g., to add a token to a URL.
+        """
+        actual = COGMetadata.from_cog(href, read_href_modifier)
+        mismatches = [
+            name
+            for name in ["bbox", "proj_transform"]
+            if not np.allclose(getattr(self, name), getattr(actual, name))
+        ]
+        if self.proj_shape != actual.proj_shape:
+            mismatches.append("proj_shape")
+        if self.epsg != actual.epsg:
+            mismatches.append("epsg")
+        if mismatches:
+            raise ValueError(
+                f"COG '{href}' does not match its expected metadata: "
+                + ", ".join(
+                    f"{name} is {getattr(actual, name)}, expected "
+                    f"{getattr(self, name)}"
+                    for name in mismatches
+                )
+            )
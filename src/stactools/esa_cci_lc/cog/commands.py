@@ -1,12 +1,19 @@
+import glob
+import importlib
+import json
 import logging
+import os
 from pathlib import Path
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, cast
 
 import click
 from click import Command, Group
 
-from stactools.esa_cci_lc import constants
-from stactools.esa_cci_lc.cog import stac
+from stactools.esa_cci_lc import constants, profiling, writers
+from stactools.esa_cci_lc.memory import parse_memory_option
+
+if TYPE_CHECKING:
+    from stactools.core.io import ReadHrefModifier
 
 logger = logging.getLogger(__name__)
 
@@ -54,6 +61,8 @@ def create_command(esaccilc: Group) -> Command:
         Args:
             destination (str): An HREF for the Collection JSON
         """
+        from stactools.esa_cci_lc.cog import stac
+
         collection = stac.create_collection(id, start_time, end_time)
         collection.set_self_href(destination)
         collection.save_object()
@@ -66,23 +75,22 @@ def create_command(esaccilc: Group) -> Command:
     )
     @click.argument("source")
     @click.argument("destination_directory")
-    @click.option(
-        "--cog_tile_dim",
-        default=constants.COG_TILE_DIM,
-        help="COG tile dimension in pixels. Defaults to 16200.",
-        type=int,
-    )
-    @click.option(
-        "--tile_col_row",
-        type=(int, int),
-        help="Limit COG creation to a single tile within the tile grid at "
-        "index location 'column' 'row'. Indices are 0 based.",
-    )
+    @_tiling_options
+    @_output_format_option
     def create_items_command(
         source: str,
         destination_directory: str,
         cog_tile_dim: int,
         tile_col_row: Optional[List[int]],
+        bbox: Optional[List[float]],
+        aoi: Optional[Dict[str, Any]],
+        workers: Optional[int],
+        max_memory: Optional[int],
+        constant_tiles: str,
+        queue_depth: int,
+        resume: bool,
+        profile: Optional[str],
+        output_format: str,
     ) -> None:
         """Creates tiled COGs and Items from a source NetCDF file.
 
@@ -90,18 +98,383 @@ def create_command(esaccilc: Group) -> Command:
         Args:
             source (str): Local path to the NetCDF file.
             destination_directory (str): Directory to store created COGs and
-                Items.
+                Items. With '--resume', existing Item JSON files are not
+                rewritten.
+        """
+        from stactools.esa_cci_lc.cog import bulk, stac
+
+        options: Dict[str, Any] = dict(
+            cog_tile_dim=cog_tile_dim,
+            tile_col_row=tile_col_row,
+            workers=workers,
+            max_memory=max_memory,
+            constant_tiles=constant_tiles,
+            queue_depth=queue_depth,
+            resume=resume,
+            bbox=bbox,
+            aoi=aoi,
+        )
+        with profiling.profile_report(profile, click.echo):
+            if output_format in writers.ITEM_FILE_FORMATS:
+                # Items of a single file are created as plain dicts
+                item_dicts = bulk.iter_item_dicts_batch(
+                    [source], destination_directory, **options
+                )
+                path = writers.item_file_path(destination_directory, output_format)
+                with writers.ItemWriter(path, output_format) as writer:
+                    writer.write_all(item_dicts)
+                return None
+            items = stac.iter_items(source, destination_directory, **options)
+            for item in items:
+                dest_href = str(Path(destination_directory, f"{item.id}.json"))
+                if resume and _is_item_file(dest_href):
+                    continue
+                item.save_object(dest_href=dest_href)
+
+        return None
+
+    @cog.command(
+        "create-items-batch",
+        short_help="Creates STAC items for COG tiles derived from several NetCDF "
+        "files",
+    )
+    @click.argument("source")
+    @click.argument("destination_directory")
+    @click.option(
+        "--items-file",
+        help="Name of the file with the Items of all NetCDF files, relative to "
+        "the destination directory. Defaults to 'items' with the extension of "
+        "the output format, e.g., 'items.json' for an ItemCollection.",
+    )
+    @_tiling_options
+    @_output_format_option
+    def create_items_batch_command(
+        source: str,
+        destination_directory: str,
+        items_file: Optional[str],
+        cog_tile_dim: int,
+        tile_col_row: Optional[List[int]],
+        bbox: Optional[List[float]],
+        aoi: Optional[Dict[str, Any]],
+        workers: Optional[int],
+        max_memory: Optional[int],
+        constant_tiles: str,
+        queue_depth: int,
+        resume: bool,
+        profile: Optional[str],
+        output_format: str,
+    ) -> None:
+        """Creates tiled COGs from several NetCDF files, e.g., all years, in a
+        single run and streams their Items to a single ItemCollection, NDJSON
+        or stac-geoparquet file, without holding them in memory.
+
+        \b
+        Args:
+            source (str): Local directory with NetCDF files, or a glob pattern
+                matching NetCDF files.
+            destination_directory (str): Directory to store created COGs and
+                the ItemCollection.
         """
-        items = stac.create_items(
-            source,
-            destination_directory,
+        nc_paths = _find_netcdf_files(source)
+        if not nc_paths:
+            raise click.BadParameter(
+                f"No NetCDF files found at '{source}'.", param_hint="SOURCE"
+            )
+        logger.info(f"Creating Items for {len(nc_paths)} NetCDF files")
+
+        from stactools.esa_cci_lc.cog import bulk
+
+        options: Dict[str, Any] = dict(
             cog_tile_dim=cog_tile_dim,
             tile_col_row=tile_col_row,
+            workers=workers,
+            max_memory=max_memory,
+            constant_tiles=constant_tiles,
+            queue_depth=queue_depth,
+            resume=resume,
+            bbox=bbox,
+            aoi=aoi,
+        )
+        with profiling.profile_report(profile, click.echo):
+            item_dicts = bulk.iter_item_dicts_batch(
+                nc_paths, destination_directory, **options
+            )
+            path = writers.item_file_path(
+                destination_directory, output_format, items_file
+            )
+            with writers.ItemWriter(path, output_format) as writer:
+                writer.write_all(item_dicts)
+
+        return None
+
+    @cog.command(
+        "create-items-from-cogs",
+        short_help="Creates STAC items for existing COG tiles",
+    )
+    @click.argument("source")
+    @click.argument("destination_directory")
+    @click.option(
+        "--listing",
+        is_flag=True,
+        default=False,
+        help="Read the COG HREFs from SOURCE, a text file with one HREF per line.",
+    )
+    @click.option(
+        "--cog_tile_dim",
+        type=int,
+        help="COG tile dimension in pixels the COGs were created with. If given, "
+        "Item geometries and projection properties are computed from the tile "
+        "grid instead of being read from COG headers.",
+    )
+    @click.option(
+        "--verify-fraction",
+        type=click.FloatRange(0, 1),
+        default=0.0,
+        help="Fraction of Items checked against a COG header when "
+        "'--cog_tile_dim' is given. Defaults to 0.",
+    )
+    @click.option(
+        "--threads",
+        type=click.IntRange(min=1),
+        help="Number of threads creating Items concurrently.",
+    )
+    @click.option(
+        "--read-href-modifier",
+        help="Function that modifies COG HREFs before they are read, e.g., to "
+        "sign URLs, given as 'module:function'.",
+        callback=_import_function_option,
+    )
+    @_output_format_option
+    def create_items_from_cogs_command(
+        source: str,
+        destination_directory: str,
+        listing: bool,
+        cog_tile_dim: Optional[int],
+        verify_fraction: float,
+        threads: Optional[int],
+        read_href_modifier: Optional["ReadHrefModifier"],
+        output_format: str,
+    ) -> None:
+        """Creates an Item for each tile of existing COGs. The COGs are
+        grouped by tile through their file names.
+
+        \b
+        Args:
+            source (str): Local or remote directory of COGs, a glob pattern
+                matching COGs or, with '--listing', a file listing COG HREFs.
+            destination_directory (str): Directory to store created Items.
+        """
+        from stactools.esa_cci_lc.cog import bulk, stac
+
+        cog_hrefs = stac.list_cog_hrefs(source, listing)
+        if not cog_hrefs:
+            raise click.BadParameter(
+                f"No COGs found at '{source}'.", param_hint="SOURCE"
+            )
+
+        options: Dict[str, Any] = dict(
+            read_href_modifier=read_href_modifier,
+            cog_tile_dim=cog_tile_dim,
+            verify_fraction=verify_fraction,
+            threads=threads,
+        )
+        Path(destination_directory).mkdir(parents=True, exist_ok=True)
+        count = 0
+        if output_format in writers.ITEM_FILE_FORMATS:
+            item_dicts = bulk.iter_item_dicts_from_cogs(cog_hrefs, **options)
+            path = writers.item_file_path(destination_directory, output_format)
+            with writers.ItemWriter(path, output_format) as writer:
+                count = writer.write_all(item_dicts)
+        else:
+            for item in stac.iter_items_from_cogs(cog_hrefs, **options):
+                item.save_object(
+                    dest_href=str(Path(destination_directory, f"{item.id}.json"))
+                )
+                count += 1
+        logger.info(f"Created {count} Items from {len(cog_hrefs)} COGs")
+
+        return None
+
+    @cog.command(
+        "create-overviews",
+        short_help="Creates global low resolution overview COGs from a NetCDF file",
+    )
+    @click.argument("source")
+    @click.argument("destination_directory")
+    @click.option(
+        "--factor",
+        "factors",
+        type=click.IntRange(min=2),
+        multiple=True,
+        help="Decimation factor relative to the 300 m source resolution. Can be "
+        "given multiple times for several resolutions. Defaults to "
+        f"{', '.join(str(factor) for factor in constants.OVERVIEW_FACTORS)}.",
+    )
+    @click.option(
+        "--collection",
+        help="Optional HREF of a Collection JSON to which the overview COGs are "
+        "added as Assets.",
+    )
+    def create_overviews_command(
+        source: str,
+        destination_directory: str,
+        factors: List[int],
+        collection: Optional[str],
+    ) -> None:
+        """Creates a global overview COG of each variable in a source NetCDF
+        file, streaming over the file.
+
+        \b
+        Args:
+            source (str): Local path to the NetCDF file.
+            destination_directory (str): Directory to store created COGs.
+        """
+        from pystac import Collection
+
+        from stactools.esa_cci_lc.cog import stac
+        from stactools.esa_cci_lc.cog.overview import make_overview_cogs
+
+        cog_paths = make_overview_cogs(
+            source, destination_directory, list(factors) or None
         )
-        for item in items:
-            dest_href = str(Path(destination_directory, f"{item.id}.json"))
-            item.save_object(dest_href=dest_href)
+
+        if collection is not None:
+            stac_collection = Collection.from_file(collection)
+            stac.add_overview_assets(stac_collection, cog_paths)
+            stac_collection.save_object(dest_href=collection)
 
         return None
 
     return cog
+
+
+def _tiling_options(function: Callable[..., None]) -> Callable[..., None]:
+    """Adds the tiling options shared by the item creation commands."""
+    options = [
+        click.option(
+            "--cog_tile_dim",
+            default=constants.COG_TILE_DIM,
+            help="COG tile dimension in pixels. Defaults to 16200.",
+            type=int,
+        ),
+        click.option(
+            "--tile_col_row",
+            type=(int, int),
+            help="Limit COG creation to a single tile within the tile grid at "
+            "index location 'column' 'row'. Indices are 0 based.",
+        ),
+        click.option(
+            "--bbox",
+            type=(float, float, float, float),
+            help="Limit COG creation to the tiles intersecting a bounding box "
+            "given as 'west' 'south' 'east' 'north' in degrees.",
+        ),
+        click.option(
+            "--aoi",
+            help="Limit COG creation to the tiles intersecting an area of interest, "
+            "given as the path to a GeoJSON geometry, Feature or FeatureCollection.",
+            callback=_read_aoi_option,
+        ),
+        click.option(
+            "--workers",
+            help="Number of worker processes used to create the COGs. Defaults to 1, "
+            "or to as many as fit into '--max-memory' if a memory budget is given.",
+            type=click.IntRange(min=1),
+        ),
+        click.option(
+            "--max-memory",
+            help="Memory budget for the run, e.g., '6GiB' or '512MB'. Used to plan "
+            "the read strip height and the number of workers without changing the "
+            "tile grid.",
+            callback=parse_memory_option,
+        ),
+        click.option(
+            "--constant-tiles",
+            type=click.Choice(constants.CONSTANT_TILE_POLICIES),
+            default="encode",
+            help="How to handle tiles in which a variable holds a single value: "
+            "'encode' them as usual, write 'compact' COGs with a single overview, or "
+            "'skip' tiles in which every variable is constant. Skipped tiles get no "
+            "Item and are recorded in a manifest file. Defaults to 'encode'.",
+        ),
+        click.option(
+            "--queue-depth",
+            type=click.IntRange(min=0),
+            default=constants.QUEUE_DEPTH,
+            help="Number of strips read ahead and of tiles encoded at a time, so "
+            "that reading the NetCDF overlaps with encoding the COGs. Higher values "
+            "hold more strips in memory, 0 runs reading and encoding in turn. "
+            f"Defaults to {constants.QUEUE_DEPTH}.",
+        ),
+        click.option(
+            "--resume",
+            is_flag=True,
+            default=False,
+            help="Resume an interrupted run. COGs recorded as completed in the "
+            "manifest file that still match their size and checksum are kept.",
+        ),
+        click.option(
+            "--profile",
+            help="Path to a JSON report of the time, bytes and pixels of each "
+            "processing stage, per variable and tile. A summary table is printed.",
+        ),
+    ]
+    for option in reversed(options):
+        function = option(function)
+    return function
+
+
+_output_format_option = click.option(
+    "--output-format",
+    type=click.Choice(writers.OUTPUT_FORMATS),
+    default="json",
+    help="Format of the Items: a 'json' file per Item, or all Items streamed to "
+    "a single 'ndjson' (newline-delimited JSON) or 'geoparquet' "
+    "(stac-geoparquet) file in the destination directory, e.g., 'items.ndjson'. "
+    "'geoparquet' requires the 'geoparquet' extra. Defaults to 'json'.",
+)
+
+
+def _find_netcdf_files(source: str) -> List[str]:
+    if os.path.isdir(source):
+        source = os.path.join(source, "*.nc")
+    return sorted(glob.glob(source))
+
+
+def _is_item_file(href: str) -> bool:
+    # Items are not written atomically, so an interrupted run may leave a
+    # truncated file behind
+    try:
+        with open(href) as f:
+            json.load(f)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def _read_aoi_option(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[Dict[str, Any]]:
+    if value is None:
+        return None
+    try:
+        with open(value) as f:
+            aoi: Dict[str, Any] = json.load(f)
+    except (OSError, ValueError) as e:
+        raise click.BadParameter(f"Can't read GeoJSON from '{value}': {e}")
+    return aoi
+
+
+def _import_function_option(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[Callable[..., Any]]:
+    if value is None:
+        return None
+    module_name, _, function_name = value.partition(":")
+    try:
+        function = getattr(importlib.import_module(module_name), function_name)
+    except (ImportError, AttributeError, ValueError) as e:
+        raise click.BadParameter(f"Can't import '{value}': {e}")
+    if not callable(function):
+        raise click.BadParameter(f"'{value}' is not a function.")
+    return cast(Callable[..., Any], function)
@@ -0,0 +1,302 @@
+import logging
+import math
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from rasterio.transform import Affine
+from rasterio.windows import Window
+from shapely.geometry import box, shape
+from shapely.geometry.base import BaseGeometry
+from shapely.ops import unary_union
+
+from .. import constants
+
+logger = logging.getLogger(__name__)
+
+TILE_ID_PATTERN = re.compile(r"^([NS])(\d{2,})([EW])(\d{3,})$")
+
+
+class TileGrid:
+    """Regular grid of COG tiles over the global NetCDF data.
+
+    Tiles are addressed by their 0 based (column, row) index, starting at the
+    upper left corner of the grid, or by their tile ID. Tile IDs are the
+    geographic coordinates of the lower left tile corner rounded to the
+    nearest degree, e.g., 'N79W180'. All lookups are computed from the index,
+    the grid is never materialized.
+
+    Args:
+        tile_dim (int): COG tile dimension in pixels. Must evenly divide the
+            source data shape.
+    """
+
+    def __init__(self, tile_dim: int) -> None:
+        for dim in constants.NETCDF_DATA_SHAPE:
+            if dim % tile_dim:
+                raise ValueError(
+                    f"Source data shape '{constants.NETCDF_DATA_SHAPE}' is not "
+                    f"evenly divisible by the tile dimension '{tile_dim}'."
+                )
+        self.tile_dim = tile_dim
+        self.num_rows = constants.NETCDF_DATA_SHAPE[0] // tile_dim
+        self.num_cols = constants.NETCDF_DATA_SHAPE[1] // tile_dim
+        self.deg_increment = 360 / self.num_cols
+        self.source_transform = Affine(
+            360 / constants.NETCDF_DATA_SHAPE[1],
+            0.0,
+            -180.0,
+            0.0,
+            -180 / constants.NETCDF_DATA_SHAPE[0],
+            90.0,
+        )
+        if 360 % self.num_cols:
+            logger.warning(
+                "Non-integer tile degree increment. Lower left corner coordinates "
+                "in tile file names will be rounded to nearest integer degree."
+            )
+
+    def __len__(self) -> int:
+        return self.num_cols * self.num_rows
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        """Iterates over the (column, row) indices of all tiles, column by
+        column."""
+        for col in range(self.num_cols):
+            for row in range(self.num_rows):
+                yield col, row
+
+    def __contains__(self, col_row: object) -> bool:
+        if not isinstance(col_row, (tuple, list)) or len(col_row) != 2:
+            return False
+        col, row = col_row
+        return bool(0 <= col < self.num_cols and 0 <= row < self.num_rows)
+
+    def check(self, col: int, row: int) -> None:
+        """Raises a ValueError if a column or row falls outside of the grid.
+
+        Args:
+            col (int): Tile grid column index.
+            row (int): Tile grid row index.
+        """
+        if (col, row) not in self:
+            raise ValueError(
+                f"Specified tile column ({col}) or row ({row}) falls outside of "
+                f"tile grid. Valid columns = 0 to {self.num_cols - 1}, valid rows = "
+                f"0 to {self.num_rows - 1}."
+            )
+
+    def tile_id(self, col: int, row: int) -> str:
+        """Returns the ID of a tile.
+
+        Args:
+            col (int): Tile grid column index.
+            row (int): Tile grid row index.
+
+        Returns:
+            str: The tile ID, e.g., 'N79W180'.
+        """
+        self.check(col, row)
+        bottom = round(90 - (row + 1) * self.deg_increment)
+        bottom_text = f"{'S' if bottom < 0 else 'N'}{abs(bottom):02d}"
+        left = round((col * self.deg_increment) - 180)
+        left_text = f"{'W' if left < 0 else 'E'}{abs(left):03d}"
+        return f"{bottom_text}{left_text}"
+
+    def col_row(self, tile_id: str) -> Tuple[int, int]:
+        """Returns the (column, row) index of a tile ID.
+
+        Args:
+            tile_id (str): The tile ID, e.g., 'N79W180'.
+
+        Returns:
+            Tuple[int, int]: Tile grid column and row indices.
+        """
+        match = TILE_ID_PATTERN.match(tile_id)
+        if match:
+            bottom = int(match.group(2)) * (-1 if match.group(1) == "S" else 1)
+            left = int(match.group(4)) * (-1 if match.group(3) == "W" else 1)
+            col = round((left + 180) / self.deg_increment)
+            row = round((90 - bottom) / self.deg_increment) - 1
+            # IDs are rounded, so the inverse only holds if it round-trips
+            if (col, row) in self and self.tile_id(col, row) == tile_id:
+                return col, row
+        raise ValueError(
+            f"Tile ID '{tile_id}' is not part of the tile grid of tile dimension "
+            f"'{self.tile_dim}'."
+        )
+
+    def window(self, col: int, row: int) -> Window:
+        """Returns the window of a tile in the source data.
+
+        Args:
+            col (int): Tile grid column index.
+            row (int): Tile grid row index.
+
+        Returns:
+            Window: The rasterio window.
+        """
+        self.check(col, row)
+        return Window(
+            col * self.tile_dim, row * self.tile_dim, self.tile_dim, self.tile_dim
+        )
+
+    def transform(self, col: int, row: int) -> Affine:
+        """Returns the affine transform of a tile.
+
+        Args:
+            col (int): Tile grid column index.
+            row (int): Tile grid row index.
+
+        Returns:
+            Affine: The transform of the tile's upper left pixel corner.
+        """
+        left, _, _, top = self.bounds(col, row)
+        source = self.source_transform
+        return Affine(source.a, source.b, left, source.d, source.e, top)
+
+    def bounds(self, col: int, row: int) -> Tuple[float, float, float, float]:
+        """Returns the exact geographic bounds of a tile.
+
+        Args:
+            col (int): Tile grid column index.
+            row (int): Tile grid row index.
+
+        Returns:
+            Tuple[float, float, float, float]: Left, bottom, right and top
+                coordinates in degrees.
+        """
+        self.check(col, row)
+        left = col * self.deg_increment - 180
+        top = 90 - row * self.deg_increment
+        return (
+            left,
+            top - self.deg_increment,
+            left + self.deg_increment,
+            top,
+        )
+
+    def intersecting(
+        self,
+        bbox: Optional[Sequence[float]] = None,
+        geometry: Optional[BaseGeometry] = None,
+    ) -> List[Tuple[int, int]]:
+        """Finds the tiles whose interior intersects a bounding box and/or a
+        geometry, in grid order. Tiles that only touch them along an edge are
+        not included. A bounding box whose west coordinate is larger than its
+        east coordinate crosses the antimeridian.
+
+        Args:
+            bbox (Optional[Sequence[float]]): West, south, east and north
+                coordinates in degrees.
+            geometry (Optional[BaseGeometry]): A geometry in geographic
+                coordinates. Only tiles within its bounds are tested.
+
+        Returns:
+            List[Tuple[int, int]]: Tile grid column and row indices.
+        """
+        if bbox is None and geometry is None:
+            return list(self)
+        col_ranges = [(0, self.num_cols)]
+        rows = (0, self.num_rows)
+        if bbox is not None:
+            west, south, east, north = bbox
+            if south > north:
+                raise ValueError(
+                    f"South must not be larger than north in bbox '{list(bbox)}'."
+                )
+            if west > east:
+                col_ranges = _intersect_ranges(
+                    col_ranges,
+                    [self._cols(west, 180.0), self._cols(-180.0, east)],
+                )
+            else:
+                col_ranges = _intersect_ranges(col_ranges, [self._cols(west, east)])
+            rows = _intersect_range(rows, self._rows(south, north))
+        if geometry is not None:
+            west, south, east, north = geometry.bounds
+            col_ranges = _intersect_ranges(col_ranges, [self._cols(west, east)])
+            rows = _intersect_range(rows, self._rows(south, north))
+
+        tiles = []
+        for cols in col_ranges:
+            for col in range(*cols):
+                for row in range(*rows):
+                    if geometry is None or _intersects_interior(
+                        geometry, box(*self.bounds(col, row))
+                    ):
+                        tiles.append((col, row))
+        return sorted(tiles)
+
+    def _cols(self, west: float, east: float) -> Tuple[int, int]:
+        """Half-open range of the columns whose interior overlaps [west, east]."""
+        start = math.floor((west + 180) / self.deg_increment)
+        end = math.ceil((east + 180) / self.deg_increment)
+        # A degenerate range still selects the tile the coordinate falls in
+        if end <= start:
+            end = start + 1
+        return max(start, 0), min(end, self.num_cols)
+
+    def _rows(self, south: float, north: float) -> Tuple[int, int]:
+        """Half-open range of the rows whose interior overlaps [south, north]."""
+        start = math.floor((90 - north) / self.deg_increment)
+        end = math.ceil((90 - south) / self.deg_increment)
+        if end <= start:
+            end = start + 1
+        return max(start, 0), min(end, self.num_rows)
+
+
+@lru_cache(maxsize=None)
+def get_tile_grid(tile_dim: int) -> TileGrid:
+    """Returns a shared tile grid of a tile dimension.
+
+    Args:
+        tile_dim (int): COG tile dimension in pixels.
+
+    Returns:
+        TileGrid: The tile grid.
+    """
+    return TileGrid(tile_dim)
+
+
+def geometry_from_geojson(geojson: Dict[str, Any]) -> BaseGeometry:
+    """Reads a geometry from a GeoJSON geometry, Feature or FeatureCollection.
+    The geometries of a FeatureCollection are merged.
+
+    Args:
+        geojson (Dict[str, Any]): The GeoJSON object.
+
+    Returns:
+        BaseGeometry: The geometry.
+    """
+    geojson_type = geojson.get("type")
+    if geojson_type == "FeatureCollection":
+        return unary_union(
+            [geometry_from_geojson(feature) for feature in geojson["features"]]
+        )
+    if geojson_type == "Feature":
+        return shape(geojson["geometry"])
+    return shape(geojson)
+
+
+def _intersects_interior(geometry: BaseGeometry, tile: BaseGeometry) -> bool:
+    # Points and lines have no interior, they select every tile they touch
+    if geometry.area == 0:
+        return bool(geometry.intersects(tile))
+    return bool(geometry.intersects(tile) and not geometry.touches(tile))
+
+
+def _intersect_range(a: Tuple[int, int], b: Tuple[int, int]) -> Tuple[int, int]:
+    start = max(a[0], b[0])
+    return start, max(start, min(a[1], b[1]))
+
+
+def _intersect_ranges(
+    a: List[Tuple[int, int]], b: List[Tuple[int, int]]
+) -> List[Tuple[int, int]]:
+    return [
+        _intersect_range(range_a, range_b)
+        for range_a in a
+        for range_b in b
+        if min(range_a[1], range_b[1]) > max(range_a[0], range_b[0])
+    ]
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import logging
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .statistics import BandStatistics
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_ALGORITHM = "sha256"
+CHECKSUM_BLOCK_SIZE = 8 * 1024**2
+
+
+@dataclass(frozen=True)
+class CogRecord:
+    """Size and checksum of a completed COG."""
+
+    size: int
+    checksum: str
+
+    @classmethod
+    def from_file(cls, path: str) -> "CogRecord":
+        """Reads the size and computes the checksum of a file.
+
+        Args:
+            path (str): Path to the file.
+
+        Returns:
+            CogRecord: The record of the file.
+        """
+        digest = hashlib.new(CHECKSUM_ALGORITHM)
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(CHECKSUM_BLOCK_SIZE), b""):
+                digest.update(block)
+        return cls(
+            size=os.path.getsize(path),
+            checksum=f"{CHECKSUM_ALGORITHM}:{digest.hexdigest()}",
+        )
+
+
+class TilingManifest:
+    """Records the outcome of tiling a NetCDF file in a JSON file next to the
+    COGs, so that it survives the run that created it.
+
+    Completed COGs are recorded with their size and checksum, which allows an
+    interrupted run to be resumed without redoing verified COGs. Tiles that
+    were skipped because every variable holds a single value are recorded
+    with these values. The band statistics of completed COGs are kept as
+    well, so the Items of resumed tiles have them without reading the COGs.
+
+    Args:
+        path (str): Path to the manifest JSON file. An existing manifest is
+            loaded.
+        tile_dim (Optional[int]): Tile dimension of the run. Records of an
+            existing manifest created with a different tile dimension are
+            discarded, since tile IDs don't identify windows across tile
+            dimensions.
+    """
+
+    def __init__(self, path: str, tile_dim: Optional[int] = None) -> None:
+        self.path = path
+        self.tile_dim = tile_dim
+        self.completed: Dict[str, Dict[str, CogRecord]] = {}
+        self.skipped: Dict[str, Dict[str, int]] = {}
+        self.statistics: Dict[str, Dict[str, BandStatistics]] = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                data = json.load(f)
+            if tile_dim is not None and data.get("tile_dim", tile_dim) != tile_dim:
+                logger.warning(
+                    f"Discarding manifest {path}, which was created with a tile "
+                    f"dimension of {data['tile_dim']} instead of {tile_dim}."
+                )
+                return
+            self.tile_dim = data.get("tile_dim", tile_dim)
+            self.completed = {
+                tile: {
+                    variable: CogRecord(**record) for variable, record in cogs.items()
+                }
+                for tile, cogs in data.get("completed", {}).items()
+            }
+            self.skipped = data.get("skipped", {})
+            self.statistics = {
+                tile: {
+                    variable: BandStatistics.from_dict(statistics)
+                    for variable, statistics in variables.items()
+                }
+                for tile, variables in data.get("statistics", {}).items()
+            }
+
+    @classmethod
+    def for_source(
+        cls, nc_path: str, cog_dir: str, tile_dim: Optional[int] = None
+    ) -> "TilingManifest":
+        """Loads or creates the manifest for the COGs of a NetCDF file.
+
+        Args:
+            nc_path (str): Path to the NetCDF file.
+            cog_dir (str): Directory with the COGs.
+            tile_dim (Optional[int]): Tile dimension of the run.
+
+        Returns:
+            TilingManifest: The manifest.
+        """
+        return cls(str(Path(cog_dir) / f"{Path(nc_path).stem}-manifest.json"), tile_dim)
+
+    def complete(
+        self,
+        tile: str,
+        variable: str,
+        record: CogRecord,
+        statistics: Optional[BandStatistics] = None,
+    ) -> None:
+        """Records a completed COG.
+
+        Args:
+            tile (str): Tile ID.
+            variable (str): Variable of the COG.
+            record (CogRecord): Size and checksum of the COG.
+            statistics (Optional[BandStatistics]): Band statistics of the COG,
+                if computed.
+        """
+        self.completed.setdefault(tile, {})[variable] = record
+        if statistics is None:
+            self.statistics.get(tile, {}).pop(variable, None)
+        else:
+            self.statistics.setdefault(tile, {})[variable] = statistics
+
+    def is_complete(self, tile: str, variable: str, cog_path: str) -> bool:
+        """Checks whether a COG has been recorded as completed and the file
+        still matches the recorded size and checksum. Missing, truncated or
+        otherwise modified files are not complete.
+
+        Args:
+            tile (str): Tile ID.
+            variable (str): Variable of the COG.
+            cog_path (str): Path to the COG.
+
+        Returns:
+            bool: Whether the COG is complete.
+        """
+        record = self.completed.get(tile, {}).get(variable)
+        if record is None or not os.path.exists(cog_path):
+            return False
+        # The size check is cheap and catches partially written files before
+        # the whole file is read for the checksum
+        if os.path.getsize(cog_path) != record.size:
+            return False
+        return CogRecord.from_file(cog_path) == record
+
+    def skip(self, tile: str, values: Dict[str, int]) -> None:
+        """Records a tile that has not been created because every variable
+        holds a single value.
+
+        Args:
+            tile (str): Tile ID.
+            values (Dict[str, int]): The constant value of each variable.
+        """
+        self.completed.pop(tile, None)
+        self.statistics.pop(tile, None)
+        self.skipped[tile] = {
+            variable: int(value) for variable, value in values.items()
+        }
+
+    def unskip(self, tile: str) -> None:
+        """Removes the record of a skipped tile, e.g., after it was created.
+
+        Args:
+            tile (str): Tile ID.
+        """
+        self.skipped.pop(tile, None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "tile_dim": self.tile_dim,
+            "completed": {
+                tile: {variable: asdict(record) for variable, record in cogs.items()}
+                for tile, cogs in self.completed.items()
+            },
+            "skipped": self.skipped,
+            "statistics": {
+                tile: {
+                    variable: statistics.to_dict()
+                    for variable, statistics in variables.items()
+                }
+                for tile, variables in self.statistics.items()
+            },
+        }
+
+    def save(self) -> None:
+        """Writes the manifest. The file is replaced atomically, so an
+        interrupted run never leaves a partially written manifest behind."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
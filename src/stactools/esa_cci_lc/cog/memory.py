@@ -0,0 +1,113 @@
+import math
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .. import constants
+
+NETCDF_CHUNK_HEIGHT = 2025
+
+# Resident memory of a worker process with numpy, GDAL and the NetCDF
+# libraries loaded, before any data has been read
+PROCESS_OVERHEAD = 200 * 1024**2
+# GDAL block cache of each process, used by the NetCDF reads and the overview
+# generation of the COG driver
+GDAL_CACHE = 256 * 1024**2
+# A strip is read into one array and remapped into a second one
+STRIP_COPIES = 2
+
+
+@dataclass(frozen=True)
+class MemoryPlan:
+    """Tiling parameters that keep a run within a memory budget."""
+
+    workers: int
+    strip_height: int
+    tiles_in_flight: int
+    gdal_cache: int
+
+
+def plan_memory(
+    max_memory: int,
+    window_shapes: List[List[int]],
+    workers: Optional[int] = None,
+    chunk_height: int = NETCDF_CHUNK_HEIGHT,
+    queue_depth: int = 0,
+) -> MemoryPlan:
+    """Plans the worker count, strip height and number of tiles in flight for
+    a tiling run so that the run stays within a memory budget.
+
+    The memory required per strip row is derived from the data types of
+    ``constants.COG_ASSETS`` and the widest window. Strip heights are whole
+    multiples of the NetCDF chunk height where the budget allows, so that
+    every chunk is read once, and are reduced below the chunk height only for
+    very small budgets.
+
+    Args:
+        max_memory (int): Memory budget for the whole run in bytes.
+        window_shapes (List[List[int]]): Height and width of each tile window.
+        workers (Optional[int]): Upper bound for the number of worker
+            processes. Defaults to the number of CPUs.
+        chunk_height (int): Height of the NetCDF chunks in pixels.
+        queue_depth (int): Number of strips read ahead of their processing,
+            each of which is held in an additional read array.
+
+    Returns:
+        MemoryPlan: The planned tiling parameters.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    max_height = max(height for height, _ in window_shapes)
+    max_width = max(width for _, width in window_shapes)
+
+    itemsizes = [
+        np.dtype(asset["data_type"]).itemsize for asset in constants.COG_ASSETS.values()
+    ]
+    # A single process reads all variables of a tile together, while the jobs
+    # of a process pool each read a single variable
+    copies = STRIP_COPIES + queue_depth
+    serial_row_bytes = max_width * sum(itemsizes) * copies
+    job_row_bytes = max_width * max(itemsizes) * copies
+
+    workers = max(1, workers)
+    while True:
+        if workers == 1:
+            row_bytes = serial_row_bytes
+            per_worker = max_memory - PROCESS_OVERHEAD - GDAL_CACHE
+        else:
+            # The parent process only collects results
+            row_bytes = job_row_bytes
+            available = max_memory - PROCESS_OVERHEAD
+            per_worker = available // workers - PROCESS_OVERHEAD - GDAL_CACHE
+        max_rows = per_worker // row_bytes
+        if max_rows >= min(chunk_height, max_height) or workers == 1:
+            break
+        workers -= 1
+
+    if max_rows < 1:
+        required = PROCESS_OVERHEAD + GDAL_CACHE + row_bytes
+        raise ValueError(
+            f"Memory budget of {max_memory} bytes is too small to tile windows "
+            f"{max_width} pixels wide, at least {required} bytes are required."
+        )
+
+    if max_rows >= chunk_height:
+        strip_height = min(max_rows // chunk_height * chunk_height, max_height)
+    else:
+        strip_height = min(max_rows, max_height)
+
+    if workers == 1:
+        tiles_in_flight = 1
+    else:
+        # Enough tiles to keep every worker busy, plus one so that workers
+        # don't idle while the oldest tile is waited on
+        tiles_in_flight = math.ceil(workers / len(constants.DATA_VARIABLES)) + 1
+
+    return MemoryPlan(
+        workers=workers,
+        strip_height=int(strip_height),
+        tiles_in_flight=tiles_in_flight,
+        gdal_cache=GDAL_CACHE,
+    )
@@ -0,0 +1,245 @@
+import logging
+import math
+from contextlib import ExitStack
+from functools import reduce
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import rasterio
+from rasterio.transform import Affine
+from rasterio.windows import Window
+
+from .. import constants
+from .cog import copy_cog, open_scratch
+from .memory import NETCDF_CHUNK_HEIGHT
+from .transforms import TRANSFORMS
+
+logger = logging.getLogger(__name__)
+
+# Decimation factors of the overview COGs relative to the 300 m source data
+OVERVIEW_FACTORS = constants.OVERVIEW_FACTORS
+# Resampling of the overview COGs. The flag variables are resampled with the
+# mode like lccs_class, as averages of flags are not valid flag values. The
+# internal overviews of the tile COGs keep the resampling of their transforms.
+OVERVIEW_RESAMPLING = {
+    variable: "mode" if variable in constants.TABLES else "average"
+    for variable in constants.DATA_VARIABLES
+}
+# Upper bound of the size of read blocks that are aligned to the NetCDF chunks
+OVERVIEW_BLOCK_BYTES = 256 * 1024**2
+# Upper bound of the counts held in memory when finding the mode of blocks
+MODE_COUNTS_BYTES = 32 * 1024**2
+
+
+def make_overview_cogs(
+    nc_path: str,
+    cog_dir: str,
+    factors: Optional[List[int]] = None,
+) -> List[str]:
+    """Creates global, low resolution COGs of the NetCDF variables, one for
+    each variable and decimation factor.
+
+    Each variable of the NetCDF file is streamed once in blocks, and every
+    block is reduced for all factors in the same pass. Blocks are whole
+    multiples of both the NetCDF chunks and the factors if such blocks fit
+    ``OVERVIEW_BLOCK_BYTES``, so that every chunk is decompressed once.
+    Otherwise, e.g., for the default factor of 16, blocks are close to the
+    chunk size, and chunks on block edges are decompressed more than once. Each
+    block of ``factor`` x ``factor`` pixels is reduced to a single pixel with
+    the mode for ``lccs_class`` and the flag variables and the average for the
+    count variables. Nodata pixels are ignored, and blocks holding only nodata
+    become nodata. The COGs have internal overviews of their own, so they give
+    a fast path for low zoom levels.
+
+    Args:
+        nc_path (str): Local path to NetCDF file.
+        cog_dir (str): Local directory to store the created COGs.
+        factors (Optional[List[int]]): Decimation factors relative to the
+            source resolution. Each factor must evenly divide the source data
+            shape. Defaults to ``OVERVIEW_FACTORS``.
+
+    Returns:
+        List[str]: Paths of the created COGs, grouped by factor and in
+            ``constants.DATA_VARIABLES`` order.
+    """
+    if factors is None:
+        factors = OVERVIEW_FACTORS
+    for factor in factors:
+        if factor < 2 or any(dim % factor for dim in constants.NETCDF_DATA_SHAPE):
+            raise ValueError(
+                f"Overview factor '{factor}' must be at least 2 and evenly divide "
+                f"the source data shape '{constants.NETCDF_DATA_SHAPE}'."
+            )
+
+    Path(cog_dir).mkdir(parents=True, exist_ok=True)
+    cog_paths = {}
+    for variable in constants.DATA_VARIABLES:
+        with rasterio.open(f"netcdf:{nc_path}:{variable}") as src:
+            paths = _make_overview_cogs(src, nc_path, cog_dir, variable, factors)
+        for factor, cog_path in paths.items():
+            logger.info(f"Created overview COG {cog_path}")
+            cog_paths[factor, variable] = cog_path
+    return [
+        cog_paths[factor, variable]
+        for factor in factors
+        for variable in constants.DATA_VARIABLES
+    ]
+
+
+def overview_cog_path(nc_path: str, cog_dir: str, factor: int, variable: str) -> str:
+    """Returns the path of an overview COG. The tile part of regular COG file
+    names is replaced by the overview resolution, e.g., 'overview_4800m'.
+
+    Args:
+        nc_path (str): Path to the NetCDF file.
+        cog_dir (str): Directory of the COGs.
+        factor (int): Decimation factor of the overview.
+        variable (str): NetCDF variable.
+
+    Returns:
+        str: Path to the overview COG.
+    """
+    resolution = constants.RESOLUTION * factor
+    return str(
+        Path(cog_dir) / f"{Path(nc_path).stem}-overview_{resolution}m-{variable}.tif"
+    )
+
+
+def _make_overview_cogs(
+    src: rasterio.DatasetReader,
+    nc_path: str,
+    cog_dir: str,
+    variable: str,
+    factors: List[int],
+) -> Dict[int, str]:
+    transform = TRANSFORMS[variable]
+    resampling = OVERVIEW_RESAMPLING[variable]
+    cog_paths = {
+        factor: overview_cog_path(nc_path, cog_dir, factor, variable)
+        for factor in set(factors)
+    }
+
+    with ExitStack() as stack:
+        scratches = {
+            factor: open_scratch(
+                stack,
+                cog_path,
+                Window(0, 0, src.width // factor, src.height // factor),
+                src.transform * Affine.scale(factor),
+                variable,
+            )
+            for factor, cog_path in cog_paths.items()
+        }
+        # Each block is read once and reduced for every factor, so read blocks
+        # are whole multiples of all factors
+        block_size = _block_size(_lcm(cog_paths), np.dtype(src.dtypes[0]).itemsize)
+        for window in _get_blocks(src.height, src.width, block_size):
+            data = transform.apply(src.read(1, window=window))
+            for factor, scratch in scratches.items():
+                if resampling == "mode":
+                    reduced = _block_mode(data, factor, transform.nodata)
+                else:
+                    reduced = _block_average(data, factor, transform.nodata)
+                scratch.write(
+                    reduced.astype(transform.dtype, copy=False),
+                    1,
+                    window=Window(
+                        window.col_off // factor,
+                        window.row_off // factor,
+                        window.width // factor,
+                        window.height // factor,
+                    ),
+                )
+        for factor, scratch in scratches.items():
+            scratch.close()
+            copy_cog(
+                scratch.name,
+                cog_paths[factor],
+                variable,
+                compact=False,
+                overview_resampling=resampling,
+            )
+    return cog_paths
+
+
+def _block_size(multiple: int, itemsize: int) -> int:
+    """Returns the size of square read blocks that are a multiple of
+    ``multiple``, aligned to the NetCDF chunks if they fit
+    ``OVERVIEW_BLOCK_BYTES``, and close to the chunk size otherwise."""
+    aligned = _lcm([NETCDF_CHUNK_HEIGHT, multiple])
+    if aligned * aligned * itemsize <= OVERVIEW_BLOCK_BYTES:
+        return aligned
+    return multiple * max(1, round(NETCDF_CHUNK_HEIGHT / multiple))
+
+
+def _lcm(values: Iterable[int]) -> int:
+    # math.lcm requires Python 3.9
+    return reduce(lambda a, b: a * b // math.gcd(a, b), values, 1)
+
+
+def _get_blocks(height: int, width: int, block_size: int) -> Iterator[Window]:
+    for row_off in range(0, height, block_size):
+        for col_off in range(0, width, block_size):
+            yield Window(
+                col_off,
+                row_off,
+                min(block_size, width - col_off),
+                min(block_size, height - row_off),
+            )
+
+
+def _to_blocks(data: np.ndarray, factor: int) -> np.ndarray:
+    """Reshapes a 2D array to (block rows, block columns, pixels per block)."""
+    rows, cols = data.shape[0] // factor, data.shape[1] // factor
+    return (
+        data.reshape(rows, factor, cols, factor)
+        .swapaxes(1, 2)
+        .reshape(rows, cols, factor * factor)
+    )
+
+
+def _block_average(data: np.ndarray, factor: int, nodata: Optional[int]) -> np.ndarray:
+    """Averages each ``factor`` x ``factor`` block, rounded to the nearest
+    integer."""
+    blocks = _to_blocks(data, factor)
+    averages: np.ndarray
+    if nodata is None:
+        averages = np.rint(blocks.mean(axis=2, dtype=np.float64))
+        return averages
+    valid = blocks != nodata
+    counts = valid.sum(axis=2)
+    sums = np.where(valid, blocks, 0).sum(axis=2, dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = np.rint(sums / counts)
+    averages[counts == 0] = nodata
+    return averages
+
+
+def _block_mode(data: np.ndarray, factor: int, nodata: Optional[int]) -> np.ndarray:
+    """Finds the most common value of each ``factor`` x ``factor`` block of
+    byte data. Ties are resolved to the smallest value."""
+    if data.dtype != np.uint8:
+        raise ValueError(f"Mode resampling requires uint8 data, got '{data.dtype}'.")
+    blocks = _to_blocks(data, factor)
+    rows, cols, _ = blocks.shape
+    modes = np.empty((rows, cols), dtype=np.uint8)
+    # Values are counted per block with a single bincount over block offset
+    # values, for as many block rows at a time as fit the counts budget
+    step = max(1, MODE_COUNTS_BYTES // (cols * 256 * 8))
+    for start in range(0, rows, step):
+        end = start + step
+        chunk = blocks[start:end]
+        offsets = np.arange(chunk.shape[0] * cols, dtype=np.int64).reshape(
+            chunk.shape[0], cols, 1
+        )
+        counts = np.bincount(
+            (offsets * 256 + chunk).ravel(), minlength=offsets.size * 256
+        ).reshape(-1, 256)
+        if nodata is not None:
+            counts[:, nodata] = 0
+        chunk_modes = counts.argmax(axis=1).astype(np.uint8)
+        if nodata is not None:
+            chunk_modes[counts.max(axis=1) == 0] = nodata
+        modes[start:end] = chunk_modes.reshape(chunk.shape[0], cols)
+    return modes
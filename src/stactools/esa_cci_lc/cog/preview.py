@@ -0,0 +1,132 @@
+import math
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import rasterio
+from pystac.utils import make_absolute_href
+from rasterio.errors import NotGeoreferencedWarning
+from rasterio.windows import Window
+
+from .. import constants
+from .transforms import COLORMAP_LUT
+
+
+class PreviewSampler:
+    """Keeps every ``step``-th pixel of every ``step``-th row of a window while
+    it is streamed strip by strip, so that the preview images of a tile are
+    made from data that is in memory anyway.
+
+    The step is chosen so that the sample is at most as large as the largest
+    preview image in ``constants.PREVIEW_ASSETS``.
+
+    Args:
+        window (Window): Window of the tile.
+        dtype (str): Data type of the streamed data.
+    """
+
+    def __init__(self, window: Window, dtype: str) -> None:
+        size = max(asset["size"] for asset in constants.PREVIEW_ASSETS.values())
+        self.window = window
+        self.step = max(1, math.ceil(max(window.height, window.width) / size))
+        self.sample = np.zeros(
+            (
+                math.ceil(window.height / self.step),
+                math.ceil(window.width / self.step),
+            ),
+            dtype=dtype,
+        )
+
+    def add(self, strip: Window, data: np.ndarray) -> None:
+        """Adds the sampled pixels of a strip.
+
+        Args:
+            strip (Window): Full-width strip of the window.
+            data (np.ndarray): Data of the strip.
+        """
+        step = self.step
+        row = strip.row_off - self.window.row_off
+        # First row of the strip that falls on the step
+        first = -row % step
+        rows = data[first::step, ::step]
+        start = (row + first) // step
+        end = start + rows.shape[0]
+        self.sample[start:end] = rows
+
+    def fill(self, value: int) -> None:
+        """Sets the whole sample to a single value, e.g., of a constant window.
+
+        Args:
+            value (int): The value.
+        """
+        self.sample.fill(value)
+
+    def write(self, paths: Dict[str, str]) -> None:
+        """Writes an RGB PNG image of each preview asset, colored with the land
+        cover class colormap by a single lookup of all sampled values.
+
+        Args:
+            paths (Dict[str, str]): Output path of each preview asset key.
+        """
+        for key, path in paths.items():
+            size = constants.PREVIEW_ASSETS[key]["size"]
+            factor = max(1, math.ceil(max(self.sample.shape) / size))
+            rgb = COLORMAP_LUT[self.sample[::factor, ::factor], :3]
+            _write_png(path, rgb)
+
+
+def preview_paths(cog_path: str) -> Dict[str, str]:
+    """Returns the paths of the preview images of a tile, next to the COG of
+    ``constants.PREVIEW_VARIABLE``, e.g., '...-N90W180-thumbnail.png'.
+
+    Args:
+        cog_path (str): Path to the tile's COG of the preview variable.
+
+    Returns:
+        Dict[str, str]: Path of each preview asset key.
+    """
+    path = Path(cog_path)
+    prefix = path.stem.rsplit("-", 1)[0]
+    return {
+        key: str(path.with_name(f"{prefix}-{key}.png"))
+        for key in constants.PREVIEW_ASSETS
+    }
+
+
+def create_preview_asset(key: str, href: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Creates a basic preview image asset dict and optionally an href. An href
+    should be given for normal assets, but can be None for Item Asset
+    Definitions.
+
+    Args:
+        key (str): Key of the asset in ``constants.PREVIEW_ASSETS``.
+        href (str): The URL to the asset (optional)
+
+    Returns:
+        dict: Basic Asset object
+    """
+    asset: Dict[str, Any] = constants.PREVIEW_ASSETS[key].copy()
+    asset.pop("size")
+    asset["type"] = constants.PREVIEW_MEDIA_TYPE
+    if href is not None:
+        asset["href"] = make_absolute_href(href)
+    return asset
+
+
+def _write_png(path: str, rgb: np.ndarray) -> None:
+    height, width, count = rgb.shape
+    # Preview images are plain pictures without georeferencing
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", NotGeoreferencedWarning)
+        with rasterio.open(
+            path,
+            "w",
+            driver="PNG",
+            width=width,
+            height=height,
+            count=count,
+            dtype="uint8",
+        ) as dst:
+            dst.write(np.moveaxis(rgb, -1, 0))
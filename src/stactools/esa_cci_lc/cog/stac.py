@@ -1,9 +1,29 @@
 import logging
+import os
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import partial
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 
+import rasterio
+import stactools.core
 from dateutil.parser import isoparse
+from fsspec.core import url_to_fs
+from fsspec.implementations.local import LocalFileSystem
 from pystac import (
     Asset,
     CatalogType,
@@ -19,13 +39,22 @@ from pystac import (
 from pystac.extensions.item_assets import AssetDefinition, ItemAssetsExtension
 from pystac.extensions.projection import ProjectionExtension
 from pystac.extensions.scientific import ScientificExtension
-from stactools.core.io import ReadHrefModifier
+from stactools.core.io import ReadHrefModifier, read_text
+
+from .. import constants, profiling
+from .cog import COGMetadata, create_cog_asset, iter_cog_tiles, iter_cog_tiles_batch
+from .preview import create_preview_asset
+from .statistics import BandStatistics
 
-from .. import constants
-from .cog import COGMetadata, create_cog_asset, make_cog_tiles
+# Remote HREFs, e.g., http or abfs URLs, are read through fsspec. Set when
+# this module is imported rather than with the package, which keeps the
+# CLI startup fast.
+stactools.core.use_fsspec()
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 
 def create_items(
     nc_path: str,
@@ -34,9 +63,18 @@ def create_items(
     cog_tile_dim: int = constants.COG_TILE_DIM,
     tile_col_row: Optional[List[int]] = None,
     nc_api_url: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    constant_tiles: str = "encode",
+    queue_depth: int = constants.QUEUE_DEPTH,
+    resume: bool = False,
+    bbox: Optional[List[float]] = None,
+    aoi: Optional[Dict[str, Any]] = None,
 ) -> List[Item]:
     """Tiles NetCDF variables to COGs and creates an Item with COG assets for
-    each tile.
+    each tile. The assets have the band statistics and class pixel counts of
+    their COG, computed while tiling, and the Item has a thumbnail and a
+    preview image of the land cover classes.
 
     Args:
         nc_href (str): Local path to NetCDF file.
@@ -52,17 +90,149 @@ def create_items(
             esa-cci-lc-netcdf/items/'. The ID of the STAC Item describing the
             NetCDF file used to create the tiled COGs will be appended to this
             url and used in a 'derived_from' Link.
+        workers (Optional[int]): Number of worker processes used to create
+            the COGs. Items are created in this process once all COGs of a tile
+            exist. Defaults to 1, unless ``max_memory`` is given.
+        max_memory (Optional[int]): Optional memory budget in bytes. If given,
+            the read strip height, the number of workers (up to ``workers`` or
+            the number of CPUs) and the number of tiles in flight are planned
+            to stay within the budget. The tile grid is not affected.
+        constant_tiles (str): How to handle tiles in which a variable holds a
+            single value: "encode" (default) creates the COGs as usual,
+            "compact" creates such COGs with a single overview level and
+            "skip" creates neither COGs nor an Item for tiles in which every
+            variable is constant. Skipped tiles are recorded in a manifest
+            file in ``cog_dir``.
+        queue_depth (int): Depth of the queues between the reading, encoding
+            and writing stages of the tiling, which overlap in each process.
+            Bounds the strips read ahead and the tiles encoded at a time, see
+            :func:`stactools.esa_cci_lc.cog.cog.make_cog_tiles`. 0 runs the
+            stages in turn. Defaults to ``constants.QUEUE_DEPTH``.
+        resume (bool): Whether to resume an earlier run. COGs that have been
+            recorded as completed in the manifest file in ``cog_dir`` and
+            still match their recorded size and checksum are kept, and only
+            missing or partially written COGs are created. Items are created
+            for all tiles.
+        bbox (Optional[List[float]]): Optional west, south, east and north
+            coordinates in degrees. Use to create Items and COGs for the tiles
+            intersecting the bounding box only, e.g., for a regional refresh.
+        aoi (Optional[Dict[str, Any]]): Optional GeoJSON geometry, Feature or
+            FeatureCollection. Use to create Items and COGs for the tiles
+            intersecting the area of interest only. Can be combined with
+            ``bbox``, but not with ``tile_col_row``.
     Returns:
         List[Item]: List of created STAC Item objects.
     """
-    item_cog_lists = make_cog_tiles(nc_path, cog_dir, cog_tile_dim, tile_col_row)
+    return list(
+        iter_items(
+            nc_path,
+            cog_dir,
+            cog_tile_dim=cog_tile_dim,
+            tile_col_row=tile_col_row,
+            nc_api_url=nc_api_url,
+            workers=workers,
+            max_memory=max_memory,
+            constant_tiles=constant_tiles,
+            queue_depth=queue_depth,
+            resume=resume,
+            bbox=bbox,
+            aoi=aoi,
+        )
+    )
 
-    items = []
-    for item_cog_list in item_cog_lists:
-        item = create_item_from_asset_list(item_cog_list, nc_api_url=nc_api_url)
-        items.append(item)
 
-    return items
+def iter_items(
+    nc_path: str,
+    cog_dir: str,
+    *,
+    cog_tile_dim: int = constants.COG_TILE_DIM,
+    tile_col_row: Optional[List[int]] = None,
+    nc_api_url: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    constant_tiles: str = "encode",
+    queue_depth: int = constants.QUEUE_DEPTH,
+    resume: bool = False,
+    bbox: Optional[List[float]] = None,
+    aoi: Optional[Dict[str, Any]] = None,
+) -> Iterator[Item]:
+    """Tiles NetCDF variables to COGs and yields an Item with COG assets for
+    each tile as soon as the tile's COGs have been created.
+
+    Takes the same arguments as :func:`create_items`.
+
+    Returns:
+        Iterator[Item]: The created STAC Item objects, in tile grid order.
+    """
+    for cog_tile in iter_cog_tiles(
+        nc_path,
+        cog_dir,
+        cog_tile_dim,
+        tile_col_row,
+        workers=workers,
+        max_memory=max_memory,
+        constant_tiles=constant_tiles,
+        queue_depth=queue_depth,
+        resume=resume,
+        bbox=bbox,
+        aoi=aoi,
+    ):
+        yield create_item_from_asset_list(
+            cog_tile.hrefs,
+            nc_api_url=nc_api_url,
+            cog_tile_dim=cog_tile_dim,
+            statistics=cog_tile.statistics,
+            preview_hrefs=cog_tile.previews,
+        )
+
+
+def iter_items_batch(
+    nc_paths: List[str],
+    cog_dir: str,
+    *,
+    cog_tile_dim: int = constants.COG_TILE_DIM,
+    tile_col_row: Optional[List[int]] = None,
+    nc_api_url: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    constant_tiles: str = "encode",
+    queue_depth: int = constants.QUEUE_DEPTH,
+    resume: bool = False,
+    bbox: Optional[List[float]] = None,
+    aoi: Optional[Dict[str, Any]] = None,
+) -> Iterator[Item]:
+    """Tiles the NetCDF variables of several files, e.g., all years, to COGs
+    as a single run and yields an Item with COG assets for each tile.
+
+    The tile grid and memory plan are shared by all files, and with more than
+    one worker the COGs of all files are created from a single job queue.
+    Takes the same arguments as :func:`create_items`, except for a list of
+    NetCDF paths.
+
+    Returns:
+        Iterator[Item]: The created STAC Item objects, file by file in the
+            given order and in tile grid order within a file.
+    """
+    for cog_tile in iter_cog_tiles_batch(
+        nc_paths,
+        cog_dir,
+        cog_tile_dim,
+        tile_col_row,
+        workers=workers,
+        max_memory=max_memory,
+        constant_tiles=constant_tiles,
+        queue_depth=queue_depth,
+        resume=resume,
+        bbox=bbox,
+        aoi=aoi,
+    ):
+        yield create_item_from_asset_list(
+            cog_tile.hrefs,
+            nc_api_url=nc_api_url,
+            cog_tile_dim=cog_tile_dim,
+            statistics=cog_tile.statistics,
+            preview_hrefs=cog_tile.previews,
+        )
 
 
 def create_item_from_asset_list(
@@ -70,6 +240,10 @@ def create_item_from_asset_list(
     *,
     nc_api_url: Optional[str] = None,
     read_href_modifier: Optional[ReadHrefModifier] = None,
+    cog_tile_dim: Optional[int] = None,
+    verify_fraction: float = 0.0,
+    statistics: Optional[Dict[str, BandStatistics]] = None,
+    preview_hrefs: Optional[Dict[str, str]] = None,
 ) -> Item:
     """Generates a STAC Item from a list of HREFs to a single tile's COGs.
 
@@ -83,57 +257,354 @@ def create_item_from_asset_list(
             url and used in a 'derived_from' Link.
         read_href_modifier (Optional[ReadHrefModifier]): An optional function
             to modify an HREF, e.g., to add a token to a URL.
+        cog_tile_dim (Optional[int]): COG tile dimension in pixels the COGs
+            were created with. If given, the geometry, bbox and projection
+            properties are computed from the tile grid and the file name,
+            without opening any COG. Otherwise, they are read from the first
+            COG's header.
+        verify_fraction (float): Fraction of Items, between 0 and 1, whose
+            computed metadata is checked against the first COG's header when
+            ``cog_tile_dim`` is given. Items are sampled by ID, so the same
+            Items are checked on every run. Defaults to 0.
+        statistics (Optional[Dict[str, BandStatistics]]): Optional band
+            statistics of the COGs, keyed by variable, as computed while
+            tiling. They are added to the ``raster:bands`` of each asset and
+            as pixel counts to its ``classification:classes``.
+        preview_hrefs (Optional[Dict[str, str]]): Optional HREFs of the
+            tile's preview images, keyed by their asset key in
+            ``constants.PREVIEW_ASSETS``.
 
     Returns:
         Item: The created STAC Item object.
     """
+    check_asset_list(cog_hrefs, verify_fraction)
+
+    with profiling.stage("item") as record:
+        metadata = tile_metadata(
+            cog_hrefs, read_href_modifier, cog_tile_dim, verify_fraction
+        )
+
+        item = Item(
+            id=metadata.id,
+            geometry=metadata.geometry,
+            bbox=metadata.bbox,
+            datetime=None,
+            properties={
+                "start_datetime": metadata.start_datetime,
+                "end_datetime": metadata.end_datetime,
+                "esa_cci_lc:version": metadata.version,
+                "esa_cci_lc:tile": metadata.tile,
+            },
+        )
+        item.common_metadata.created = datetime.now(tz=timezone.utc)
+        item.common_metadata.title = metadata.title
+
+        projection = ProjectionExtension.ext(item, add_if_missing=True)
+        projection.epsg = metadata.epsg
+        projection.shape = metadata.proj_shape
+        projection.transform = metadata.proj_transform
+
+        for cog_href in cog_hrefs:
+            key = Path(cog_href).stem.split("-")[-1]
+            asset = create_cog_asset(key, cog_href, (statistics or {}).get(key))
+            item.add_asset(key, Asset.from_dict(asset))
+        for key, href in (preview_hrefs or {}).items():
+            item.add_asset(key, Asset.from_dict(create_preview_asset(key, href)))
+
+        if nc_api_url:
+            item.add_link(
+                Link(
+                    rel="derived_from",
+                    target=netcdf_item_href(cog_hrefs[0], nc_api_url),
+                    media_type=MediaType.JSON,
+                    title="Source NetCDF",
+                )
+            )
+
+        item.stac_extensions.append(constants.CLASSIFICATION_EXTENSION)
+        item.stac_extensions.append(constants.RASTER_EXTENSION)
+
+        record.tile = metadata.tile
+        record.pixels = metadata.proj_shape[0] * metadata.proj_shape[1] * len(cog_hrefs)
+
+    return item
+
+
+def check_asset_list(cog_hrefs: List[str], verify_fraction: float) -> None:
+    """Checks the arguments of an Item created from a single tile's COGs.
+
+    Args:
+        cog_hrefs (List[str]): HREFs of the tile's COGs, one per variable.
+        verify_fraction (float): Fraction of the Items whose metadata is
+            verified against a COG header.
+    """
     if len(cog_hrefs) != 5:
         raise ValueError(
             f"Incorrect number of asset HREFs supplied. Expected 5, supplied "
             f"{len(cog_hrefs)}."
         )
+    if not 0 <= verify_fraction <= 1:
+        raise ValueError(
+            f"Verify fraction must be between 0 and 1, got '{verify_fraction}'."
+        )
 
-    metadata = COGMetadata.from_cog(cog_hrefs[0], read_href_modifier)
-
-    item = Item(
-        id=metadata.id,
-        geometry=metadata.geometry,
-        bbox=metadata.bbox,
-        datetime=None,
-        properties={
-            "start_datetime": metadata.start_datetime,
-            "end_datetime": metadata.end_datetime,
-            "esa_cci_lc:version": metadata.version,
-            "esa_cci_lc:tile": metadata.tile,
-        },
-    )
-    item.common_metadata.created = datetime.now(tz=timezone.utc)
-    item.common_metadata.title = metadata.title
 
-    projection = ProjectionExtension.ext(item, add_if_missing=True)
-    projection.epsg = metadata.epsg
-    projection.shape = metadata.proj_shape
-    projection.transform = metadata.proj_transform
+def tile_metadata(
+    cog_hrefs: List[str],
+    read_href_modifier: Optional[ReadHrefModifier],
+    cog_tile_dim: Optional[int],
+    verify_fraction: float,
+) -> COGMetadata:
+    """Gets the metadata of a tile, from the tile grid if the tile dimension
+    is known and from the header of its first COG otherwise.
+
+    Args:
+        cog_hrefs (List[str]): HREFs of the tile's COGs.
+        read_href_modifier (Optional[ReadHrefModifier]): Modifies the HREFs
+            before a COG header is read, e.g., to sign them.
+        cog_tile_dim (Optional[int]): COG tile dimension in pixels, if known.
+        verify_fraction (float): Fraction of the tiles whose grid metadata is
+            verified against the header of their first COG. The sample is
+            stable for a tile ID.
+
+    Returns:
+        COGMetadata: The metadata of the tile.
+    """
+    if cog_tile_dim is None:
+        return COGMetadata.from_cog(cog_hrefs[0], read_href_modifier)
+    metadata = COGMetadata.from_tile_grid(cog_hrefs[0], cog_tile_dim)
+    if _is_sampled(metadata.id, verify_fraction):
+        metadata.verify(cog_hrefs[0], read_href_modifier)
+    return metadata
+
+
+def netcdf_item_href(cog_href: str, nc_api_url: str) -> str:
+    """Returns the HREF of the STAC Item of the NetCDF file a COG was created
+    from.
+
+    Args:
+        cog_href (str): HREF of the COG.
+        nc_api_url (str): Base STAC API URL of the NetCDF Items.
+
+    Returns:
+        str: The HREF of the NetCDF Item.
+    """
+    nc_stac_item_id = "-".join(Path(cog_href).stem.split("-")[:-1])
+    return str(Path(nc_api_url) / nc_stac_item_id)
+
+
+def list_cog_hrefs(source: str, listing: bool = False) -> List[str]:
+    """Lists the HREFs of existing COGs, locally or on remote storage.
+
+    Args:
+        source (str): A local or fsspec URL of a directory, whose '.tif'
+            files are listed, or a glob pattern. With ``listing``, the HREF of
+            a text file holding one COG HREF per line instead.
+        listing (bool): Whether ``source`` is a listing file.
+
+    Returns:
+        List[str]: The sorted COG HREFs.
+    """
+    if listing:
+        lines = read_text(source).splitlines()
+        return sorted(line.strip() for line in lines if line.strip())
+    fs, path = url_to_fs(source)
+    if fs.isdir(path):
+        path = f"{path.rstrip('/')}/*.tif"
+    paths = fs.glob(path)
+    if isinstance(fs, LocalFileSystem):
+        return sorted(paths)
+    return sorted(fs.unstrip_protocol(path) for path in paths)
+
+
+def group_cog_hrefs(cog_hrefs: Iterable[str]) -> List[List[str]]:
+    """Groups COG HREFs into the five COGs of each tile by the
+    '<item id>-<variable>.tif' file naming convention. Files that don't follow
+    it, e.g., overview COGs, and tiles with missing COGs are left out with a
+    warning.
+
+    Args:
+        cog_hrefs (Iterable[str]): COG HREFs.
 
+    Returns:
+        List[List[str]]: The five COG HREFs of each tile, in
+            ``constants.DATA_VARIABLES`` order, sorted by Item ID.
+    """
+    groups: Dict[str, Dict[str, str]] = {}
     for cog_href in cog_hrefs:
-        key = Path(cog_href).stem.split("-")[-1]
-        item.add_asset(key, Asset.from_dict(create_cog_asset(key, cog_href)))
-
-    if nc_api_url:
-        nc_stac_item_id = "-".join(Path(cog_hrefs[0]).stem.split("-")[:-1])
-        item.add_link(
-            Link(
-                rel="derived_from",
-                target=str(Path(nc_api_url) / nc_stac_item_id),
-                media_type=MediaType.JSON,
-                title="Source NetCDF",
-            )
+        stem = Path(cog_href).stem
+        id, _, variable = stem.rpartition("-")
+        if variable not in constants.DATA_VARIABLES or "overview_" in id:
+            logger.warning(f"Skipping '{cog_href}', which is not a tile COG")
+            continue
+        groups.setdefault(id, {})[variable] = cog_href
+
+    grouped = []
+    for id in sorted(groups):
+        group = groups[id]
+        missing = [v for v in constants.DATA_VARIABLES if v not in group]
+        if missing:
+            logger.warning(f"Skipping '{id}', COGs are missing for {missing}")
+            continue
+        grouped.append([group[variable] for variable in constants.DATA_VARIABLES])
+    return grouped
+
+
+def create_items_from_cogs(
+    cog_hrefs: Iterable[str],
+    *,
+    nc_api_url: Optional[str] = None,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    cog_tile_dim: Optional[int] = None,
+    verify_fraction: float = 0.0,
+    threads: Optional[int] = None,
+) -> List[Item]:
+    """Creates an Item for each tile of existing COGs, e.g., to rebuild the
+    Items of COGs on remote storage.
+
+    Args:
+        cog_hrefs (Iterable[str]): HREFs of the COGs, which are grouped by
+            tile with :func:`group_cog_hrefs`.
+        nc_api_url (Optional[str]): Base STAC API URL for Items describing the
+            NetCDF files, see :func:`create_item_from_asset_list`.
+        read_href_modifier (Optional[ReadHrefModifier]): An optional function
+            to modify an HREF, e.g., to add a token to a URL.
+        cog_tile_dim (Optional[int]): COG tile dimension in pixels the COGs
+            were created with. If given, no COG is opened unless it is sampled
+            for verification, see :func:`create_item_from_asset_list`.
+        verify_fraction (float): Fraction of Items checked against a COG
+            header when ``cog_tile_dim`` is given. Defaults to 0.
+        threads (Optional[int]): Number of threads creating Items
+            concurrently. Defaults to the ``ThreadPoolExecutor`` default.
+
+    Returns:
+        List[Item]: The created STAC Item objects, sorted by ID.
+    """
+    return list(
+        iter_items_from_cogs(
+            cog_hrefs,
+            nc_api_url=nc_api_url,
+            read_href_modifier=read_href_modifier,
+            cog_tile_dim=cog_tile_dim,
+            verify_fraction=verify_fraction,
+            threads=threads,
         )
+    )
 
-    item.stac_extensions.append(constants.CLASSIFICATION_EXTENSION)
-    item.stac_extensions.append(constants.RASTER_EXTENSION)
 
-    return item
+def iter_items_from_cogs(
+    cog_hrefs: Iterable[str],
+    *,
+    nc_api_url: Optional[str] = None,
+    read_href_modifier: Optional[ReadHrefModifier] = None,
+    cog_tile_dim: Optional[int] = None,
+    verify_fraction: float = 0.0,
+    threads: Optional[int] = None,
+) -> Iterator[Item]:
+    """Creates an Item for each tile of existing COGs on a thread pool and
+    yields them in order.
+
+    Takes the same arguments as :func:`create_items_from_cogs`.
+
+    Returns:
+        Iterator[Item]: The created STAC Item objects, sorted by ID.
+    """
+    return map_cog_tiles(
+        partial(
+            create_item_from_asset_list,
+            nc_api_url=nc_api_url,
+            read_href_modifier=read_href_modifier,
+            cog_tile_dim=cog_tile_dim,
+            verify_fraction=verify_fraction,
+        ),
+        cog_hrefs,
+        threads,
+    )
+
+
+def map_cog_tiles(
+    create: Callable[[List[str]], T], cog_hrefs: Iterable[str], threads: Optional[int]
+) -> Iterator[T]:
+    """Groups COG HREFs by tile and calls ``create`` with the HREFs of each
+    tile on a thread pool, yielding the results in order. At most ``threads``
+    tiles are submitted ahead of the result being yielded, so a long listing
+    is never held in memory as pending results.
+
+    Args:
+        create (Callable[[List[str]], T]): Function creating the result of a
+            tile, e.g., its Item, from the tile's COG HREFs.
+        cog_hrefs (Iterable[str]): HREFs of the COGs of any number of tiles.
+        threads (Optional[int]): Number of threads. Defaults to the
+            ``ThreadPoolExecutor`` default.
+
+    Returns:
+        Iterator[T]: The results, in the order of :func:`group_cog_hrefs`.
+    """
+    if threads is not None and threads < 1:
+        raise ValueError(f"Number of threads must be at least 1, got '{threads}'.")
+
+    def create_in_env(tile_hrefs: List[str]) -> T:
+        # Header reads of remote COGs don't need a directory listing
+        with rasterio.Env(GDAL_DISABLE_READDIR_ON_OPEN="EMPTY_DIR"):
+            return create(tile_hrefs)
+
+    groups = group_cog_hrefs(cog_hrefs)
+    if threads == 1:
+        yield from map(create_in_env, groups)
+        return
+    if threads is None:
+        # The ThreadPoolExecutor default
+        threads = min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(threads) as executor:
+        pending: Deque["Future[T]"] = deque()
+        for group in groups:
+            pending.append(executor.submit(create_in_env, group))
+            if len(pending) >= threads:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _is_sampled(id: str, fraction: float) -> bool:
+    # A hash of the ID rather than a random draw keeps the sample stable
+    return zlib.crc32(id.encode()) < fraction * 2**32
+
+
+def create_overview_asset(cog_href: str) -> Tuple[str, Asset]:
+    """Creates an Asset for a global overview COG created by
+    :func:`overview.make_overview_cogs`, e.g., to add to a Collection as a
+    fast path for low zoom levels.
+
+    Args:
+        cog_href (str): HREF of the overview COG.
+
+    Returns:
+        Tuple[str, Asset]: The Asset key, which holds the variable, year and
+            resolution, and the Asset.
+    """
+    fileparts = Path(cog_href).stem.split("-")
+    variable = fileparts[-1]
+    resolution = fileparts[-2].split("_")[-1]
+    year = fileparts[-4]
+
+    asset = create_cog_asset(variable, cog_href)
+    asset["title"] = f"{asset['title']} - Global Overview {year}, {resolution}"
+    asset["roles"] = [*asset["roles"], "overview"]
+    asset["raster:bands"][0]["spatial_resolution"] = int(resolution.rstrip("m"))
+    return f"{variable}_overview_{year}_{resolution}", Asset.from_dict(asset)
+
+
+def add_overview_assets(collection: Collection, cog_hrefs: List[str]) -> None:
+    """Adds global overview COGs as Assets to a Collection.
+
+    Args:
+        collection (Collection): The Collection.
+        cog_hrefs (List[str]): HREFs of overview COGs created by
+            :func:`overview.make_overview_cogs`.
+    """
+    for cog_href in cog_hrefs:
+        key, asset = create_overview_asset(cog_href)
+        collection.add_asset(key, asset)
 
 
 def create_collection(
@@ -213,6 +684,8 @@ def create_collection(
     for var in constants.DATA_VARIABLES:
         asset = create_cog_asset(var)
         item_assets[var] = AssetDefinition(asset)
+    for key in constants.PREVIEW_ASSETS:
+        item_assets[key] = AssetDefinition(create_preview_asset(key))
 
     item_assets_attrs = ItemAssetsExtension.ext(collection, add_if_missing=True)
     item_assets_attrs.item_assets = item_assets
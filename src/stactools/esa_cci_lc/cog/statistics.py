@@ -0,0 +1,199 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, cast
+
+import numpy as np
+
+# Pixels counted by a single bincount call, which bounds its temporary copy of
+# the data as 64 bit integers
+HISTOGRAM_BLOCK_SIZE = 1024**2
+
+
+class StatisticsAccumulator:
+    """Accumulates the band statistics of a COG strip by strip, with a single
+    vectorized pass over each strip.
+
+    Classified variables and variables with a nodata value are counted in a
+    histogram with one bin per value of the data type, from which the
+    statistics and class pixel counts follow exactly. Byte data is counted two
+    pixels at a time, as 16 bit pairs, which halves the work of counting.
+    Other variables only need the cheaper minimum, maximum and sum
+    reductions.
+
+    Args:
+        dtype (str): Unsigned integer data type of the COG, e.g., 'uint8'.
+        nodata (Optional[int]): Nodata value of the COG, if any.
+        classified (bool): Whether to count the pixels of each value.
+    """
+
+    def __init__(self, dtype: str, nodata: Optional[int], classified: bool) -> None:
+        self.nodata = nodata
+        self.classified = classified
+        self.histogram: Optional[np.ndarray] = None
+        # Counts of pairs of byte values, folded into the histogram at the end
+        self.pair_histogram: Optional[np.ndarray] = None
+        if classified or nodata is not None:
+            self.histogram = _zero_histogram(dtype)
+            if np.dtype(dtype).itemsize == 1:
+                self.pair_histogram = _zero_histogram("uint16")
+        self.pixels = 0
+        self.minimum: Optional[int] = None
+        self.maximum: Optional[int] = None
+        self.total = 0
+
+    def add(self, data: np.ndarray) -> None:
+        """Adds a strip of data.
+
+        Args:
+            data (np.ndarray): 2D data of the accumulator's data type.
+        """
+        if data.size == 0:
+            return
+        if self.histogram is not None:
+            if (
+                self.pair_histogram is not None
+                and data.shape[1] % 2 == 0
+                and data.flags.c_contiguous
+            ):
+                _count(self.pair_histogram, data.view(np.uint16))
+            else:
+                _count(self.histogram, data)
+        else:
+            self._add_range(int(data.min()), int(data.max()))
+            self.total += int(data.sum(dtype=np.uint64))
+        self.pixels += data.size
+
+    def add_constant(self, value: int, pixels: int) -> None:
+        """Adds pixels of a single value without looking at them, e.g., a
+        strip known to be constant.
+
+        Args:
+            value (int): The value.
+            pixels (int): Number of pixels.
+        """
+        if self.histogram is not None:
+            self.histogram[value] += pixels
+        else:
+            self._add_range(value, value)
+            self.total += value * pixels
+        self.pixels += pixels
+
+    def finish(self) -> "BandStatistics":
+        """Computes the statistics of the data added so far.
+
+        Returns:
+            BandStatistics: The statistics.
+        """
+        if self.histogram is None:
+            if not self.pixels:
+                return BandStatistics(None, None, None, 0.0)
+            return BandStatistics(
+                float(cast(int, self.minimum)),
+                float(cast(int, self.maximum)),
+                self.total / self.pixels,
+                100.0,
+            )
+        histogram = self.histogram.copy()
+        if self.pair_histogram is not None:
+            pairs = self.pair_histogram.reshape(256, 256)
+            histogram += pairs.sum(axis=0) + pairs.sum(axis=1)
+        valid = histogram.copy()
+        if self.nodata is not None:
+            valid[self.nodata] = 0
+        valid_count = int(valid.sum())
+        valid_percent = 100.0 * valid_count / self.pixels if self.pixels else 0.0
+        class_counts: Dict[int, int] = {}
+        if self.classified:
+            class_counts = {
+                int(value): int(histogram[value]) for value in np.flatnonzero(histogram)
+            }
+        if not valid_count:
+            return BandStatistics(None, None, None, valid_percent, class_counts)
+        values = np.flatnonzero(valid)
+        return BandStatistics(
+            float(values[0]),
+            float(values[-1]),
+            float(np.dot(valid[values], values)) / valid_count,
+            valid_percent,
+            class_counts,
+        )
+
+    def _add_range(self, minimum: int, maximum: int) -> None:
+        if self.minimum is None or minimum < self.minimum:
+            self.minimum = minimum
+        if self.maximum is None or maximum > self.maximum:
+            self.maximum = maximum
+
+
+def _zero_histogram(dtype: str) -> np.ndarray:
+    return np.zeros(int(np.iinfo(dtype).max) + 1, dtype=np.int64)
+
+
+def _count(histogram: np.ndarray, data: np.ndarray) -> None:
+    """Adds the counts of the values of 2D data to a histogram, in blocks of
+    rows."""
+    height, width = data.shape
+    rows = max(1, HISTOGRAM_BLOCK_SIZE // width)
+    for start in range(0, height, rows):
+        end = start + rows
+        histogram += np.bincount(data[start:end].ravel(), minlength=histogram.size)
+
+
+@dataclass(frozen=True)
+class BandStatistics:
+    """Statistics of a COG's band, as in the ``statistics`` of the raster
+    extension, and the number of pixels of each class value.
+
+    Args:
+        minimum (Optional[float]): Minimum valid value, None if there is no
+            valid pixel.
+        maximum (Optional[float]): Maximum valid value.
+        mean (Optional[float]): Mean of the valid values.
+        valid_percent (float): Percentage of pixels that are not nodata.
+        class_counts (Dict[int, int]): Number of pixels of each value that
+            occurs, including nodata, for classified variables. Empty
+            otherwise.
+    """
+
+    minimum: Optional[float]
+    maximum: Optional[float]
+    mean: Optional[float]
+    valid_percent: float
+    class_counts: Dict[int, int] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "BandStatistics":
+        return cls(
+            minimum=d.get("minimum"),
+            maximum=d.get("maximum"),
+            mean=d.get("mean"),
+            valid_percent=d["valid_percent"],
+            class_counts={
+                int(value): count for value, count in d.get("class_counts", {}).items()
+            },
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = self.to_raster()
+        if self.class_counts:
+            d["class_counts"] = {
+                str(value): count for value, count in self.class_counts.items()
+            }
+        return d
+
+    def to_raster(self) -> Dict[str, Any]:
+        """Returns the ``statistics`` object of a raster extension band."""
+        d: Dict[str, Any] = {"valid_percent": self.valid_percent}
+        for name in ["minimum", "maximum", "mean"]:
+            if getattr(self, name) is not None:
+                d[name] = getattr(self, name)
+        return d
+
+    def add_counts(self, stac_classes: List[Dict[str, Any]]) -> None:
+        """Sets the ``count`` of classification extension class objects.
+
+        Args:
+            stac_classes (List[Dict[str, Any]]): Class objects, updated in
+                place.
+        """
+        for stac_class in stac_classes:
+            stac_class["count"] = self.class_counts.get(stac_class["value"], 0)
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .. import classes, constants
+
+# Source NetCDF value of missing data in the signed byte flag variables
+FLAG_NODATA = -1
+
+
+@dataclass(frozen=True)
+class VariableTransform:
+    """Describes how a NetCDF variable is converted to its COG.
+
+    Args:
+        dtype (str): Data type of the COG.
+        nodata (Optional[int]): Nodata value of the COG, if any.
+        lut (Optional[np.ndarray]): Optional 256-entry lookup table that maps
+            every byte value of the source data to its COG value. Signed source
+            bytes are looked up by their unsigned bit pattern, i.e., -1 is
+            looked up at index 255.
+        overview_resampling (str): Resampling method of the COG overviews.
+        colormap (bool): Whether the COG gets the land cover class colormap.
+    """
+
+    dtype: str
+    nodata: Optional[int] = None
+    lut: Optional[np.ndarray] = None
+    overview_resampling: str = "average"
+    colormap: bool = False
+
+    def apply(self, data: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Converts source data to COG values in a single vectorized step.
+
+        Args:
+            data (np.ndarray): Source data as read from the NetCDF.
+            out (Optional[np.ndarray]): Optional output buffer of ``dtype`` and
+                the same shape as ``data`` for the lookup table result, reused
+                between calls to avoid allocations. Data without a lookup table
+                is returned as is if it already has the COG data type.
+
+        Returns:
+            np.ndarray: The converted data.
+        """
+        if self.lut is None:
+            return data.astype(self.dtype, copy=False)
+        if data.dtype.itemsize == 1:
+            codes = data.view(np.uint8)
+        else:
+            codes = data.astype(np.uint8)
+        return np.take(self.lut, codes, out=out)
+
+
+def nodata_lut(source_nodata: int, nodata: int) -> np.ndarray:
+    """Creates a lookup table that keeps all byte values except for the source
+    nodata value, which is mapped to ``nodata``.
+
+    Args:
+        source_nodata (int): Nodata value of the (signed or unsigned) source
+            bytes.
+        nodata (int): Nodata value of the output.
+
+    Returns:
+        np.ndarray: A 256-entry uint8 lookup table.
+    """
+    lut = np.arange(256, dtype=np.uint8)
+    lut[np.array(source_nodata).astype(np.uint8)] = nodata
+    lut.setflags(write=False)
+    return lut
+
+
+def _from_asset(
+    variable: str, source_nodata: Optional[int] = None, **kwargs: Any
+) -> VariableTransform:
+    """Creates a transform with the data type and nodata value of the
+    variable's COG asset definition in ``constants.COG_ASSETS``. If the source
+    data has a nodata value, it is remapped to the asset's nodata value."""
+    asset = constants.COG_ASSETS[variable]
+    nodata = asset.get("nodata")
+    if source_nodata is not None:
+        if nodata is None:
+            raise ValueError(f"COG asset '{variable}' has no nodata value.")
+        kwargs["lut"] = nodata_lut(source_nodata, nodata)
+    return VariableTransform(dtype=asset["data_type"], nodata=nodata, **kwargs)
+
+
+def colormap_lut(table: List[List[Any]]) -> np.ndarray:
+    """Creates a lookup table of the RGBA color of every byte value from one of
+    the class tables in :mod:`classes`. Values that are not in the table are
+    transparent black.
+
+    Args:
+        table (List[List[Any]]): Class table with RGB colors.
+
+    Returns:
+        np.ndarray: A read-only 256x4 uint8 lookup table.
+    """
+    lut = np.zeros((256, 4), dtype=np.uint8)
+    for row in table:
+        lut[row[0]] = [*row[1], 255]
+    lut.setflags(write=False)
+    return lut
+
+
+# Computed once, colors of class values are looked up with a single index
+COLORMAP_LUT = colormap_lut(classes.TABLE)
+# The same colors as a GDAL colormap
+COLORMAP: Dict[int, Tuple[int, ...]] = {
+    row[0]: tuple(COLORMAP_LUT[row[0]].tolist()) for row in classes.TABLE
+}
+
+TRANSFORMS: Dict[str, VariableTransform] = {
+    "change_count": _from_asset("change_count"),
+    "current_pixel_state": _from_asset(
+        "current_pixel_state", source_nodata=FLAG_NODATA
+    ),
+    "lccs_class": _from_asset("lccs_class", overview_resampling="mode", colormap=True),
+    "observation_count": _from_asset("observation_count"),
+    "processed_flag": _from_asset("processed_flag", source_nodata=FLAG_NODATA),
+}
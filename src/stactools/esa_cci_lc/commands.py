@@ -1,7 +1,42 @@
-from click import Command, Group
+import importlib
+from typing import Any, Dict, List, Optional
 
-from .cog.commands import create_command as create_cog_command
-from .netcdf.commands import create_command as create_netcdf_command
+from click import Command, Context, Group
+
+# Module of each subcommand group, whose ``create_command`` function adds the
+# group to the ``esa-cci-lc`` command
+SUBCOMMAND_MODULES = {
+    "cog": "stactools.esa_cci_lc.cog.commands",
+    "netcdf": "stactools.esa_cci_lc.netcdf.commands",
+    "zarr": "stactools.esa_cci_lc.zarr.commands",
+}
+
+
+class LazyGroup(Group):
+    """A command group whose subcommand groups are created from their modules
+    when they are first looked up, e.g., to run or to list them. Other
+    commands of the CLI don't import the modules or their dependencies.
+
+    Args:
+        lazy_subcommands (Dict[str, str]): Module of each subcommand group,
+            with a ``create_command(group)`` function that adds the subcommand
+            to the given group.
+    """
+
+    def __init__(
+        self, *args: Any, lazy_subcommands: Dict[str, str], **kwargs: Any
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.lazy_subcommands = lazy_subcommands
+
+    def list_commands(self, ctx: Context) -> List[str]:
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx: Context, cmd_name: str) -> Optional[Command]:
+        if cmd_name in self.lazy_subcommands and cmd_name not in self.commands:
+            module = importlib.import_module(self.lazy_subcommands[cmd_name])
+            module.create_command(self)
+        return super().get_command(ctx, cmd_name)
 
 
 def create_esaccilc_command(cli: Group) -> Command:
@@ -9,12 +44,13 @@ def create_esaccilc_command(cli: Group) -> Command:
 
     @cli.group(
         "esa-cci-lc",
+        cls=LazyGroup,
+        lazy_subcommands=SUBCOMMAND_MODULES,
         short_help=("Commands for working with ESA CCI data"),
     )
     def esaccilc() -> None:
-        pass
+        import stactools.core
 
-    create_cog_command(esaccilc)
-    create_netcdf_command(esaccilc)
+        stactools.core.use_fsspec()
 
     return esaccilc
@@ -142,6 +142,10 @@ COG_MEDIA_TYPE = "image/tiff; application=geotiff; profile=cloud-optimized"
 COG_ROLES_DATA = ["data"]
 COG_ROLES_QUALITY = ["quality"]
 COG_TILE_DIM = 16200
+CONSTANT_TILE_POLICIES = ["encode", "compact", "skip"]
+OVERVIEW_FACTORS = [16]
+# Strips read ahead and tiles encoded ahead in the tiling pipeline
+QUEUE_DEPTH = 2
 COG_ASSETS: Dict[str, Dict[str, Any]] = {
     "change_count": {
         "title": "Number of Class Changes",
@@ -190,11 +194,54 @@ COG_ASSETS: Dict[str, Dict[str, Any]] = {
     },
 }
 
+# Colored images of the land cover classes of a COG tile
+PREVIEW_VARIABLE = "lccs_class"
+PREVIEW_MEDIA_TYPE = "image/png"
+PREVIEW_ASSETS: Dict[str, Dict[str, Any]] = {
+    "thumbnail": {
+        "title": "Land Cover Class Thumbnail",
+        "roles": ["thumbnail"],
+        "size": 256,
+    },
+    "preview": {
+        "title": "Land Cover Class Preview",
+        "roles": ["overview"],
+        "size": 1024,
+    },
+}
+
 NETCDF_ASSET_TITLE = "ESA CCI Land Cover NetCDF 4 File"
 NETCDF_MEDIA_TYPE = "application/netcdf"
 NETCDF_ROLES = ["data", "quality"]
 NETCDF_KEY = "netcdf"
 NETCDF_DATA_SHAPE = [64800, 129600]
+HEADER_CACHE_MAX_BYTES = 64 * 1024**2
+
+REFERENCES_ASSET_TITLE = "Kerchunk References to the NetCDF Chunks"
+REFERENCES_MEDIA_TYPES = {
+    "json": "application/json",
+    "parquet": "application/vnd.apache.parquet",
+}
+REFERENCES_ROLES = ["index", "references"]
+REFERENCES_KEY = "references"
+
+ZARR_ASSET_TITLE = "ESA CCI Land Cover Zarr Store"
+ZARR_MEDIA_TYPE = "application/vnd+zarr"
+ZARR_ROLES = ["data", "quality"]
+ZARR_KEY = "zarr"
+# Multiples of the NetCDF chunk size, so that every NetCDF chunk is read once
+ZARR_CHUNKS = [4050, 4050]
+ZARR_COMPRESSORS = ["zstd", "lz4", "lz4hc", "blosclz", "zlib"]
+ZARR_SHUFFLES = ["noshuffle", "shuffle", "bitshuffle"]
+ZARR_COMPRESSOR = "zstd"
+ZARR_CLEVEL = 5
+ZARR_SHUFFLE = "bitshuffle"
+CUBE_ID = "esa-cci-lc-cube"
+CUBE_VARIABLES = ["lccs_class"]
+# Small spatial chunks that hold several years favour reading the time series
+# of pixels, while every NetCDF chunk is still read once
+CUBE_CHUNKS = [2025, 2025]
+CUBE_TIME_CHUNK = 8
 
 TABLES = {
     "current_pixel_state": classes.CURRENT_PIXEL_STATE_TABLE,
@@ -0,0 +1,58 @@
+import re
+from typing import Optional
+
+import click
+
+UNITS = {
+    "": 1,
+    "b": 1,
+    "k": 1000,
+    "kb": 1000,
+    "m": 1000**2,
+    "mb": 1000**2,
+    "g": 1000**3,
+    "gb": 1000**3,
+    "t": 1000**4,
+    "tb": 1000**4,
+    "kib": 1024,
+    "mib": 1024**2,
+    "gib": 1024**3,
+    "tib": 1024**4,
+}
+
+
+def parse_memory(value: str) -> int:
+    """Parses a memory size such as '6GiB', '512MB' or '1000000' to bytes.
+
+    Args:
+        value (str): Memory size with an optional decimal (kB, MB, GB, TB) or
+            binary (KiB, MiB, GiB, TiB) unit. Case insensitive.
+
+    Returns:
+        int: The memory size in bytes.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([a-zA-Z]*)\s*", value)
+    if match is None or match.group(2).lower() not in UNITS:
+        raise ValueError(
+            f"Invalid memory size '{value}'. Expected a number with an optional "
+            f"unit, e.g., '6GiB' or '512MB'."
+        )
+    return int(float(match.group(1)) * UNITS[match.group(2).lower()])
+
+
+def parse_memory_option(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[int]:
+    """Click callback parsing the value of a memory size option with
+    :func:`parse_memory`.
+
+    Returns:
+        Optional[int]: The memory size in bytes, or None if the option was
+            not given.
+    """
+    if value is None:
+        return None
+    try:
+        return parse_memory(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e))
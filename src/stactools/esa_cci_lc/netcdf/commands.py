@@ -1,10 +1,17 @@
 import logging
-from typing import Optional
+from typing import List, Optional
 
 import click
 from click import Command, Group
 
-from stactools.esa_cci_lc.netcdf import stac
+from stactools.esa_cci_lc import constants, profiling
+from stactools.esa_cci_lc.memory import parse_memory_option
+from stactools.esa_cci_lc.netcdf.references import (
+    REFERENCE_FORMATS,
+    combine_references,
+    create_references_asset,
+    write_references,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +59,8 @@ def create_command(esaccilc: Group) -> Command:
         Args:
             destination (str): An HREF for the Collection JSON
         """
+        from stactools.esa_cci_lc.netcdf import stac
+
         collection = stac.create_collection(id, start_time, end_time)
         collection.set_self_href(destination)
         collection.save_object()
@@ -61,9 +70,44 @@ def create_command(esaccilc: Group) -> Command:
     @netcdf.command("create-item", short_help="Creates a STAC item")
     @click.argument("source")
     @click.argument("destination")
+    @click.option(
+        "--profile",
+        help="Path to a JSON report of the time spent creating the Item. A "
+        "summary table is printed.",
+    )
+    @click.option(
+        "--header-cache",
+        help="Directory of a cache of NetCDF headers. Items of files whose size "
+        "and modification time or ETag are unchanged are created without opening "
+        "the files.",
+    )
+    @click.option(
+        "--header-cache-size",
+        default="64MiB",
+        help="Upper bound of the header cache size, e.g., '64MiB'. The least "
+        "recently used headers are removed first. Defaults to '64MiB'.",
+        callback=parse_memory_option,
+    )
+    @click.option(
+        "--references",
+        help="HREF to write kerchunk references to the chunks of the NetCDF file "
+        "to, which are added as an Asset. The references point to SOURCE. "
+        "Requires the 'kerchunk' extra.",
+    )
+    @click.option(
+        "--references-format",
+        type=click.Choice(REFERENCE_FORMATS),
+        default="json",
+        help="Format of the references. Defaults to 'json'.",
+    )
     def create_item_command(
         source: str,
         destination: str,
+        profile: Optional[str] = None,
+        header_cache: Optional[str] = None,
+        header_cache_size: int = constants.HEADER_CACHE_MAX_BYTES,
+        references: Optional[str] = None,
+        references_format: str = "json",
     ) -> None:
         """Creates a STAC Item
 
@@ -72,9 +116,68 @@ def create_command(esaccilc: Group) -> Command:
             source (str): HREF of the NetCDF file associated with the Item
             destination (str): An HREF for the STAC Item
         """
-        item = stac.create_item(source)
+        from stactools.esa_cci_lc.netcdf import stac
+        from stactools.esa_cci_lc.netcdf.header import HeaderCache
+
+        cache = None
+        if header_cache is not None:
+            cache = HeaderCache(header_cache, header_cache_size)
+        with profiling.profile_report(profile, click.echo):
+            item = stac.create_item(
+                source,
+                cache,
+                references_href=references,
+                references_format=references_format,
+            )
         item.save_object(dest_href=destination)
 
         return None
 
+    @netcdf.command(
+        "combine-references",
+        short_help="Combines the references of several NetCDF files along time",
+    )
+    @click.argument("sources", nargs=-1, required=True)
+    @click.argument("destination")
+    @click.option(
+        "--format",
+        type=click.Choice(REFERENCE_FORMATS),
+        default="json",
+        help="Format of the combined references. Defaults to 'json'.",
+    )
+    @click.option(
+        "--collection",
+        help="HREF of a Collection JSON to add the combined references to as an "
+        "Asset.",
+    )
+    def combine_references_command(
+        sources: List[str],
+        destination: str,
+        format: str,
+        collection: Optional[str],
+    ) -> None:
+        """Combines the JSON kerchunk references of several NetCDF files, e.g.,
+        all years, into a single virtual dataset stacked along time.
+
+        \b
+        Args:
+            sources (List[str]): HREFs of JSON references created with
+                'create-item --references', in time order.
+            destination (str): HREF of the combined references.
+        """
+        from pystac import Asset, Collection
+
+        combined = combine_references(list(sources))
+        write_references(combined, destination, format)
+
+        if collection is not None:
+            stac_collection = Collection.from_file(collection)
+            stac_collection.add_asset(
+                constants.REFERENCES_KEY,
+                Asset.from_dict(create_references_asset(destination, format)),
+            )
+            stac_collection.save_object(dest_href=collection)
+
+        return None
+
     return netcdf
@@ -0,0 +1,255 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from fsspec.core import url_to_fs
+from fsspec.implementations.local import LocalFileSystem
+from netCDF4 import Dataset
+
+from .. import constants
+from . import netcdf
+
+logger = logging.getLogger(__name__)
+
+# Global attributes used to create Items
+HEADER_ATTRIBUTES = [
+    "id",
+    "product_version",
+    "time_coverage_start",
+    "time_coverage_end",
+    "history",
+    "source",
+    "creation_date",
+]
+# Increment when the contents of NetCDFHeader change, which invalidates
+# existing cache entries
+HEADER_CACHE_VERSION = 1
+DEFAULT_CACHE_MAX_BYTES = constants.HEADER_CACHE_MAX_BYTES
+
+
+@dataclass(frozen=True)
+class NetCDFHeader:
+    """The parts of a NetCDF file's header that Items are created from.
+
+    Args:
+        attributes (Dict[str, str]): Global attributes of
+            ``HEADER_ATTRIBUTES``.
+        dimensions (Dict[str, int]): Size of each dimension.
+        transform (Optional[List[float]]): Geotransform parsed from the
+            ``crs`` variable's ``i2m`` attribute, if any.
+        cube_dimensions (Dict[str, Any]): Datacube dimensions.
+        cube_variables (Dict[str, Any]): Datacube variables, derived from the
+            attributes of each variable.
+    """
+
+    attributes: Dict[str, str]
+    dimensions: Dict[str, int]
+    transform: Optional[List[float]]
+    cube_dimensions: Dict[str, Any]
+    cube_variables: Dict[str, Any]
+
+    @classmethod
+    def from_dataset(cls, dataset: Dataset) -> "NetCDFHeader":
+        """Reads the header from an open NetCDF dataset.
+
+        Args:
+            dataset (Dataset): A netCDF4 Dataset.
+
+        Returns:
+            NetCDFHeader: The header.
+        """
+        attrs = dataset.ncattrs()
+        cube_variables = netcdf.to_cube_variables(dataset)
+        return cls(
+            attributes={
+                name: str(dataset.getncattr(name))
+                for name in HEADER_ATTRIBUTES
+                if name in attrs
+            },
+            dimensions={name: dim.size for name, dim in dataset.dimensions.items()},
+            transform=netcdf.parse_transform(dataset),
+            cube_dimensions=netcdf.to_cube_dimensions(dataset),
+            # Round-tripped through JSON, so that cached and freshly read
+            # headers are equal
+            cube_variables=json.loads(json.dumps(cube_variables)),
+        )
+
+    @classmethod
+    def read(cls, nc_href: str) -> "NetCDFHeader":
+        """Opens a NetCDF file and reads its header.
+
+        Args:
+            nc_href (str): HREF to a NetCDF file.
+
+        Returns:
+            NetCDFHeader: The header.
+        """
+        with Dataset(nc_href, "r", format="NETCDF4") as dataset:
+            return cls.from_dataset(dataset)
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "NetCDFHeader":
+        return cls(**d)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class HeaderCache:
+    """On-disk cache of NetCDF headers, so that Items of unchanged files can be
+    recreated without opening them.
+
+    Entries are keyed by the file's HREF together with its size and
+    modification time or ETag, so a changed file is read again. Each entry
+    is a small JSON file. Once the entries exceed ``max_bytes``, the least
+    recently used ones are removed.
+
+    Args:
+        directory (str): Local directory of the cache. Created if missing.
+        max_bytes (int): Upper bound of the total size of the entries.
+            Defaults to ``DEFAULT_CACHE_MAX_BYTES``.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        if max_bytes < 0:
+            raise ValueError(f"Cache size must not be negative, got '{max_bytes}'.")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        # Upper bound of the total size of the entries, so that the directory
+        # is only scanned once the cache may be full
+        self._total = self._scan_total()
+
+    def key(self, nc_href: str) -> Optional[str]:
+        """Returns the cache key of a file, or None if the file can't be
+        inspected, in which case it is not cached.
+
+        Args:
+            nc_href (str): HREF to a NetCDF file.
+
+        Returns:
+            Optional[str]: The key.
+        """
+        try:
+            fs, path = url_to_fs(nc_href)
+            info = fs.info(path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Not caching the header of '{nc_href}': {e}")
+            return None
+        version = next(
+            (
+                info[name]
+                for name in ["ETag", "etag", "mtime", "LastModified", "last_modified"]
+                if info.get(name) is not None
+            ),
+            None,
+        )
+        fingerprint = [
+            HEADER_CACHE_VERSION,
+            os.path.abspath(path) if isinstance(fs, LocalFileSystem) else nc_href,
+            info.get("size"),
+            str(version),
+        ]
+        return hashlib.sha256(json.dumps(fingerprint).encode()).hexdigest()
+
+    def get(self, nc_href: str) -> Optional[NetCDFHeader]:
+        """Returns the cached header of a file, if any.
+
+        Args:
+            nc_href (str): HREF to a NetCDF file.
+
+        Returns:
+            Optional[NetCDFHeader]: The header, or None on a cache miss.
+        """
+        key = self.key(nc_href)
+        return None if key is None else self._load(key)
+
+    def put(self, nc_href: str, header: NetCDFHeader) -> None:
+        """Caches the header of a file and evicts the least recently used
+        entries if the cache is full.
+
+        Args:
+            nc_href (str): HREF to a NetCDF file.
+            header (NetCDFHeader): The header.
+        """
+        key = self.key(nc_href)
+        if key is not None:
+            self._store(key, header)
+
+    def read(self, nc_href: str) -> NetCDFHeader:
+        """Returns the header of a file, from the cache if possible and by
+        opening the file otherwise.
+
+        Args:
+            nc_href (str): HREF to a NetCDF file.
+
+        Returns:
+            NetCDFHeader: The header.
+        """
+        key = self.key(nc_href)
+        if key is not None:
+            header = self._load(key)
+            if header is not None:
+                return header
+        header = NetCDFHeader.read(nc_href)
+        if key is not None:
+            self._store(key, header)
+        return header
+
+    def evict(self) -> None:
+        """Removes the least recently used entries until the entries fit into
+        ``max_bytes``."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._total = total
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in Path(self.directory).glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_total(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _path(self, key: str) -> Path:
+        return Path(self.directory) / f"{key}.json"
+
+    def _load(self, key: str) -> Optional[NetCDFHeader]:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                header = NetCDFHeader.from_dict(json.load(f))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Ignoring invalid header cache entry '{path}': {e}")
+            return None
+        # The modification time of an entry marks its last use
+        os.utime(path)
+        return header
+
+    def _store(self, key: str, header: NetCDFHeader) -> None:
+        # Written atomically, so concurrent runs never read a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(header.to_dict(), f)
+            size = f.tell()
+        os.replace(tmp_path, self._path(key))
+        self._total += size
+        if self._total > self.max_bytes:
+            self.evict()
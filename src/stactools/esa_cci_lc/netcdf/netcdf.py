@@ -1,3 +1,4 @@
+import math
 import re
 from typing import Any, Dict, List, Optional
 
@@ -13,6 +14,13 @@ def to_cube_dimensions(dataset: Dataset) -> Dict[str, Any]:
     """
     Creates the cube:dimensions dict for a netCDF dataset.
 
+    Only attributes and at most three values of each index variable are read,
+    so the time and size of the dict don't depend on the grid size. A
+    dimension gets an extent from the ``valid_min`` and ``valid_max``
+    attributes of its index variable if present. Otherwise, regularly spaced
+    values are described by their extent and step, and only irregular values
+    are listed. Dimensions without index variable list their 0 based indices.
+
     Args:
         dataset (Dataset): A netCDF4 Dataset
 
@@ -21,7 +29,7 @@ def to_cube_dimensions(dataset: Dataset) -> Dict[str, Any]:
     """
     cube_dims = {}
     for key, dim in dataset.dimensions.items():
-        stac_dim = {"type": dim.name}
+        stac_dim: Dict[str, Any] = {"type": dim.name}
         if dim.name in dataset.variables:
             # assume that the index variable has the same name as the dimension
             index_var = dataset.variables[dim.name]
@@ -31,7 +39,7 @@ def to_cube_dimensions(dataset: Dataset) -> Dict[str, Any]:
                 max = float(index_var.getncattr("valid_max"))
                 stac_dim["extent"] = [min, max]
             else:
-                stac_dim["values"] = index_var[...].tolist()
+                stac_dim.update(_describe_values(index_var, dim.size))
         else:
             stac_dim["values"] = list(range(0, dim.size))
 
@@ -40,6 +48,20 @@ def to_cube_dimensions(dataset: Dataset) -> Dict[str, Any]:
     return cube_dims
 
 
+def _describe_values(index_var: "Variable[Any]", size: int) -> Dict[str, Any]:
+    """Describes the values of an index variable by extent and step if the
+    first, second and last values are regularly spaced."""
+    if size < 3:
+        return {"values": index_var[:size].tolist()}
+    first, second, last = (float(index_var[i]) for i in (0, 1, size - 1))
+    step = second - first
+    if step and math.isclose(
+        first + (size - 1) * step, last, rel_tol=1e-9, abs_tol=abs(step) * 1e-6
+    ):
+        return {"extent": sorted([first, last]), "step": abs(step)}
+    return {"values": index_var[...].tolist()}
+
+
 def to_cube_variables(dataset: Dataset) -> Dict[str, Any]:
     """
     Creates the cube:variables dict for a netCDF dataset.
@@ -97,7 +119,7 @@ def create_asset(href: Optional[str] = None) -> Dict[str, Any]:
     return asset
 
 
-def is_data_variable(var: Variable) -> bool:
+def is_data_variable(var: "Variable[Any]") -> bool:
     """
     Checks whether a variable contains "data" or "metadata"
 
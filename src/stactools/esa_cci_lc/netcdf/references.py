@@ -0,0 +1,144 @@
+import importlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+import fsspec
+from pystac.utils import make_absolute_href
+
+from .. import constants
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_FORMATS = ["json", "parquet"]
+# Variables whose chunks are referenced, besides the data variables. The crs
+# variable is a scalar that holds the grid mapping attributes.
+COORDINATE_VARIABLES = ["lat", "lon", "time", "crs"]
+# Chunks up to this size in bytes are inlined into the references
+INLINE_THRESHOLD = 300
+
+
+def create_references(
+    nc_href: str,
+    storage_options: Optional[Dict[str, Any]] = None,
+    inline_threshold: int = INLINE_THRESHOLD,
+) -> Dict[str, Any]:
+    """Creates kerchunk references to the byte ranges of every HDF5 chunk of
+    the data and coordinate variables of a NetCDF file, which allow reading
+    the file as a virtual Zarr store with chunked, parallel range requests.
+
+    Requires the optional ``kerchunk`` dependency.
+
+    Args:
+        nc_href (str): HREF to a NetCDF file, which is read through fsspec.
+            The references point to this HREF, so it should be the location
+            the file is read from later, e.g., an object storage URL.
+        storage_options (Optional[Dict[str, Any]]): fsspec storage options to
+            read the file.
+        inline_threshold (int): Chunks up to this size in bytes are inlined.
+
+    Returns:
+        Dict[str, Any]: The kerchunk references, version 1.
+    """
+    SingleHdf5ToZarr = _import_kerchunk("kerchunk.hdf", "SingleHdf5ToZarr")
+
+    with fsspec.open(nc_href, "rb", **(storage_options or {})) as f:
+        references: Dict[str, Any] = SingleHdf5ToZarr(
+            f, nc_href, inline_threshold=inline_threshold
+        ).translate()
+
+    variables = set(constants.DATA_VARIABLES + COORDINATE_VARIABLES)
+    refs = references["refs"]
+    references["refs"] = {
+        key: value
+        for key, value in refs.items()
+        if "/" not in key or key.split("/")[0] in variables
+    }
+    return references
+
+
+def combine_references(
+    reference_hrefs: List[str],
+    remote_protocol: Optional[str] = None,
+    storage_options: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Combines the references of several NetCDF files, e.g., one per year,
+    into a single virtual dataset stacked along the time dimension.
+
+    Requires the optional ``kerchunk`` dependency.
+
+    Args:
+        reference_hrefs (List[str]): HREFs of JSON references created with
+            :func:`create_references`, in time order.
+        remote_protocol (Optional[str]): fsspec protocol of the referenced
+            NetCDF files, e.g., 's3'. Inferred from the references by default.
+        storage_options (Optional[Dict[str, Any]]): fsspec storage options of
+            the referenced NetCDF files.
+
+    Returns:
+        Dict[str, Any]: The combined kerchunk references.
+    """
+    MultiZarrToZarr = _import_kerchunk("kerchunk.combine", "MultiZarrToZarr")
+
+    combined: Dict[str, Any] = MultiZarrToZarr(
+        reference_hrefs,
+        remote_protocol=remote_protocol,
+        remote_options=storage_options,
+        concat_dims=["time"],
+        identical_dims=["lat", "lon", "crs"],
+    ).translate()
+    return combined
+
+
+def write_references(
+    references: Dict[str, Any], href: str, format: str = "json"
+) -> None:
+    """Writes kerchunk references.
+
+    Args:
+        references (Dict[str, Any]): The references.
+        href (str): HREF of the JSON file, or of the Parquet directory.
+        format (str): One of ``REFERENCE_FORMATS``. Parquet references are
+            loaded lazily by readers, which helps with many chunks and
+            requires the optional ``fastparquet`` dependency.
+    """
+    if format not in REFERENCE_FORMATS:
+        raise ValueError(
+            f"Invalid reference format '{format}'. Valid formats are "
+            f"{', '.join(REFERENCE_FORMATS)}."
+        )
+    if format == "json":
+        with fsspec.open(href, "w") as f:
+            json.dump(references, f)
+    else:
+        refs_to_dataframe = _import_kerchunk("kerchunk.df", "refs_to_dataframe")
+        refs_to_dataframe(references, href)
+    logger.info(f"Wrote {len(references['refs'])} references to {href}")
+
+
+def create_references_asset(href: str, format: str = "json") -> Dict[str, Any]:
+    """Creates an asset dict for kerchunk references.
+
+    Args:
+        href (str): HREF of the references.
+        format (str): One of ``REFERENCE_FORMATS``.
+
+    Returns:
+        dict: Asset object
+    """
+    return {
+        "href": make_absolute_href(href),
+        "title": constants.REFERENCES_ASSET_TITLE,
+        "type": constants.REFERENCES_MEDIA_TYPES[format],
+        "roles": constants.REFERENCES_ROLES,
+    }
+
+
+def _import_kerchunk(module: str, name: str) -> Any:
+    try:
+        return getattr(importlib.import_module(module), name)
+    except ImportError as e:
+        raise ImportError(
+            "Creating references requires kerchunk, install it with "
+            "'pip install stactools-esa-cci-lc[kerchunk]'."
+        ) from e
@@ -1,8 +1,9 @@
+import copy
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
+import stactools.core
 from dateutil.parser import isoparse
-from netCDF4 import Dataset
 from pystac import (
     Asset,
     CatalogType,
@@ -18,33 +19,69 @@ from pystac.extensions.item_assets import AssetDefinition, ItemAssetsExtension
 from pystac.extensions.projection import ProjectionExtension
 from pystac.extensions.scientific import ScientificExtension
 
-from .. import constants
+from .. import constants, profiling
 from . import netcdf
+from .header import HeaderCache, NetCDFHeader
+from .references import (
+    REFERENCE_FORMATS,
+    create_references,
+    create_references_asset,
+    write_references,
+)
+
+# Remote HREFs, e.g., http or abfs URLs, are read through fsspec. Set when
+# this module is imported rather than with the package, which keeps the
+# CLI startup fast.
+stactools.core.use_fsspec()
 
 
-def create_item(nc_href: str) -> Item:
+def create_item(
+    nc_href: str,
+    header_cache: Optional[HeaderCache] = None,
+    references_href: Optional[str] = None,
+    references_format: str = "json",
+) -> Item:
     """Creates a STAC Item for a NetCDF file containing ESA CCI Land Cover data.
 
     Args:
         nc_href (str): HREF to a NetCDF file.
+        header_cache (Optional[HeaderCache]): Optional cache of NetCDF headers.
+            If given, the file is only opened if its header isn't cached yet.
+        references_href (Optional[str]): Optional HREF to write kerchunk
+            references to the chunks of the NetCDF file to, which are added as
+            an Asset. Requires the optional ``kerchunk`` dependency.
+        references_format (str): Format of the references, one of
+            ``references.REFERENCE_FORMATS``. Defaults to "json".
 
     Returns:
         Item: A STAC Item describing a NetCDF file.
     """
 
-    with Dataset(nc_href, "r", format="NETCDF4") as dataset:
-        id = dataset.id
+    if references_format not in REFERENCE_FORMATS:
+        raise ValueError(
+            f"Invalid reference format '{references_format}'. Valid formats are "
+            f"{', '.join(REFERENCE_FORMATS)}."
+        )
+
+    with profiling.stage("netcdf_item"):
+        if header_cache is None:
+            header = NetCDFHeader.read(nc_href)
+        else:
+            header = header_cache.read(nc_href)
+        attributes = header.attributes
+        id = attributes["id"]
 
-        if dataset.product_version not in constants.VERSIONS:
+        product_version = attributes["product_version"]
+        if product_version not in constants.VERSIONS:
             versions = ",".join(constants.VERSIONS)
             raise Exception(
-                f"Given product version ({dataset.product_version}) is not supported. "
+                f"Given product version ({product_version}) is not supported. "
                 f"Supports: {versions}"
             )
 
         # Times must be in UTC
-        start = dataset.time_coverage_start
-        end = dataset.time_coverage_end
+        start = attributes["time_coverage_start"]
+        end = attributes["time_coverage_end"]
         if start[0:4] != end[0:4]:
             raise Exception(
                 "Expected a yearly land cover product, but got different start and end years"
@@ -60,7 +97,7 @@ def create_item(nc_href: str) -> Item:
         properties: Dict[str, Any] = {
             "start_datetime": start_datetime,
             "end_datetime": end_datetime,
-            "esa_cci_lc:version": dataset.product_version,
+            "esa_cci_lc:version": product_version,
         }
 
         item = Item(
@@ -81,22 +118,20 @@ def create_item(nc_href: str) -> Item:
         proj_attrs = ProjectionExtension.ext(item, add_if_missing=True)
         proj_attrs.epsg = constants.EPSG_CODE
         proj_attrs.shape = [
-            dataset.dimensions["lon"].size,
-            dataset.dimensions["lat"].size,
+            header.dimensions["lon"],
+            header.dimensions["lat"],
         ]
-        transform = netcdf.parse_transform(dataset)
-        if transform is not None:
-            proj_attrs.transform = transform
+        if header.transform is not None:
+            proj_attrs.transform = header.transform
 
-        software = netcdf.parse_software_history(dataset.history)
-        if len(software) > 0 or len(dataset.source) > 0:
+        software = netcdf.parse_software_history(attributes["history"])
+        source = attributes["source"]
+        if len(software) > 0 or len(source) > 0:
             item.stac_extensions.append(constants.PROCESSING_EXTENSION)
             if len(software) > 0:
                 item.properties["processing:software"] = software
-            if len(dataset.source) > 0:
-                lineage = (
-                    f"Produced based on the following data sources: {dataset.source}"
-                )
+            if len(source) > 0:
+                lineage = f"Produced based on the following data sources: {source}"
                 item.properties["processing:lineage"] = lineage
 
         # Add asset to the item
@@ -104,16 +139,28 @@ def create_item(nc_href: str) -> Item:
 
         # todo: replace with DataCube extension from PySTAC
         item.stac_extensions.append(constants.DATACUBE_EXTENSION)
-        asset_dict["cube:dimensions"] = netcdf.to_cube_dimensions(dataset)
-        asset_dict["cube:variables"] = netcdf.to_cube_variables(dataset)
+        asset_dict["cube:dimensions"] = copy.deepcopy(header.cube_dimensions)
+        asset_dict["cube:variables"] = copy.deepcopy(header.cube_variables)
 
         asset = Asset.from_dict(asset_dict)
         item.add_asset(constants.NETCDF_KEY, asset)
 
         common_asset = CommonMetadata(asset)
-        common_asset.created = isoparse(dataset.creation_date)
+        common_asset.created = isoparse(attributes["creation_date"])
+
+    if references_href is not None:
+        with profiling.stage("references"):
+            write_references(
+                create_references(nc_href), references_href, references_format
+            )
+        item.add_asset(
+            constants.REFERENCES_KEY,
+            Asset.from_dict(
+                create_references_asset(references_href, references_format)
+            ),
+        )
 
-        return item
+    return item
 
 
 def create_collection(
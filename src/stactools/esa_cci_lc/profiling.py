@@ -0,0 +1,228 @@
+import json
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+MetricsHook = Callable[["StageRecord"], None]
+
+_hooks: List[MetricsHook] = []
+
+
+@dataclass
+class StageRecord:
+    """Metrics of a processing stage, e.g., reading a variable of a tile.
+
+    Args:
+        stage (str): Name of the stage, e.g., 'read' or 'cog_copy'.
+        variable (Optional[str]): NetCDF variable, if the stage processes one.
+        tile (Optional[str]): Tile ID, if the stage processes one.
+        seconds (float): Wall time spent in the stage.
+        bytes_read (int): Bytes read.
+        bytes_written (int): Bytes written.
+        pixels (int): Pixels processed.
+    """
+
+    stage: str
+    variable: Optional[str] = None
+    tile: Optional[str] = None
+    seconds: float = 0.0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    pixels: int = 0
+
+    @contextmanager
+    def measure(self) -> Iterator["StageRecord"]:
+        """Adds the wall time of the block to the record."""
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.seconds += time.perf_counter() - start
+
+
+def add_metrics_hook(hook: MetricsHook) -> None:
+    """Registers a function that is called with every completed stage record
+    of this process, including the records of worker processes.
+
+    Args:
+        hook (Callable[[StageRecord], None]): The function.
+    """
+    _hooks.append(hook)
+
+
+def remove_metrics_hook(hook: MetricsHook) -> None:
+    """Unregisters a function registered with :func:`add_metrics_hook`.
+
+    Args:
+        hook (Callable[[StageRecord], None]): The function.
+    """
+    _hooks.remove(hook)
+
+
+def enabled() -> bool:
+    """Returns whether any metrics hook is registered."""
+    return bool(_hooks)
+
+
+def emit(record: StageRecord) -> None:
+    """Passes a completed stage record to the registered hooks."""
+    for hook in list(_hooks):
+        hook(record)
+
+
+@contextmanager
+def stage(
+    name: str, variable: Optional[str] = None, tile: Optional[str] = None
+) -> Iterator[StageRecord]:
+    """Measures the wall time of a block as a stage and emits the record when
+    the block completes. Byte and pixel counts can be set on the yielded
+    record.
+
+    Args:
+        name (str): Name of the stage.
+        variable (Optional[str]): NetCDF variable, if any.
+        tile (Optional[str]): Tile ID, if any.
+
+    Returns:
+        Iterator[StageRecord]: The record of the stage.
+    """
+    record = StageRecord(name, variable, tile)
+    with record.measure():
+        yield record
+    emit(record)
+
+
+@contextmanager
+def collect() -> Iterator[List[StageRecord]]:
+    """Collects the stage records emitted within a block, e.g., to send the
+    records of a worker process back to the parent process."""
+    records: List[StageRecord] = []
+    add_metrics_hook(records.append)
+    try:
+        yield records
+    finally:
+        remove_metrics_hook(records.append)
+
+
+class Profiler:
+    """Collects stage records while registered as a metrics hook and
+    summarizes them per stage.
+
+    Stage times of worker processes add up, so with more than one worker the
+    total stage time exceeds the wall time of the run.
+    """
+
+    def __init__(self) -> None:
+        self.records: List[StageRecord] = []
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+
+    def __enter__(self) -> "Profiler":
+        self.start = time.perf_counter()
+        add_metrics_hook(self.records.append)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        remove_metrics_hook(self.records.append)
+        self.end = time.perf_counter()
+
+    @property
+    def wall_seconds(self) -> float:
+        end = time.perf_counter() if self.end is None else self.end
+        return end - self.start
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Sums up the records of each stage, in order of first appearance.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Count, seconds, bytes read and written,
+                pixels and pixels per second of each stage.
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+        for record in self.records:
+            totals = stages.setdefault(
+                record.stage,
+                {
+                    "count": 0,
+                    "seconds": 0.0,
+                    "bytes_read": 0,
+                    "bytes_written": 0,
+                    "pixels": 0,
+                },
+            )
+            totals["count"] += 1
+            totals["seconds"] += record.seconds
+            totals["bytes_read"] += record.bytes_read
+            totals["bytes_written"] += record.bytes_written
+            totals["pixels"] += record.pixels
+        for totals in stages.values():
+            seconds = totals["seconds"]
+            totals["pixels_per_second"] = (
+                totals["pixels"] / seconds if seconds and totals["pixels"] else None
+            )
+        return stages
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wall_seconds": self.wall_seconds,
+            "stages": self.summary(),
+            "records": [asdict(record) for record in self.records],
+        }
+
+    def save(self, path: str) -> None:
+        """Writes the summary and all records to a JSON file.
+
+        Args:
+            path (str): Path to the JSON report.
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def format_table(self) -> str:
+        """Formats the summary as a plain text table.
+
+        Returns:
+            str: The table.
+        """
+        lines = [
+            f"{'stage':<16}{'count':>7}{'seconds':>10}{'share':>8}"
+            f"{'MB read':>10}{'MB written':>12}{'Mpixels/s':>11}"
+        ]
+        stages = self.summary()
+        total = sum(totals["seconds"] for totals in stages.values())
+        for name, totals in stages.items():
+            rate = totals["pixels_per_second"]
+            lines.append(
+                f"{name:<16}{totals['count']:>7}{totals['seconds']:>10.2f}"
+                f"{totals['seconds'] / total if total else 0:>8.1%}"
+                f"{totals['bytes_read'] / 1e6:>10.1f}"
+                f"{totals['bytes_written'] / 1e6:>12.1f}"
+                f"{'-' if rate is None else f'{rate / 1e6:.1f}':>11}"
+            )
+        lines.append(f"Wall time: {self.wall_seconds:.2f} s")
+        return "\n".join(lines)
+
+
+@contextmanager
+def profile_report(
+    path: Optional[str], echo: Callable[[str], None] = print
+) -> Iterator[Optional[Profiler]]:
+    """Profiles a block if a report path is given, then writes the JSON report
+    and echoes the summary table.
+
+    Args:
+        path (Optional[str]): Path to the JSON report. Nothing is profiled if
+            None.
+        echo (Callable[[str], None]): Function that outputs the summary table.
+
+    Returns:
+        Iterator[Optional[Profiler]]: The profiler, or None.
+    """
+    if path is None:
+        yield None
+        return
+    with Profiler() as profiler:
+        yield profiler
+    profiler.save(path)
+    echo(profiler.format_table())
@@ -0,0 +1,179 @@
+import importlib
+import logging
+import os
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Any, Dict, Iterable, Optional, Type, Union
+
+import orjson
+from pystac import Item
+
+logger = logging.getLogger(__name__)
+
+# Formats that stream all Items of a run into a single file
+ITEM_FILE_FORMATS = ["ndjson", "geoparquet"]
+OUTPUT_FORMATS = ["json", *ITEM_FILE_FORMATS]
+# Formats of ItemWriter, with "json" for a single ItemCollection
+ITEM_WRITER_FORMATS = [*ITEM_FILE_FORMATS, "json"]
+ITEM_FILE_EXTENSIONS = {
+    "json": ".json",
+    "ndjson": ".ndjson",
+    "geoparquet": ".parquet",
+}
+
+
+class ItemWriter:
+    """Writes STAC Items to a single file as they are produced, without
+    holding them in memory.
+
+    Items are written as newline-delimited JSON, serialized with orjson. With
+    the "geoparquet" format, the newline-delimited JSON is a temporary file
+    that is converted to stac-geoparquet when the writer is closed, in
+    bounded memory. The file is written under a temporary name and renamed
+    once complete, so a failed run never leaves a partial file under the
+    final name.
+
+    With the "json" format, the Items are written as the features of a single
+    ItemCollection, i.e., a GeoJSON FeatureCollection, which is opened when the
+    writer is created and closed when it is closed.
+
+    Args:
+        path (str): Path of the output file.
+        output_format (str): One of ``ITEM_WRITER_FORMATS``. The "geoparquet"
+            format requires the optional ``geoparquet`` dependency.
+    """
+
+    def __init__(self, path: str, output_format: str = "ndjson") -> None:
+        if output_format not in ITEM_WRITER_FORMATS:
+            raise ValueError(
+                f"Invalid output format '{output_format}'. Valid formats are "
+                f"{', '.join(ITEM_WRITER_FORMATS)}."
+            )
+        if output_format == "geoparquet":
+            # Fails before any Item is created if the dependency is missing
+            _import_stac_geoparquet()
+        self.path = path
+        self.output_format = output_format
+        self.count = 0
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._ndjson_path = f"{path}.partial"
+        if output_format == "geoparquet":
+            self._ndjson_path = f"{path}.ndjson.partial"
+        self._file: Optional[IO[bytes]] = open(self._ndjson_path, "wb")
+        if output_format == "json":
+            self._file.write(b'{"type": "FeatureCollection", "features": [\n')
+
+    def write(self, item: Union[Item, Dict[str, Any]]) -> None:
+        """Writes an Item.
+
+        Args:
+            item (Union[Item, Dict[str, Any]]): The Item, or a STAC Item dict,
+                e.g., from :class:`~stactools.esa_cci_lc.cog.bulk.ItemDictFactory`.
+        """
+        if self._file is None:
+            raise ValueError(f"Item writer of '{self.path}' is closed.")
+        if isinstance(item, Item):
+            item = item.to_dict(include_self_link=False, transform_hrefs=False)
+        if self.output_format == "json" and self.count:
+            self._file.write(b",")
+        self._file.write(
+            orjson.dumps(
+                item, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE
+            )
+        )
+        self.count += 1
+
+    def write_all(self, items: Iterable[Union[Item, Dict[str, Any]]]) -> int:
+        """Writes Items one by one as they are produced.
+
+        Args:
+            items (Iterable[Union[Item, Dict[str, Any]]]): The Items or STAC
+                Item dicts, e.g., a generator.
+
+        Returns:
+            int: The number of written Items.
+        """
+        for item in items:
+            self.write(item)
+        return self.count
+
+    def close(self) -> None:
+        """Completes the output file."""
+        if self._file is None:
+            return
+        if self.output_format == "json":
+            self._file.write(b"]}\n")
+        self._file.close()
+        self._file = None
+        try:
+            if self.output_format == "geoparquet":
+                partial_path = f"{self.path}.partial"
+                _to_geoparquet(self._ndjson_path, partial_path)
+                os.replace(partial_path, self.path)
+            else:
+                os.replace(self._ndjson_path, self.path)
+        finally:
+            self._remove_partial()
+        logger.info(f"Wrote {self.count} Items to {self.path}")
+
+    def abort(self) -> None:
+        """Closes the writer and removes the incomplete output."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._remove_partial()
+
+    def _remove_partial(self) -> None:
+        for path in [self._ndjson_path, f"{self.path}.partial"]:
+            if os.path.exists(path):
+                os.remove(path)
+
+    def __enter__(self) -> "ItemWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def item_file_path(
+    directory: str, output_format: str, name: Optional[str] = None
+) -> str:
+    """Returns the path of the file holding the Items of a run.
+
+    Args:
+        directory (str): Output directory.
+        output_format (str): One of ``ITEM_WRITER_FORMATS``.
+        name (Optional[str]): File name relative to the directory. Defaults
+            to 'items' with the extension of the format.
+
+    Returns:
+        str: The path.
+    """
+    if name is None:
+        name = f"items{ITEM_FILE_EXTENSIONS[output_format]}"
+    return str(Path(directory, name))
+
+
+def _to_geoparquet(ndjson_path: str, parquet_path: str) -> None:
+    stac_geoparquet_arrow = _import_stac_geoparquet()
+    # The schema is inferred by a first pass over the file, so neither pass
+    # holds more than a chunk of Items
+    stac_geoparquet_arrow.parse_stac_ndjson_to_parquet(ndjson_path, parquet_path)
+
+
+def _import_stac_geoparquet() -> Any:
+    try:
+        return importlib.import_module("stac_geoparquet.arrow")
+    except ImportError as e:
+        raise ImportError(
+            "Writing stac-geoparquet requires stac-geoparquet, install it with "
+            "'pip install stactools-esa-cci-lc[geoparquet]'."
+        ) from e
@@ -0,0 +1,217 @@
+import logging
+import os
+from typing import Callable, List, Optional
+
+import click
+from click import Command, Group
+
+from stactools.esa_cci_lc import constants, profiling
+from stactools.esa_cci_lc.memory import parse_memory_option
+
+logger = logging.getLogger(__name__)
+
+
+def create_command(esaccilc: Group) -> Command:
+    @esaccilc.group(
+        "zarr",
+        short_help=("Commands for working with ESA CCI Zarr stores"),
+    )
+    def zarr() -> None:
+        pass
+
+    @zarr.command(
+        "convert",
+        short_help="Converts a NetCDF file to a Zarr store and creates a STAC item",
+    )
+    @click.argument("source")
+    @click.argument("destination")
+    @click.argument("item_destination")
+    @click.option(
+        "--chunks",
+        type=(click.IntRange(min=1), click.IntRange(min=1)),
+        default=constants.ZARR_CHUNKS,
+        help="Height and width of the Zarr chunks in pixels. Defaults to "
+        f"{constants.ZARR_CHUNKS[0]} {constants.ZARR_CHUNKS[1]}.",
+    )
+    @click.option(
+        "--overwrite",
+        is_flag=True,
+        default=False,
+        help="Replace an existing Zarr store.",
+    )
+    @_writing_options
+    def convert_command(
+        source: str,
+        destination: str,
+        item_destination: str,
+        chunks: List[int],
+        overwrite: bool,
+        compressor: str,
+        clevel: int,
+        shuffle: str,
+        threads: Optional[int],
+        max_memory: Optional[int],
+        profile: Optional[str],
+    ) -> None:
+        """Converts the data variables of a NetCDF file to a chunked Zarr store
+        and creates a STAC Item for the store.
+
+        \b
+        Args:
+            source (str): Local path to the NetCDF file.
+            destination (str): HREF of the Zarr store.
+            item_destination (str): An HREF for the STAC Item
+        """
+        from stactools.esa_cci_lc.zarr import stac
+        from stactools.esa_cci_lc.zarr.convert import convert
+
+        with profiling.profile_report(profile, click.echo):
+            convert(
+                source,
+                destination,
+                chunks=list(chunks),
+                compressor=compressor,
+                clevel=clevel,
+                shuffle=shuffle,
+                threads=threads,
+                max_memory=max_memory,
+                overwrite=overwrite,
+            )
+        item = stac.create_item(source, destination)
+        item.save_object(dest_href=item_destination)
+
+        return None
+
+    @zarr.command(
+        "append",
+        short_help="Appends yearly NetCDF files to a multi-year Zarr cube",
+    )
+    @click.argument("sources", nargs=-1, required=True)
+    @click.argument("destination")
+    @click.argument("item_destination")
+    @click.option(
+        "--variable",
+        "variables",
+        type=click.Choice(constants.DATA_VARIABLES),
+        multiple=True,
+        help="Data variable of the cube, can be given multiple times. Only used "
+        "when the cube is created. Defaults to "
+        f"{', '.join(constants.CUBE_VARIABLES)}.",
+    )
+    @click.option(
+        "--chunks",
+        type=(click.IntRange(min=1), click.IntRange(min=1)),
+        default=constants.CUBE_CHUNKS,
+        help="Height and width of the chunks in pixels. Only used when the cube "
+        f"is created. Defaults to {constants.CUBE_CHUNKS[0]} "
+        f"{constants.CUBE_CHUNKS[1]}.",
+    )
+    @click.option(
+        "--time-chunk",
+        type=click.IntRange(min=1),
+        default=constants.CUBE_TIME_CHUNK,
+        help="Number of years per chunk. Larger values speed up reading the time "
+        "series of pixels, 1 never rewrites the chunks of existing years. Only "
+        f"used when the cube is created. Defaults to {constants.CUBE_TIME_CHUNK}.",
+    )
+    @_writing_options
+    def append_command(
+        sources: List[str],
+        destination: str,
+        item_destination: str,
+        variables: List[str],
+        chunks: List[int],
+        time_chunk: int,
+        compressor: str,
+        clevel: int,
+        shuffle: str,
+        threads: Optional[int],
+        max_memory: Optional[int],
+        profile: Optional[str],
+    ) -> None:
+        """Appends yearly NetCDF files to a Zarr cube stacked along time and
+        creates or updates the STAC Item of the cube. The cube is created if
+        it doesn't exist.
+
+        \b
+        Args:
+            sources (List[str]): Local paths to the NetCDF files, in time
+                order.
+            destination (str): HREF of the Zarr cube.
+            item_destination (str): An HREF for the STAC Item. An existing Item
+                is updated.
+        """
+        from pystac import Item
+
+        from stactools.esa_cci_lc.zarr import stac
+        from stactools.esa_cci_lc.zarr.cube import append_year
+
+        item = None
+        if os.path.exists(item_destination):
+            item = Item.from_file(item_destination)
+        with profiling.profile_report(profile, click.echo):
+            for source in sources:
+                append_year(
+                    source,
+                    destination,
+                    variables=list(variables) or None,
+                    chunks=list(chunks),
+                    time_chunk=time_chunk,
+                    compressor=compressor,
+                    clevel=clevel,
+                    shuffle=shuffle,
+                    threads=threads,
+                    max_memory=max_memory,
+                )
+                item = stac.create_cube_item(source, destination, item)
+                # Saved after each year, so the Item matches the cube if a
+                # later year fails
+                item.save_object(dest_href=item_destination)
+
+        return None
+
+    return zarr
+
+
+def _writing_options(function: Callable[..., None]) -> Callable[..., None]:
+    """Adds the compression and concurrency options shared by the commands."""
+    options = [
+        click.option(
+            "--compressor",
+            type=click.Choice(constants.ZARR_COMPRESSORS),
+            default=constants.ZARR_COMPRESSOR,
+            help=f"Blosc compressor. Defaults to '{constants.ZARR_COMPRESSOR}'.",
+        ),
+        click.option(
+            "--clevel",
+            type=click.IntRange(0, 9),
+            default=constants.ZARR_CLEVEL,
+            help=f"Compression level. Defaults to {constants.ZARR_CLEVEL}.",
+        ),
+        click.option(
+            "--shuffle",
+            type=click.Choice(constants.ZARR_SHUFFLES),
+            default=constants.ZARR_SHUFFLE,
+            help=f"Blosc shuffle filter. Defaults to '{constants.ZARR_SHUFFLE}'.",
+        ),
+        click.option(
+            "--threads",
+            type=click.IntRange(min=1),
+            help="Number of threads compressing and writing chunks. Defaults to "
+            "the number of CPUs.",
+        ),
+        click.option(
+            "--max-memory",
+            help="Memory budget of the chunks in flight, e.g., '2GiB'. Defaults to "
+            "two chunks per thread.",
+            callback=parse_memory_option,
+        ),
+        click.option(
+            "--profile",
+            help="Path to a JSON report of the time, bytes and pixels of reading "
+            "and writing each variable. A summary table is printed.",
+        ),
+    ]
+    for option in reversed(options):
+        function = option(function)
+    return function
@@ -0,0 +1,348 @@
+import importlib
+import itertools
+import logging
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+from netCDF4 import Dataset, Variable, default_fillvals
+from pystac.utils import make_absolute_href
+
+from .. import constants, profiling
+from ..netcdf.references import COORDINATE_VARIABLES
+
+logger = logging.getLogger(__name__)
+
+COMPRESSORS = constants.ZARR_COMPRESSORS
+SHUFFLES = constants.ZARR_SHUFFLES
+DEFAULT_COMPRESSOR = constants.ZARR_COMPRESSOR
+DEFAULT_CLEVEL = constants.ZARR_CLEVEL
+DEFAULT_SHUFFLE = constants.ZARR_SHUFFLE
+# A chunk is held in memory once as read and once encoded
+CHUNK_COPIES = 2
+
+
+def convert(
+    nc_path: str,
+    zarr_href: str,
+    chunks: Optional[List[int]] = None,
+    compressor: str = DEFAULT_COMPRESSOR,
+    clevel: int = DEFAULT_CLEVEL,
+    shuffle: str = DEFAULT_SHUFFLE,
+    threads: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    overwrite: bool = False,
+    storage_options: Optional[Dict[str, Any]] = None,
+) -> str:
+    """Converts the data variables of a NetCDF file into a chunked Zarr store.
+
+    The store follows the layout of the NetCDF file, so it can be opened with
+    xarray: the data variables keep their (time, lat, lon) dimensions and the
+    lat, lon, time and crs variables as well as all attributes are copied.
+
+    The data is streamed chunk by chunk. Chunks are read from the NetCDF file
+    in this thread, since the HDF5 library is not thread safe, and compressed
+    and written on a thread pool. Only a bounded number of chunks is in
+    flight at a time. Chunks holding only the fill value are not written.
+    Metadata is consolidated, so the store is opened with a single read.
+
+    Requires the optional ``zarr`` dependency.
+
+    Args:
+        nc_path (str): Local path to the NetCDF file.
+        zarr_href (str): HREF of the Zarr store, a local directory or an fsspec
+            URL, e.g., 's3://bucket/lc-2018.zarr'.
+        chunks (Optional[List[int]]): Height and width of the Zarr chunks.
+            Multiples of the NetCDF chunk size read every NetCDF chunk once.
+            Defaults to ``constants.ZARR_CHUNKS``.
+        compressor (str): Blosc compressor, one of ``COMPRESSORS``.
+        clevel (int): Compression level from 0 to 9.
+        shuffle (str): Blosc shuffle filter, one of ``SHUFFLES``. Bit
+            shuffling suits the small integers of the land cover data.
+        threads (Optional[int]): Number of threads compressing and writing
+            chunks. Defaults to the number of CPUs.
+        max_memory (Optional[int]): Memory budget of the chunks in flight in
+            bytes. Limits the threads if needed. Defaults to two chunks per
+            thread.
+        overwrite (bool): Whether to replace an existing store. Otherwise, an
+            existing store raises an error.
+        storage_options (Optional[Dict[str, Any]]): fsspec storage options of
+            the Zarr store.
+
+    Returns:
+        str: The HREF of the Zarr store.
+    """
+    zarr = import_zarr()
+    if chunks is None:
+        chunks = constants.ZARR_CHUNKS
+    if len(chunks) != 2 or min(chunks) < 1:
+        raise ValueError(f"Chunks must be a positive height and width, got {chunks}.")
+    codec = create_codec(compressor, clevel, shuffle)
+
+    store = zarr.storage.FSStore(zarr_href, **(storage_options or {}))
+    root = zarr.open_group(store, mode="w" if overwrite else "w-")
+    with Dataset(nc_path, "r", format="NETCDF4") as dataset:
+        # Data is copied as stored, fill values are kept
+        dataset.set_auto_maskandscale(False)
+        root.attrs.update(
+            {name: to_json(dataset.getncattr(name)) for name in dataset.ncattrs()}
+        )
+        for name in COORDINATE_VARIABLES:
+            if name in dataset.variables:
+                variable = dataset.variables[name]
+                array = create_array(root, variable, chunks, codec)
+                array[...] = variable[...]
+
+        arrays = {
+            name: create_array(root, dataset.variables[name], chunks, codec)
+            for name in constants.DATA_VARIABLES
+        }
+        copy_data(dataset, arrays, threads=threads, max_memory=max_memory)
+
+    zarr.consolidate_metadata(store)
+    return zarr_href
+
+
+def copy_data(
+    dataset: Dataset,
+    arrays: Dict[str, Any],
+    time_index: int = 0,
+    threads: Optional[int] = None,
+    max_memory: Optional[int] = None,
+) -> None:
+    """Copies the data of NetCDF variables with a single time step into Zarr
+    arrays of the same spatial shape, chunk by chunk.
+
+    Chunks are read from the NetCDF file in this thread, since the HDF5
+    library is not thread safe, and compressed and written on a thread pool.
+    Only a bounded number of chunks is in flight at a time.
+
+    Args:
+        dataset (Dataset): The NetCDF dataset, with automatic masking and
+            scaling disabled.
+        arrays (Dict[str, zarr.Array]): Zarr array of each NetCDF variable,
+            with (time, lat, lon) dimensions.
+        time_index (int): Index along time to write the data to.
+        threads (Optional[int]): Number of threads compressing and writing
+            chunks. Defaults to the number of CPUs.
+        max_memory (Optional[int]): Memory budget of the chunks in flight in
+            bytes. Limits the threads if needed. Defaults to two chunks per
+            thread.
+    """
+    chunk_bytes = max(
+        int(np.prod(array.chunks)) * array.dtype.itemsize for array in arrays.values()
+    )
+    threads, chunks_in_flight = _plan_threads(threads, max_memory, chunk_bytes)
+    logger.info(
+        f"Copying {', '.join(arrays)} at time index {time_index} with {threads} "
+        f"threads and {chunks_in_flight} chunks in flight"
+    )
+    time = slice(time_index, time_index + 1)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        pending: Deque["Future[None]"] = deque()
+        for name, array in arrays.items():
+            variable = dataset.variables[name]
+            for region in _iter_regions(array.shape[1:], array.chunks[1:]):
+                with profiling.stage("read", name) as record:
+                    data = variable[(slice(0, 1),) + region]
+                    record.bytes_read = data.nbytes
+                    record.pixels = data.size
+                pending.append(
+                    executor.submit(_write_chunk, array, (time,) + region, data, name)
+                )
+                if len(pending) >= chunks_in_flight:
+                    pending.popleft().result()
+        while pending:
+            pending.popleft().result()
+
+
+def create_codec(
+    compressor: str = DEFAULT_COMPRESSOR,
+    clevel: int = DEFAULT_CLEVEL,
+    shuffle: str = DEFAULT_SHUFFLE,
+) -> Any:
+    """Creates a Blosc codec.
+
+    Requires the optional ``zarr`` dependency.
+
+    Args:
+        compressor (str): Blosc compressor, one of ``COMPRESSORS``.
+        clevel (int): Compression level from 0 to 9.
+        shuffle (str): Blosc shuffle filter, one of ``SHUFFLES``.
+
+    Returns:
+        numcodecs.Blosc: The codec.
+    """
+    if compressor not in COMPRESSORS:
+        raise ValueError(
+            f"Invalid compressor '{compressor}'. Valid compressors are "
+            f"{', '.join(COMPRESSORS)}."
+        )
+    if shuffle not in SHUFFLES:
+        raise ValueError(
+            f"Invalid shuffle '{shuffle}'. Valid shuffles are {', '.join(SHUFFLES)}."
+        )
+    if not 0 <= clevel <= 9:
+        raise ValueError(f"Compression level must be from 0 to 9, got '{clevel}'.")
+    import_zarr()
+    Blosc = importlib.import_module("numcodecs").Blosc
+    return Blosc(cname=compressor, clevel=clevel, shuffle=SHUFFLES.index(shuffle))
+
+
+def create_asset(href: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Creates a basic Zarr asset dict with shared properties (title, type, roles)
+    and optionally an href. An href should be given for normal assets, but can
+    be None for Item Asset Definitions
+
+    Args:
+        href (str): The URL to an asset (optional)
+
+    Returns:
+        dict: Basic Asset object
+    """
+    asset: Dict[str, Any] = {
+        "title": constants.ZARR_ASSET_TITLE,
+        "type": constants.ZARR_MEDIA_TYPE,
+        "roles": constants.ZARR_ROLES,
+    }
+    if href is not None:
+        asset["href"] = make_absolute_href(href)
+    return asset
+
+
+def create_array(
+    root: Any,
+    variable: "Variable[Any]",
+    chunks: List[int],
+    codec: Any,
+    time_chunk: int = 1,
+    time_size: Optional[int] = None,
+) -> Any:
+    """Creates an empty Zarr array with the dimensions, data type, fill value
+    and attributes of a NetCDF variable.
+
+    Args:
+        root (zarr.Group): Zarr group to create the array in.
+        variable (netCDF4.Variable): NetCDF variable.
+        chunks (List[int]): Chunk height and width of the spatial dimensions.
+        codec (numcodecs.abc.Codec): Compressor of the array.
+        time_chunk (int): Chunk size of the time dimension.
+        time_size (Optional[int]): Size of the time dimension, if it differs
+            from the one of the variable.
+
+    Returns:
+        zarr.Array: The empty array.
+    """
+    attrs = variable.ncattrs()
+    if "_FillValue" in attrs:
+        fill_value = variable.getncattr("_FillValue")
+    elif variable.dtype.kind in "iuf":
+        # Unwritten NetCDF chunks read as the default fill value
+        fill_value = default_fillvals[variable.dtype.str[1:]]
+    else:
+        fill_value = None
+    shape = tuple(
+        time_size if dim == "time" and time_size is not None else size
+        for dim, size in zip(variable.dimensions, variable.shape)
+    )
+    spatial_chunks = {"lat": chunks[0], "lon": chunks[1]}
+    array = root.create_dataset(
+        variable.name,
+        shape=shape,
+        chunks=tuple(
+            time_chunk if dim == "time" else min(spatial_chunks.get(dim, size), size)
+            for dim, size in zip(variable.dimensions, shape)
+        ),
+        dtype=variable.dtype,
+        compressor=codec,
+        fill_value=fill_value,
+        write_empty_chunks=False,
+        # Replaces the arrays of an interrupted run
+        overwrite=True,
+    )
+    array.attrs.update(
+        {
+            name: to_json(variable.getncattr(name))
+            for name in attrs
+            if name != "_FillValue"
+        }
+    )
+    # Dimension names as read by xarray
+    array.attrs["_ARRAY_DIMENSIONS"] = list(variable.dimensions)
+    return array
+
+
+def to_json(value: Any) -> Any:
+    """Converts a NetCDF attribute value to a JSON serializable value.
+
+    Args:
+        value (Any): Attribute value, possibly a numpy array or scalar.
+
+    Returns:
+        Any: The value as a list or Python scalar.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def import_zarr() -> Any:
+    """Imports the optional ``zarr`` dependency.
+
+    Returns:
+        module: The ``zarr`` module.
+
+    Raises:
+        ImportError: If ``zarr`` is not installed.
+    """
+    try:
+        return importlib.import_module("zarr")
+    except ImportError as e:
+        raise ImportError(
+            "Converting to Zarr requires zarr, install it with "
+            "'pip install stactools-esa-cci-lc[zarr]'."
+        ) from e
+
+
+def _plan_threads(
+    threads: Optional[int], max_memory: Optional[int], chunk_bytes: int
+) -> Tuple[int, int]:
+    """Returns the number of threads and of chunks in flight."""
+    if threads is None:
+        threads = os.cpu_count() or 1
+    threads = max(1, threads)
+    if max_memory is None:
+        return threads, 2 * threads
+    chunks_in_flight = max(1, max_memory // (CHUNK_COPIES * chunk_bytes))
+    if chunks_in_flight < 2 * threads:
+        logger.warning(
+            f"Memory budget of {max_memory} bytes holds {chunks_in_flight} chunks "
+            f"of {chunk_bytes} bytes, which limits the threads."
+        )
+    return min(threads, chunks_in_flight), chunks_in_flight
+
+
+def _iter_regions(
+    shape: Tuple[int, ...], chunks: Tuple[int, ...]
+) -> Iterator[Tuple[slice, ...]]:
+    """Iterates over the regions of the chunks of an array in row-major
+    order."""
+    starts = [range(0, size, chunk) for size, chunk in zip(shape, chunks)]
+    for start in itertools.product(*starts):
+        yield tuple(
+            slice(offset, min(offset + chunk, size))
+            for offset, chunk, size in zip(start, chunks, shape)
+        )
+
+
+def _write_chunk(
+    array: Any, region: Tuple[slice, ...], data: np.ndarray, variable: str
+) -> None:
+    with profiling.stage("zarr_write", variable) as record:
+        array[region] = data
+        record.pixels = data.size
@@ -0,0 +1,219 @@
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from netCDF4 import Dataset
+
+from .. import constants
+from ..netcdf.references import COORDINATE_VARIABLES
+from .convert import (
+    DEFAULT_CLEVEL,
+    DEFAULT_COMPRESSOR,
+    DEFAULT_SHUFFLE,
+    copy_data,
+    create_array,
+    create_codec,
+    import_zarr,
+    to_json,
+)
+
+logger = logging.getLogger(__name__)
+
+# Global attributes that differ between the yearly NetCDF files. They are
+# kept per year in the cube's ``years`` attribute.
+YEARLY_ATTRIBUTES = [
+    "id",
+    "product_version",
+    "time_coverage_start",
+    "time_coverage_end",
+    "creation_date",
+    "history",
+    "source",
+    "tracking_id",
+]
+
+
+def append_year(
+    nc_path: str,
+    cube_href: str,
+    variables: Optional[List[str]] = None,
+    chunks: Optional[List[int]] = None,
+    time_chunk: int = constants.CUBE_TIME_CHUNK,
+    compressor: str = DEFAULT_COMPRESSOR,
+    clevel: int = DEFAULT_CLEVEL,
+    shuffle: str = DEFAULT_SHUFFLE,
+    threads: Optional[int] = None,
+    max_memory: Optional[int] = None,
+    storage_options: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Appends the land cover map of a yearly NetCDF file to a Zarr cube
+    stacked along time, creating the cube if it doesn't exist yet.
+
+    Years are appended in time order. The existing years are not rewritten,
+    except for those sharing the last, partially filled time chunk, which is
+    read, updated and written again. A ``time_chunk`` of 1 never rewrites
+    existing chunks, larger values make reading the time series of a pixel
+    take fewer requests. The chunking, compression and variables are set
+    when the cube is created and apply to all years.
+
+    The time coordinate is extended last, so an interrupted append leaves the
+    cube at its previous years and can be repeated.
+
+    Requires the optional ``zarr`` dependency.
+
+    Args:
+        nc_path (str): Local path to the yearly NetCDF file.
+        cube_href (str): HREF of the Zarr cube, a local directory or an fsspec
+            URL.
+        variables (Optional[List[str]]): Data variables of the cube, when it
+            is created. Defaults to ``constants.CUBE_VARIABLES``. Must match
+            the variables of an existing cube, if given.
+        chunks (Optional[List[int]]): Height and width of the chunks, when
+            the cube is created. Defaults to ``constants.CUBE_CHUNKS``.
+        time_chunk (int): Number of years per chunk, when the cube is created.
+        compressor (str): Blosc compressor, when the cube is created.
+        clevel (int): Compression level, when the cube is created.
+        shuffle (str): Blosc shuffle filter, when the cube is created.
+        threads (Optional[int]): Number of threads compressing and writing
+            chunks. Defaults to the number of CPUs.
+        max_memory (Optional[int]): Memory budget of the chunks in flight in
+            bytes.
+        storage_options (Optional[Dict[str, Any]]): fsspec storage options of
+            the Zarr cube.
+
+    Returns:
+        int: The time index of the appended year.
+    """
+    zarr = import_zarr()
+    store = zarr.storage.FSStore(cube_href, **(storage_options or {}))
+    root = zarr.open_group(store, mode="a")
+    with Dataset(nc_path, "r", format="NETCDF4") as dataset:
+        dataset.set_auto_maskandscale(False)
+        if "time" not in root:
+            if variables is None:
+                variables = constants.CUBE_VARIABLES
+            if chunks is None:
+                chunks = constants.CUBE_CHUNKS
+            if time_chunk < 1:
+                raise ValueError(f"Time chunk must be positive, got '{time_chunk}'.")
+            _create_cube(
+                root,
+                dataset,
+                variables,
+                chunks,
+                time_chunk,
+                create_codec(compressor, clevel, shuffle),
+            )
+        cube_variables = root.attrs["variables"]
+        if variables is not None and list(variables) != cube_variables:
+            raise ValueError(
+                f"Variables {list(variables)} don't match the variables of the cube "
+                f"{cube_variables}."
+            )
+        _check_grid(root, dataset)
+
+        time = root["time"]
+        index = int(time.shape[0])
+        value = dataset.variables["time"][0].item()
+        if index and value <= time[index - 1]:
+            raise ValueError(
+                f"Time '{value}' of {nc_path} must be later than the last time of "
+                f"the cube '{time[index - 1]}'."
+            )
+
+        # Chunks holding only the fill value are not written, an option that
+        # isn't stored with the arrays
+        arrays = {
+            name: zarr.open_array(store, mode="r+", path=name, write_empty_chunks=False)
+            for name in cube_variables
+        }
+        for array in arrays.values():
+            array.resize((index + 1,) + array.shape[1:])
+        copy_data(dataset, arrays, index, threads, max_memory)
+
+        years = dict(root.attrs["years"])
+        years[str(value)] = {
+            name: to_json(dataset.getncattr(name))
+            for name in YEARLY_ATTRIBUTES
+            if name in dataset.ncattrs()
+        }
+        root.attrs["years"] = years
+        time.append([value])
+
+    zarr.consolidate_metadata(store)
+    logger.info(f"Appended {nc_path} to {cube_href} at time index {index}")
+    return index
+
+
+def read_cube(
+    cube_href: str, storage_options: Optional[Dict[str, Any]] = None
+) -> Tuple[List[str], List[int]]:
+    """Reads the data variables and the time coordinate of a Zarr cube.
+
+    Requires the optional ``zarr`` dependency.
+
+    Args:
+        cube_href (str): HREF of the Zarr cube.
+        storage_options (Optional[Dict[str, Any]]): fsspec storage options of
+            the Zarr cube.
+
+    Returns:
+        Tuple[List[str], List[int]]: The data variables, and the time values
+            in days since 1970-01-01.
+    """
+    zarr = import_zarr()
+    store = zarr.storage.FSStore(cube_href, **(storage_options or {}))
+    root = zarr.open_consolidated(store, mode="r")
+    variables: List[str] = root.attrs["variables"]
+    times: List[int] = root["time"][...].tolist()
+    return variables, times
+
+
+def _create_cube(
+    root: Any,
+    dataset: Dataset,
+    variables: List[str],
+    chunks: List[int],
+    time_chunk: int,
+    codec: Any,
+) -> None:
+    unknown = set(variables) - set(constants.DATA_VARIABLES)
+    if unknown:
+        raise ValueError(
+            f"Invalid variables {sorted(unknown)}. Valid variables are "
+            f"{', '.join(constants.DATA_VARIABLES)}."
+        )
+    if len(chunks) != 2 or min(chunks) < 1:
+        raise ValueError(f"Chunks must be a positive height and width, got {chunks}.")
+    root.attrs.update(
+        {
+            name: to_json(dataset.getncattr(name))
+            for name in dataset.ncattrs()
+            if name not in YEARLY_ATTRIBUTES
+        }
+    )
+    root.attrs["variables"] = list(variables)
+    root.attrs["years"] = {}
+    for name in COORDINATE_VARIABLES:
+        if name != "time" and name in dataset.variables:
+            variable = dataset.variables[name]
+            array = create_array(root, variable, chunks, codec)
+            array[...] = variable[...]
+    for name in variables:
+        create_array(
+            root, dataset.variables[name], chunks, codec, time_chunk, time_size=0
+        )
+    # The time coordinate marks a complete cube, so it is created last
+    create_array(
+        root, dataset.variables["time"], chunks, codec, time_chunk, time_size=0
+    )
+    logger.info(f"Created cube of {', '.join(variables)}")
+
+
+def _check_grid(root: Any, dataset: Dataset) -> None:
+    for name in ["lat", "lon"]:
+        size = dataset.dimensions[name].size
+        if root[name].shape[0] != size:
+            raise ValueError(
+                f"Dimension '{name}' of size {size} doesn't match the cube's "
+                f"size {root[name].shape[0]}."
+            )
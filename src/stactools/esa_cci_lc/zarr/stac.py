@@ -0,0 +1,122 @@
+from typing import List, Optional
+
+from pystac import Asset, Item
+
+from .. import constants
+from ..netcdf import stac as netcdf_stac
+from ..netcdf.header import HeaderCache
+from ..netcdf.references import COORDINATE_VARIABLES
+from .convert import create_asset
+from .cube import read_cube
+
+
+def create_item(
+    nc_href: str,
+    zarr_href: str,
+    header_cache: Optional[HeaderCache] = None,
+    variables: Optional[List[str]] = None,
+) -> Item:
+    """Creates a STAC Item for a Zarr store converted from a NetCDF file.
+
+    The Item has the properties of the NetCDF file's Item, and the Zarr Asset
+    has the same datacube metadata as the NetCDF Asset, limited to the
+    variables in the store.
+
+    Args:
+        nc_href (str): HREF to the NetCDF file the store was converted from.
+        zarr_href (str): HREF of the Zarr store.
+        header_cache (Optional[HeaderCache]): Optional cache of NetCDF headers.
+        variables (Optional[List[str]]): Data variables in the store. Defaults
+            to ``constants.DATA_VARIABLES``.
+
+    Returns:
+        Item: A STAC Item describing a Zarr store.
+    """
+    if variables is None:
+        variables = constants.DATA_VARIABLES
+    item = netcdf_stac.create_item(nc_href, header_cache)
+    netcdf_asset = item.assets.pop(constants.NETCDF_KEY)
+
+    names = set(variables + COORDINATE_VARIABLES)
+    cube_variables = {
+        name: variable
+        for name, variable in netcdf_asset.extra_fields["cube:variables"].items()
+        if name in names
+    }
+    dimensions = {
+        dimension
+        for variable in cube_variables.values()
+        for dimension in variable["dimensions"]
+    }
+    asset_dict = create_asset(zarr_href)
+    asset_dict["cube:dimensions"] = {
+        name: dimension
+        for name, dimension in netcdf_asset.extra_fields["cube:dimensions"].items()
+        if name in dimensions
+    }
+    asset_dict["cube:variables"] = cube_variables
+    asset = Asset.from_dict(asset_dict)
+    item.add_asset(constants.ZARR_KEY, asset)
+
+    return item
+
+
+def create_cube_item(
+    nc_href: str,
+    cube_href: str,
+    item: Optional[Item] = None,
+    header_cache: Optional[HeaderCache] = None,
+) -> Item:
+    """Creates or updates the STAC Item of a multi-year Zarr cube after a
+    year has been appended.
+
+    A new Item is created from the appended NetCDF file. An existing Item is
+    updated in place: the values of its datacube time dimension are replaced
+    by the time coordinate of the cube, in days since 1970-01-01 like in the
+    NetCDF files, and its time range, title and versions are extended by the
+    appended year.
+
+    Args:
+        nc_href (str): HREF to the NetCDF file that was appended.
+        cube_href (str): HREF of the Zarr cube.
+        item (Optional[Item]): The existing Item of the cube, if any.
+        header_cache (Optional[HeaderCache]): Optional cache of NetCDF headers.
+
+    Returns:
+        Item: A STAC Item describing the Zarr cube.
+    """
+    variables, times = read_cube(cube_href)
+    year_item = create_item(nc_href, cube_href, header_cache, variables)
+    if item is None:
+        item = year_item
+        item.id = constants.CUBE_ID
+        item.properties["esa_cci_lc:version"] = [
+            year_item.properties["esa_cci_lc:version"]
+        ]
+    else:
+        properties = item.properties
+        year_properties = year_item.properties
+        properties["start_datetime"] = min(
+            properties["start_datetime"], year_properties["start_datetime"]
+        )
+        properties["end_datetime"] = max(
+            properties["end_datetime"], year_properties["end_datetime"]
+        )
+        properties["esa_cci_lc:version"] = sorted(
+            set(properties["esa_cci_lc:version"])
+            | {year_properties["esa_cci_lc:version"]}
+        )
+        item.common_metadata.updated = year_item.common_metadata.created
+
+    start = item.properties["start_datetime"][0:4]
+    end = item.properties["end_datetime"][0:4]
+    item.common_metadata.title = f"ESA CCI Land Cover Maps for {start}-{end}"
+
+    time_dimension = item.assets[constants.ZARR_KEY].extra_fields["cube:dimensions"][
+        "time"
+    ]
+    time_dimension.pop("extent", None)
+    time_dimension.pop("step", None)
+    time_dimension["values"] = times
+
+    return item
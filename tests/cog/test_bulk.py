@@ -0,0 +1,105 @@
+import json
+from typing import Any, Dict, cast
+
+import pytest
+from pystac import Item
+
+from stactools.esa_cci_lc import constants
+from stactools.esa_cci_lc.cog import bulk, stac
+from stactools.esa_cci_lc.cog.statistics import BandStatistics
+
+COG_HREFS = [
+    f"/data/C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-S45E090-{variable}.tif"
+    for variable in constants.DATA_VARIABLES
+]
+STATISTICS = {
+    "lccs_class": BandStatistics(10.0, 210.0, 80.5, 95.0, {0: 5, 10: 60, 210: 35}),
+    "processed_flag": BandStatistics(0.0, 1.0, 0.75, 50.0, {0: 1, 1: 3, 255: 4}),
+    "observation_count": BandStatistics(2.0, 40.0, 12.5, 100.0),
+}
+CASES = [
+    {},
+    {"nc_api_url": "https://example.com/collections/esa-cci-lc-netcdf/items/"},
+    {"statistics": STATISTICS},
+    {"preview_hrefs": {"thumbnail": "/data/thumbnail.png"}},
+    {
+        "nc_api_url": "https://example.com/items/",
+        "statistics": STATISTICS,
+        "preview_hrefs": {
+            "thumbnail": "/data/thumbnail.png",
+            "preview": "/data/preview.png",
+        },
+    },
+]
+
+
+def as_serialized(d: Dict[str, Any]) -> Dict[str, Any]:
+    # As serialized, e.g., geometry coordinates are lists
+    d = cast(Dict[str, Any], json.loads(json.dumps(d)))
+    assert d["properties"].pop("created")
+    return d
+
+
+@pytest.mark.parametrize("kwargs", CASES)
+def test_item_conformance(kwargs: Dict[str, Any]) -> None:
+    d = as_serialized(
+        bulk.get_item_dict_factory().create_item_dict(
+            COG_HREFS, cog_tile_dim=16200, **kwargs
+        )
+    )
+    item = stac.create_item_from_asset_list(COG_HREFS, cog_tile_dim=16200, **kwargs)
+    expected = as_serialized(
+        item.to_dict(include_self_link=False, transform_hrefs=False)
+    )
+    assert d == expected
+    # Same key order, so the serialized Items are identical
+    assert json.dumps(d) == json.dumps(expected)
+
+    assert d["id"] == "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-S45E090"
+    assert d["bbox"] == [90.0, -45.0, 135.0, 0.0]
+    assert d["stac_extensions"][1:] == [
+        constants.CLASSIFICATION_EXTENSION,
+        constants.RASTER_EXTENSION,
+    ]
+    assert set(d["assets"]) == set(constants.DATA_VARIABLES) | set(
+        kwargs.get("preview_hrefs", {})
+    )
+    assert len(d["links"]) == ("nc_api_url" in kwargs)
+    assert Item.from_dict(d).properties["proj:shape"] == [16200, 16200]
+
+    lccs_class = d["assets"]["lccs_class"]
+    band = lccs_class["raster:bands"][0]
+    if "statistics" in kwargs:
+        assert band["statistics"]["mean"] == 80.5
+        counts = {c["value"]: c["count"] for c in lccs_class["classification:classes"]}
+        assert counts[10] == 60
+        assert counts[11] == 0
+    else:
+        assert "statistics" not in band
+        assert "count" not in lccs_class["classification:classes"][0]
+
+
+def test_item_dict_templates_not_modified() -> None:
+    factory = bulk.get_item_dict_factory()
+    assert bulk.get_item_dict_factory() is factory
+    factory.create_item_dict(COG_HREFS, cog_tile_dim=16200, statistics=STATISTICS)
+    d = factory.create_item_dict(COG_HREFS, cog_tile_dim=16200)
+    band = d["assets"]["lccs_class"]["raster:bands"][0]
+    assert "statistics" not in band
+    assert factory.assets["lccs_class"]["href"] == ""
+
+
+def test_iter_item_dicts_from_cogs() -> None:
+    cog_hrefs = COG_HREFS + [
+        href.replace("S45E090", "N45W180").replace("2018", "2019") for href in COG_HREFS
+    ]
+    items = list(stac.iter_items_from_cogs(cog_hrefs, cog_tile_dim=16200, threads=2))
+    item_dicts = list(
+        bulk.iter_item_dicts_from_cogs(cog_hrefs, cog_tile_dim=16200, threads=2)
+    )
+    assert len(item_dicts) == len(items) == 2
+    for item, d in zip(items, item_dicts):
+        expected = item.to_dict(include_self_link=False, transform_hrefs=False)
+        for properties in [expected["properties"], d["properties"]]:
+            properties.pop("created")
+        assert json.loads(json.dumps(d)) == json.loads(json.dumps(expected))
@@ -0,0 +1,128 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.windows import Window
+
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
+from stactools.esa_cci_lc.cog.cog import (
+    _get_strips,
+    _is_constant,
+    _read_strips,
+    iter_cog_tiles,
+    make_cog_tiles,
+)
+from tests import test_data
+
+
+def test_get_strips() -> None:
+    strips = list(_get_strips(Window(0, 100, 10, 250), 128))
+    assert strips == [
+        Window(0, 100, 10, 28),
+        Window(0, 128, 10, 128),
+        Window(0, 256, 10, 94),
+    ]
+
+
+def test_make_cog_tiles_strip_height() -> None:
+    nc_filename = "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.nc"
+    nc_path = test_data.get_external_data(nc_filename)
+    with TemporaryDirectory() as chunk_dir, TemporaryDirectory() as strip_dir:
+        chunk_cogs = make_cog_tiles(nc_path, chunk_dir, 4050, [0, 1])[0]
+        strip_cogs = make_cog_tiles(nc_path, strip_dir, 4050, [0, 1], strip_height=700)[
+            0
+        ]
+        assert len(list(Path(strip_dir).glob("*.tif"))) == 5
+
+        for chunk_cog, strip_cog in zip(chunk_cogs, strip_cogs):
+            with rasterio.open(chunk_cog) as expected, rasterio.open(
+                strip_cog
+            ) as actual:
+                assert actual.profile == expected.profile
+                assert (actual.read() == expected.read()).all()
+
+
+def test_is_constant() -> None:
+    data = np.full((300, 300), 210, dtype=np.uint8)
+    assert _is_constant(data, 210)
+    assert not _is_constant(data, 0)
+    data[299, 299] = 0
+    assert not _is_constant(data, 210)
+
+
+def test_make_cog_tiles_compact() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        nc_path = write_synthetic_netcdf(tmp_dir, scale=0.001)
+        cog_paths = {}
+        for constant_tiles in ["encode", "compact"]:
+            cog_dir = Path(tmp_dir, constant_tiles)
+            cog_dir.mkdir()
+            # The second tile is outside of the filled area
+            cog_paths[constant_tiles] = make_cog_tiles(
+                str(nc_path), str(cog_dir), 2025, [1, 0], constant_tiles=constant_tiles
+            )[0]
+
+        for encoded, compact in zip(cog_paths["encode"], cog_paths["compact"]):
+            with rasterio.open(encoded) as expected, rasterio.open(compact) as actual:
+                data = actual.read(1)
+                assert (data == data[0, 0]).all()
+                assert (data == expected.read(1)).all()
+                assert len(actual.overviews(1)) <= 1
+                assert len(actual.overviews(1)) < len(expected.overviews(1))
+            assert Path(compact).stat().st_size < Path(encoded).stat().st_size
+
+
+def test_make_cog_tiles_invalid_constant_tiles() -> None:
+    with pytest.raises(ValueError):
+        make_cog_tiles("unused.nc", "unused", 4050, [0, 0], constant_tiles="drop")
+
+
+def test_iter_cog_tiles_queue_depth() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        nc_path = write_synthetic_netcdf(tmp_dir, scale=0.001)
+        cog_tiles = {}
+        for queue_depth in [0, 2]:
+            cog_dir = Path(tmp_dir, str(queue_depth))
+            cog_dir.mkdir()
+            cog_tiles[queue_depth] = list(
+                iter_cog_tiles(
+                    str(nc_path),
+                    str(cog_dir),
+                    2025,
+                    [0, 0],
+                    strip_height=500,
+                    queue_depth=queue_depth,
+                )
+            )
+            # Scratch files are removed once their COG is encoded
+            assert len(list(cog_dir.glob(".*.tif"))) == 0
+
+        expected, actual = cog_tiles[0], cog_tiles[2]
+        assert len(actual) == len(expected) == 1
+        assert actual[0].statistics == expected[0].statistics
+        for expected_cog, actual_cog in zip(expected[0].hrefs, actual[0].hrefs):
+            with rasterio.open(expected_cog) as e, rasterio.open(actual_cog) as a:
+                assert a.profile == e.profile
+                assert (a.read() == e.read()).all()
+
+
+def test_read_strips_error() -> None:
+    class FailingSource:
+        dtypes = ["uint8"]
+
+        def read(self, *args, **kwargs):  # type: ignore
+            raise OSError("read failed")
+
+    sources = {constants.PREVIEW_VARIABLE: FailingSource()}
+    reads = [(sources, Window(0, 0, 10, 10))]
+    strips = _read_strips(reads, 5, queue_depth=2)
+    with pytest.raises(OSError, match="read failed"):
+        next(strips)
+
+
+def test_make_cog_tiles_invalid_queue_depth() -> None:
+    with pytest.raises(ValueError):
+        make_cog_tiles("unused.nc", "unused", 4050, [0, 0], queue_depth=-1)
@@ -1,4 +1,5 @@
 import glob
+import json
 import os
 from tempfile import TemporaryDirectory
 from typing import Callable, List
@@ -7,6 +8,9 @@ import pystac
 from click import Command, Group
 from stactools.testing.cli_test import CliTestCase
 
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
+from stactools.esa_cci_lc.cog.manifest import TilingManifest
 from stactools.esa_cci_lc.commands import create_esaccilc_command
 from tests import test_data
 
@@ -26,7 +30,11 @@ class CommandsTest(CliTestCase):
             )
             assert result.exit_code == 0, "\n{}".format(result.output)
 
-            jsons = [p for p in os.listdir(tmp_dir) if p.endswith(".json")]
+            jsons = [
+                p
+                for p in os.listdir(tmp_dir)
+                if p.endswith(".json") and not p.endswith("-manifest.json")
+            ]
             assert len(jsons) == 1
             item = pystac.read_file(os.path.join(tmp_dir, jsons[0]))
 
@@ -34,6 +42,134 @@ class CommandsTest(CliTestCase):
 
             item.validate()
 
+    def test_create_cog_items_skip_constant_tiles(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            nc_path = str(write_synthetic_netcdf(tmp_dir, scale=0.001))
+            cog_dir = os.path.join(tmp_dir, "cogs")
+
+            # A filled tile and a tile outside of the filled area, which only
+            # holds fill values
+            result = self.run_command(
+                f"esa-cci-lc cog create-items {nc_path} {cog_dir} "
+                f"--cog_tile_dim 2025 --bbox -180 85 -170 90 --constant-tiles skip"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            items = [
+                p
+                for p in os.listdir(cog_dir)
+                if p.endswith(".json") and not p.endswith("-manifest.json")
+            ]
+            assert [item[-12:] for item in items] == ["N84W180.json"]
+            assert len(glob.glob(f"{cog_dir}/*-N84W180-*.tif")) == 5
+            assert glob.glob(f"{cog_dir}/*-N84W174-*") == []
+
+            manifest = TilingManifest.for_source(nc_path, cog_dir, 2025)
+            assert list(manifest.skipped) == ["N84W174"]
+            assert manifest.skipped["N84W174"]["lccs_class"] == 0
+            assert list(manifest.completed) == ["N84W180"]
+
+    def test_create_cog_items_bbox_and_aoi(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            nc_path = str(write_synthetic_netcdf(tmp_dir, scale=0.001))
+            aoi_path = os.path.join(tmp_dir, "aoi.geojson")
+            with open(aoi_path, "w") as f:
+                # The bounds cover four tiles, but the triangle misses the
+                # lower right one
+                coordinates = [[-179, 80], [-179, 89], [-172, 89], [-179, 80]]
+                json.dump({"type": "Polygon", "coordinates": [coordinates]}, f)
+
+            for name, option, expected in [
+                # Crossing the antimeridian
+                ("bbox", "--bbox 175 85 -175 90", ["N84E174", "N84W180"]),
+                ("aoi", f"--aoi {aoi_path}", ["N79W180", "N84W174", "N84W180"]),
+            ]:
+                cog_dir = os.path.join(tmp_dir, name)
+                result = self.run_command(
+                    f"esa-cci-lc cog create-items {nc_path} {cog_dir} "
+                    f"--cog_tile_dim 2025 {option}"
+                )
+                assert result.exit_code == 0, "\n{}".format(result.output)
+
+                items = [
+                    pystac.Item.from_file(path)
+                    for path in glob.glob(os.path.join(cog_dir, "*.json"))
+                    if not path.endswith("-manifest.json")
+                ]
+                tiles = sorted(item.properties["esa_cci_lc:tile"] for item in items)
+                assert tiles == expected
+
+    def test_create_cog_items_batch(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            nc_paths = [
+                test_data.get_external_data(nc_filename)
+                for nc_filename in [
+                    "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.nc",
+                    "ESACCI-LC-L4-LCCS-Map-300m-P1Y-2008-v2.0.7cds.nc",
+                ]
+            ]
+            nc_dir = os.path.dirname(nc_paths[0])
+
+            result = self.run_command(
+                f"esa-cci-lc cog create-items-batch {nc_dir} {tmp_dir} "
+                f"--cog_tile_dim 4050 --tile_col_row 1 1"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            item_collection = pystac.ItemCollection.from_file(
+                os.path.join(tmp_dir, "items.json")
+            )
+            assert len(item_collection.items) == len(
+                glob.glob(os.path.join(nc_dir, "*.nc"))
+            )
+            assert len(glob.glob(f"{tmp_dir}/*.tif")) == 5 * len(item_collection.items)
+            for item in item_collection.items:
+                item.validate()
+
+    def test_create_cog_items_from_cogs(self) -> None:
+        with TemporaryDirectory() as tmp_dir:
+            listing = os.path.join(tmp_dir, "cogs.txt")
+            with open(listing, "w") as f:
+                for tile in ["N45W180", "S45E090"]:
+                    for variable in constants.DATA_VARIABLES:
+                        f.write(
+                            "https://example.com/cogs/C3S-LC-L4-LCCS-Map-300m-P1Y-"
+                            f"2018-v2.1.1-{tile}-{variable}.tif\n"
+                        )
+                # The COGs of an incomplete tile are skipped
+                f.write(
+                    "https://example.com/cogs/C3S-LC-L4-LCCS-Map-300m-P1Y-"
+                    "2018-v2.1.1-N00E000-lccs_class.tif\n"
+                )
+
+            # With a tile dimension, no COG is read
+            result = self.run_command(
+                f"esa-cci-lc cog create-items-from-cogs {listing} {tmp_dir} "
+                "--listing --cog_tile_dim 16200 --threads 2"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            items = sorted(glob.glob(os.path.join(tmp_dir, "*.json")))
+            assert [os.path.basename(item) for item in items] == [
+                "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-N45W180.json",
+                "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-S45E090.json",
+            ]
+            item = pystac.Item.from_file(items[1])
+            assert item.bbox == [90.0, -45.0, 135.0, 0.0]
+            assert item.assets["lccs_class"].href.startswith("https://example.com/")
+
+            result = self.run_command(
+                f"esa-cci-lc cog create-items-from-cogs {listing} {tmp_dir} "
+                "--listing --cog_tile_dim 16200 --output-format ndjson"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+            with open(os.path.join(tmp_dir, "items.ndjson")) as f:
+                ids = [json.loads(line)["id"] for line in f]
+            assert ids == [
+                "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-N45W180",
+                "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-S45E090",
+            ]
+
     def test_create_cog_collection(self) -> None:
         with TemporaryDirectory() as tmp_dir:
             result = self.run_command(
@@ -0,0 +1,90 @@
+import pytest
+from rasterio.windows import Window
+
+from stactools.esa_cci_lc.cog.cog import get_windows
+from stactools.esa_cci_lc.cog.grid import TileGrid, geometry_from_geojson
+
+
+def test_tile_grid() -> None:
+    grid = TileGrid(16200)
+    assert (grid.num_cols, grid.num_rows) == (8, 4)
+    assert len(grid) == 32
+    assert list(grid)[:2] == [(0, 0), (0, 1)]
+
+    assert grid.tile_id(0, 0) == "N45W180"
+    assert grid.tile_id(7, 3) == "S90E135"
+    assert grid.window(1, 2) == Window(16200, 32400, 16200, 16200)
+    assert grid.bounds(1, 2) == (-135.0, -45.0, -90.0, 0.0)
+    transform = grid.transform(1, 2)
+    assert (transform.c, transform.f) == pytest.approx((-135.0, 0.0))
+    assert transform.a == pytest.approx(1 / 360)
+
+    with pytest.raises(ValueError):
+        grid.tile_id(8, 0)
+    with pytest.raises(ValueError):
+        TileGrid(1000)
+
+
+@pytest.mark.parametrize("tile_dim", [4050, 16200, 32400])
+def test_tile_id_round_trip(tile_dim: int) -> None:
+    grid = TileGrid(tile_dim)
+    for col, row in grid:
+        assert grid.col_row(grid.tile_id(col, row)) == (col, row)
+    with pytest.raises(ValueError):
+        grid.col_row("N01E001")
+    with pytest.raises(ValueError):
+        grid.col_row("not-a-tile")
+
+
+def test_intersecting() -> None:
+    grid = TileGrid(16200)
+    assert grid.intersecting() == list(grid)
+    # Tiles touching the bbox along an edge are not included
+    assert grid.intersecting([-135, -45, -90, 0]) == [(1, 2)]
+    assert grid.intersecting([-100, -10, -80, 10]) == [(1, 1), (1, 2), (2, 1), (2, 2)]
+    # Crossing the antimeridian
+    assert grid.intersecting([170, 50, -170, 60]) == [(0, 0), (7, 0)]
+    assert grid.intersecting([200, 0, 210, 10]) == []
+    with pytest.raises(ValueError):
+        grid.intersecting([0, 10, 1, 0])
+
+
+def test_intersecting_geometry() -> None:
+    grid = TileGrid(16200)
+    # A triangle whose bounds cover four tiles, but which misses the upper
+    # right one
+    triangle = geometry_from_geojson(
+        {
+            "type": "FeatureCollection",
+            "features": [
+                {
+                    "type": "Feature",
+                    "properties": {},
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [
+                            [[-100, -10], [-80, -10], [-100, 10], [-100, -10]]
+                        ],
+                    },
+                }
+            ],
+        }
+    )
+    assert grid.intersecting(geometry=triangle) == [(1, 1), (1, 2), (2, 2)]
+    point = geometry_from_geojson({"type": "Point", "coordinates": [10, 10]})
+    assert grid.intersecting(geometry=point) == [(4, 1)]
+    assert grid.intersecting([-180, -90, -90, 90], triangle) == [(1, 1), (1, 2)]
+
+
+def test_get_windows_bbox() -> None:
+    windows = get_windows(16200, bbox=[-100, -10, -80, 10])
+    assert [window["tile"] for window in windows] == [
+        "N00W135",
+        "S45W135",
+        "N00W090",
+        "S45W090",
+    ]
+    with pytest.raises(ValueError):
+        get_windows(16200, [0, 0], bbox=[-100, -10, -80, 10])
+    with pytest.raises(ValueError):
+        get_windows(16200, bbox=[200, 0, 210, 10])
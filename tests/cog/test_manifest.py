@@ -0,0 +1,86 @@
+import os
+from tempfile import TemporaryDirectory
+
+from stactools.esa_cci_lc.cog.manifest import CogRecord, TilingManifest
+from stactools.esa_cci_lc.cog.statistics import BandStatistics
+
+
+def test_skipped_roundtrip() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        manifest = TilingManifest.for_source("/data/ESACCI-LC-2008.nc", tmp_dir)
+        assert manifest.path.endswith("ESACCI-LC-2008-manifest.json")
+        manifest.skip("S90W180", {"lccs_class": 220, "processed_flag": 1})
+        manifest.skip("S90W169", {"lccs_class": 220, "processed_flag": 1})
+        manifest.unskip("S90W169")
+        manifest.save()
+
+        loaded = TilingManifest.for_source("/data/ESACCI-LC-2008.nc", tmp_dir)
+        assert loaded.skipped == {"S90W180": {"lccs_class": 220, "processed_flag": 1}}
+
+
+def test_completed_roundtrip() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        cog_path = os.path.join(tmp_dir, "ESACCI-LC-2008-N90W180-lccs_class.tif")
+        with open(cog_path, "wb") as f:
+            f.write(b"cog data")
+
+        manifest = TilingManifest.for_source("ESACCI-LC-2008.nc", tmp_dir, 4050)
+        assert not manifest.is_complete("N90W180", "lccs_class", cog_path)
+        manifest.complete("N90W180", "lccs_class", CogRecord.from_file(cog_path))
+        manifest.save()
+
+        loaded = TilingManifest.for_source("ESACCI-LC-2008.nc", tmp_dir, 4050)
+        assert loaded.completed["N90W180"]["lccs_class"].size == 8
+        assert loaded.is_complete("N90W180", "lccs_class", cog_path)
+        assert not loaded.is_complete("N90W180", "change_count", cog_path)
+
+
+def test_is_complete_detects_modified_files() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        cog_path = os.path.join(tmp_dir, "ESACCI-LC-2008-N90W180-lccs_class.tif")
+        with open(cog_path, "wb") as f:
+            f.write(b"cog data")
+        manifest = TilingManifest.for_source("ESACCI-LC-2008.nc", tmp_dir, 4050)
+        manifest.complete("N90W180", "lccs_class", CogRecord.from_file(cog_path))
+
+        # Truncated
+        with open(cog_path, "wb") as f:
+            f.write(b"cog")
+        assert not manifest.is_complete("N90W180", "lccs_class", cog_path)
+
+        # Same size, different content
+        with open(cog_path, "wb") as f:
+            f.write(b"COG DATA")
+        assert not manifest.is_complete("N90W180", "lccs_class", cog_path)
+
+        os.remove(cog_path)
+        assert not manifest.is_complete("N90W180", "lccs_class", cog_path)
+
+
+def test_different_tile_dim_discards_records() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        manifest = TilingManifest.for_source("ESACCI-LC-2008.nc", tmp_dir, 4050)
+        manifest.complete("N90W180", "lccs_class", CogRecord(8, "sha256:0"))
+        manifest.skip("S90W180", {"lccs_class": 220})
+        manifest.save()
+
+        loaded = TilingManifest.for_source("ESACCI-LC-2008.nc", tmp_dir, 16200)
+        assert loaded.completed == {}
+        assert loaded.skipped == {}
+        assert loaded.tile_dim == 16200
+
+
+def test_statistics_roundtrip() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        statistics = BandStatistics(1.0, 2.0, 1.5, 50.0, {1: 2, 2: 2, 255: 4})
+        manifest = TilingManifest.for_source("ESACCI-LC-2008.nc", tmp_dir, 4050)
+        manifest.complete(
+            "N90W180", "processed_flag", CogRecord(8, "sha256:0"), statistics
+        )
+        manifest.save()
+
+        loaded = TilingManifest.for_source("ESACCI-LC-2008.nc", tmp_dir, 4050)
+        assert loaded.statistics == {"N90W180": {"processed_flag": statistics}}
+
+        loaded.skip("N90W180", {"processed_flag": 1})
+        assert loaded.statistics == {}
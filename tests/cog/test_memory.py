@@ -0,0 +1,84 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Any, List
+
+import pytest
+import rasterio
+
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc.cog import cog
+from stactools.esa_cci_lc.cog.memory import MemoryPlan, plan_memory
+from stactools.esa_cci_lc.memory import parse_memory
+
+
+def test_plan_memory() -> None:
+    windows = [[16200, 16200]] * 32
+
+    plan = plan_memory(parse_memory("4GiB"), windows, workers=32)
+    assert 1 < plan.workers < 32
+    assert plan.strip_height == 2025
+    assert plan.tiles_in_flight > 1
+
+    plan = plan_memory(parse_memory("64GiB"), windows, workers=32)
+    assert plan.workers == 32
+    assert plan.strip_height % 2025 == 0
+
+    plan = plan_memory(parse_memory("600MB"), windows, workers=4)
+    assert plan.workers == 1
+    assert 0 < plan.strip_height < 2025
+    assert plan.tiles_in_flight == 1
+
+
+def test_plan_memory_too_small() -> None:
+    with pytest.raises(ValueError):
+        plan_memory(parse_memory("256MiB"), [[16200, 16200]])
+
+
+@pytest.mark.parametrize(
+    "workers, max_memory, strip_height, tiles_in_flight",
+    [(1, "500MiB", 949, 1), (2, "2GiB", 2025, 2)],
+)
+def test_iter_cog_tiles_max_memory(
+    monkeypatch: pytest.MonkeyPatch,
+    workers: int,
+    max_memory: str,
+    strip_height: int,
+    tiles_in_flight: int,
+) -> None:
+    plans: List[MemoryPlan] = []
+
+    def spy(*args: Any, **kwargs: Any) -> MemoryPlan:
+        plans.append(plan_memory(*args, **kwargs))
+        return plans[-1]
+
+    monkeypatch.setattr(cog, "plan_memory", spy)
+    with TemporaryDirectory() as tmp_dir:
+        nc_path = str(write_synthetic_netcdf(tmp_dir, scale=0.001))
+        cog_tiles = {}
+        for budget in [None, parse_memory(max_memory)]:
+            cog_dir = Path(tmp_dir, str(budget))
+            cog_dir.mkdir()
+            cog_tiles[budget] = list(
+                cog.iter_cog_tiles(
+                    nc_path,
+                    str(cog_dir),
+                    2025,
+                    bbox=[-180, 85, -170, 90],
+                    workers=workers,
+                    max_memory=budget,
+                )
+            )
+
+        assert len(plans) == 1
+        assert plans[0].workers == workers
+        assert plans[0].strip_height == strip_height
+        assert plans[0].tiles_in_flight == tiles_in_flight
+
+        expected, actual = cog_tiles.values()
+        assert [t.tile for t in actual] == [t.tile for t in expected]
+        for expected_tile, actual_tile in zip(expected, actual):
+            assert actual_tile.statistics == expected_tile.statistics
+            for expected_cog, actual_cog in zip(expected_tile.hrefs, actual_tile.hrefs):
+                with rasterio.open(expected_cog) as e, rasterio.open(actual_cog) as a:
+                    assert a.profile == e.profile
+                    assert (a.read() == e.read()).all()
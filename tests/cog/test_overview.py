@@ -0,0 +1,113 @@
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+
+from stactools.esa_cci_lc.cog import stac
+from stactools.esa_cci_lc.cog.overview import (
+    OVERVIEW_RESAMPLING,
+    _block_average,
+    _block_mode,
+    _block_size,
+    _make_overview_cogs,
+    make_overview_cogs,
+    overview_cog_path,
+)
+
+
+def test_block_mode() -> None:
+    data = np.array(
+        [
+            [10, 10, 20, 20],
+            [10, 30, 0, 0],
+            [0, 0, 50, 50],
+            [0, 0, 60, 60],
+        ],
+        dtype=np.uint8,
+    )
+    # Nodata is ignored unless a block holds nothing else, ties resolve to the
+    # smallest value
+    assert _block_mode(data, 2, 0).tolist() == [[10, 20], [0, 50]]
+    assert _block_mode(data, 2, None).tolist() == [[10, 0], [0, 50]]
+
+
+def test_block_average() -> None:
+    data = np.array(
+        [
+            [1, 2, 255, 255],
+            [3, 4, 255, 7],
+        ],
+        dtype=np.uint8,
+    )
+    assert _block_average(data, 2, 255).tolist() == [[2, 7]]
+    assert _block_average(data.astype(np.uint16), 2, None).tolist() == [[2, 193]]
+
+
+def test_overview_resampling() -> None:
+    assert OVERVIEW_RESAMPLING == {
+        "change_count": "average",
+        "current_pixel_state": "mode",
+        "lccs_class": "mode",
+        "observation_count": "average",
+        "processed_flag": "mode",
+    }
+
+
+def test_make_overview_cogs_single_pass() -> None:
+    data = np.random.default_rng(0).choice([10, 20, 0], size=(64, 64)).astype(np.uint8)
+    with TemporaryDirectory() as tmp_dir:
+        src_path = f"{tmp_dir}/source.tif"
+        with rasterio.open(
+            src_path,
+            "w",
+            driver="GTiff",
+            width=64,
+            height=64,
+            count=1,
+            dtype="uint8",
+            crs="EPSG:4326",
+            transform=from_origin(-180, 90, 1, 1),
+        ) as dst:
+            dst.write(data, 1)
+
+        with rasterio.open(src_path) as src:
+            cog_paths = _make_overview_cogs(
+                src, "/data/ESACCI-2018.nc", tmp_dir, "lccs_class", [2, 4]
+            )
+        assert sorted(cog_paths) == [2, 4]
+        for factor, cog_path in cog_paths.items():
+            with rasterio.open(cog_path) as cog:
+                assert cog.shape == (64 // factor, 64 // factor)
+                assert cog.transform.a == factor
+                assert (cog.read(1) == _block_mode(data, factor, 0)).all()
+
+
+def test_block_size() -> None:
+    # Aligned to the 2025 pixel chunks
+    assert _block_size(25, 2) == 2025
+    assert _block_size(4, 1) == 8100
+    # Aligned blocks of 32400 pixels are too large
+    assert _block_size(16, 1) == 2032
+
+
+def test_make_overview_cogs_invalid_factor() -> None:
+    with pytest.raises(ValueError):
+        make_overview_cogs("ESACCI-LC-2008.nc", "cogs", [7])
+
+
+def test_create_overview_asset() -> None:
+    href = overview_cog_path(
+        "/data/C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.nc", "/cogs", 16, "lccs_class"
+    )
+    assert href.endswith(
+        "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-overview_4800m-lccs_class.tif"
+    )
+
+    key, asset = stac.create_overview_asset(href)
+    assert key == "lccs_class_overview_2018_4800m"
+    assert asset.roles is not None
+    assert "overview" in asset.roles
+    assert asset.extra_fields["raster:bands"][0]["spatial_resolution"] == 4800
+    assert "classification:classes" in asset.extra_fields
@@ -0,0 +1,40 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import rasterio
+from rasterio.windows import Window
+
+from stactools.esa_cci_lc.cog.cog import _get_strips
+from stactools.esa_cci_lc.cog.preview import PreviewSampler, preview_paths
+from stactools.esa_cci_lc.cog.transforms import COLORMAP_LUT
+
+
+def test_preview_sampler() -> None:
+    rng = np.random.default_rng(0)
+    window = Window(0, 100, 2500, 2100)
+    data = rng.choice(np.array([0, 10, 210], dtype=np.uint8), (2100, 2500))
+    sampler = PreviewSampler(window, "uint8")
+    assert sampler.step == 3
+    for strip in _get_strips(window, 128):
+        start = strip.row_off - window.row_off
+        end = start + strip.height
+        sampler.add(strip, data[start:end])
+    assert (sampler.sample == data[::3, ::3]).all()
+
+    with TemporaryDirectory() as tmp_dir:
+        paths = preview_paths(
+            str(Path(tmp_dir) / "ESACCI-LC-2008-v2.0.7cds-N90W180-lccs_class.tif")
+        )
+        assert Path(paths["thumbnail"]).name == (
+            "ESACCI-LC-2008-v2.0.7cds-N90W180-thumbnail.png"
+        )
+        sampler.write(paths)
+        with rasterio.open(paths["thumbnail"]) as src:
+            assert src.count == 3
+            assert src.shape == (175, 209)
+            thumbnail = src.read()
+        expected = COLORMAP_LUT[data[::12, ::12], :3]
+        assert (thumbnail == np.moveaxis(expected, -1, 0)).all()
+        with rasterio.open(paths["preview"]) as src:
+            assert src.shape == sampler.sample.shape
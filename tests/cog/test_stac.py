@@ -1,9 +1,19 @@
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import List
 
+import numpy as np
+import pytest
+import rasterio
+from netCDF4 import Dataset
 from pystac import Item
+from rasterio.transform import Affine
 
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
 from stactools.esa_cci_lc.cog import stac
+from stactools.esa_cci_lc.cog.manifest import TilingManifest
+from stactools.esa_cci_lc.cog.statistics import BandStatistics
 from tests import test_data
 
 
@@ -49,6 +59,200 @@ def test_create_items_v20() -> None:
         items[0].validate()
 
 
+def test_create_items_workers() -> None:
+    nc_filename = "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.nc"
+    nc_path = test_data.get_external_data(nc_filename)
+    with TemporaryDirectory() as tmp_dir:
+        items = stac.create_items(
+            nc_path, tmp_dir, cog_tile_dim=4050, tile_col_row=[0, 0], workers=2
+        )
+        assert len(items) == 1
+        cogs = list(Path(tmp_dir).glob("*.tif"))
+        assert len(cogs) == 5
+        assert [Path(asset.href).name for asset in items[0].assets.values()] == [
+            f"C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-N79W180-{variable}.tif"
+            for variable in constants.DATA_VARIABLES
+        ]
+
+        items[0].validate()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_create_items_skip_keeps_constant_variable(workers: int) -> None:
+    with TemporaryDirectory() as tmp_dir:
+        nc_path = write_synthetic_netcdf(tmp_dir, scale=0.001)
+        # The filled tile is kept, but one of its variables is constant
+        with Dataset(nc_path, "a") as dataset:
+            dataset.variables["change_count"][0, :2025, :2025] = 2
+        cog_dir = str(Path(tmp_dir, "cogs"))
+        Path(cog_dir).mkdir()
+
+        mtimes = []
+        for _ in range(2):
+            items = stac.create_items(
+                str(nc_path),
+                cog_dir,
+                cog_tile_dim=2025,
+                tile_col_row=[0, 0],
+                workers=workers,
+                constant_tiles="skip",
+                resume=True,
+            )
+            assert [item.id[-7:] for item in items] == ["N84W180"]
+            manifest = TilingManifest.for_source(str(nc_path), cog_dir, 2025)
+            assert set(manifest.completed["N84W180"]) == set(constants.DATA_VARIABLES)
+            statistics = manifest.statistics["N84W180"]["change_count"]
+            assert statistics.minimum == statistics.maximum == 2
+            href = items[0].assets["change_count"].href
+            mtimes.append(Path(href).stat().st_mtime_ns)
+            # The constant COG is georeferenced like the encoded ones
+            with rasterio.open(href) as constant, rasterio.open(
+                items[0].assets["lccs_class"].href
+            ) as encoded:
+                assert constant.transform.almost_equals(encoded.transform)
+        # Resuming keeps the recorded COG of the constant variable
+        assert mtimes[0] == mtimes[1]
+
+
+def test_iter_items() -> None:
+    nc_filename = "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1.nc"
+    nc_path = test_data.get_external_data(nc_filename)
+    with TemporaryDirectory() as tmp_dir:
+        items = stac.iter_items(
+            nc_path, tmp_dir, cog_tile_dim=4050, tile_col_row=[1, 0]
+        )
+        assert not list(Path(tmp_dir).glob("*.tif"))
+
+        item = next(items)
+        assert item.properties["esa_cci_lc:tile"] == "N79W169"
+        assert len(list(Path(tmp_dir).glob("*.tif"))) == 5
+        assert next(items, None) is None
+
+
 def test_create_collection() -> None:
     collection = stac.create_collection()
     assert collection.id == "esa-cci-lc"
+
+
+def test_create_item_from_asset_list_tile_grid() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        cog_hrefs = [
+            str(
+                Path(tmp_dir)
+                / f"C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-S45E090-{variable}.tif"
+            )
+            for variable in constants.DATA_VARIABLES
+        ]
+        # The COGs are never opened, so they don't need to exist
+        item = stac.create_item_from_asset_list(cog_hrefs, cog_tile_dim=16200)
+        assert item.id == "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-S45E090"
+        assert item.bbox == [90.0, -45.0, 135.0, 0.0]
+        assert item.properties["proj:shape"] == [16200, 16200]
+        assert item.properties["proj:transform"] == [
+            1 / 360,
+            0.0,
+            90.0,
+            0.0,
+            -1 / 360,
+            0.0,
+        ]
+
+        # A COG with the wrong shape fails the verification
+        with rasterio.open(
+            cog_hrefs[0],
+            "w",
+            driver="GTiff",
+            width=10,
+            height=10,
+            count=1,
+            dtype="uint8",
+            crs="EPSG:4326",
+            transform=Affine(4.5, 0, 90, 0, -4.5, 0),
+        ) as dst:
+            dst.write(np.zeros((1, 10, 10), dtype=np.uint8))
+        with pytest.raises(ValueError, match="proj_shape"):
+            stac.create_item_from_asset_list(
+                cog_hrefs, cog_tile_dim=16200, verify_fraction=1
+            )
+
+
+def test_group_cog_hrefs() -> None:
+    cog_hrefs = [
+        f"s3://bucket/C3S-LC-L4-LCCS-Map-300m-P1Y-{year}-v2.1.1-N45W180-{variable}.tif"
+        for variable in reversed(constants.DATA_VARIABLES)
+        for year in [2019, 2018]
+    ]
+    cog_hrefs.append(
+        "s3://bucket/C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-overview_4800m-"
+        "lccs_class.tif"
+    )
+    groups = stac.group_cog_hrefs(cog_hrefs)
+    assert len(groups) == 2
+    assert groups[0] == [
+        f"s3://bucket/C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-N45W180-{variable}.tif"
+        for variable in constants.DATA_VARIABLES
+    ]
+
+    items = stac.create_items_from_cogs(cog_hrefs, cog_tile_dim=16200)
+    assert [item.id for item in items] == [
+        "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-N45W180",
+        "C3S-LC-L4-LCCS-Map-300m-P1Y-2019-v2.1.1-N45W180",
+    ]
+
+
+def test_map_cog_tiles_bounded() -> None:
+    cog_hrefs = [
+        f"s3://bucket/C3S-LC-L4-LCCS-Map-300m-P1Y-{year}-v2.1.1-N45W180-{variable}.tif"
+        for variable in constants.DATA_VARIABLES
+        for year in range(1992, 2021)
+    ]
+    created: List[str] = []
+
+    def create(tile_hrefs: List[str]) -> str:
+        created.append(tile_hrefs[0])
+        return tile_hrefs[0]
+
+    results = stac.map_cog_tiles(create, cog_hrefs, threads=2)
+    first = next(results)
+    # Only a window of tiles is submitted ahead of the yielded result
+    assert len(created) <= 3
+    assert [first, *results] == [group[0] for group in stac.group_cog_hrefs(cog_hrefs)]
+    assert len(created) == 29
+
+
+def test_create_item_from_asset_list_statistics() -> None:
+    cog_hrefs = [
+        f"C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-S45E090-{variable}.tif"
+        for variable in constants.DATA_VARIABLES
+    ]
+    statistics = {
+        "processed_flag": BandStatistics(0.0, 1.0, 0.75, 50.0, {0: 1, 1: 3, 255: 4}),
+        "observation_count": BandStatistics(2.0, 40.0, 12.5, 100.0),
+    }
+    item = stac.create_item_from_asset_list(
+        cog_hrefs,
+        cog_tile_dim=16200,
+        statistics=statistics,
+        preview_hrefs={"thumbnail": "thumbnail.png"},
+    )
+    assert item.assets["thumbnail"].media_type == "image/png"
+    assert "preview" not in item.assets
+
+    processed_flag = item.assets["processed_flag"].extra_fields
+    assert processed_flag["raster:bands"][0]["statistics"] == {
+        "minimum": 0.0,
+        "maximum": 1.0,
+        "mean": 0.75,
+        "valid_percent": 50.0,
+    }
+    assert [c["count"] for c in processed_flag["classification:classes"]] == [1, 3]
+    observation_count = item.assets["observation_count"].extra_fields
+    assert observation_count["raster:bands"][0]["statistics"]["maximum"] == 40.0
+    assert "statistics" not in item.assets["lccs_class"].extra_fields["raster:bands"][0]
+
+
+def test_create_collection_item_assets() -> None:
+    collection = stac.create_collection()
+    item_assets = collection.extra_fields["item_assets"]
+    assert item_assets["thumbnail"]["roles"] == ["thumbnail"]
+    assert item_assets["preview"]["type"] == "image/png"
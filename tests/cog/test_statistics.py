@@ -0,0 +1,51 @@
+import numpy as np
+
+from stactools.esa_cci_lc.cog.statistics import BandStatistics, StatisticsAccumulator
+
+
+def test_classified_statistics() -> None:
+    rng = np.random.default_rng(0)
+    data = rng.choice(np.array([0, 10, 210, 220], dtype=np.uint8), (300, 400))
+    # Odd widths are counted pixel by pixel, even widths in pairs
+    strips = [data[0:100], data[100:300, 0:399]]
+    accumulator = StatisticsAccumulator("uint8", 0, True)
+    for strip in strips:
+        accumulator.add(np.ascontiguousarray(strip))
+    accumulator.add_constant(220, 50)
+    statistics = accumulator.finish()
+
+    values = np.concatenate(
+        [strip.ravel() for strip in strips] + [np.full(50, 220, dtype=np.uint8)]
+    )
+    valid = values[values != 0]
+    assert statistics.minimum == 10
+    assert statistics.maximum == 220
+    assert statistics.mean == valid.mean()
+    assert statistics.valid_percent == 100 * valid.size / values.size
+    assert statistics.class_counts == {
+        int(value): int(count)
+        for value, count in zip(*np.unique(values, return_counts=True))
+    }
+    assert BandStatistics.from_dict(statistics.to_dict()) == statistics
+
+
+def test_unclassified_statistics() -> None:
+    data = np.arange(1000, dtype=np.uint16).reshape(10, 100)
+    accumulator = StatisticsAccumulator("uint16", None, False)
+    accumulator.add(data)
+    statistics = accumulator.finish()
+    assert statistics.to_raster() == {
+        "minimum": 0,
+        "maximum": 999,
+        "mean": 499.5,
+        "valid_percent": 100.0,
+    }
+    assert statistics.class_counts == {}
+
+
+def test_nodata_only_statistics() -> None:
+    accumulator = StatisticsAccumulator("uint8", 255, True)
+    accumulator.add(np.full((4, 4), 255, dtype=np.uint8))
+    statistics = accumulator.finish()
+    assert statistics.to_raster() == {"valid_percent": 0.0}
+    assert statistics.class_counts == {255: 16}
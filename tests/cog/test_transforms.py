@@ -0,0 +1,37 @@
+import numpy as np
+
+from stactools.esa_cci_lc import classes, constants
+from stactools.esa_cci_lc.cog.transforms import COLORMAP, COLORMAP_LUT, TRANSFORMS
+
+
+def test_transforms_registry() -> None:
+    assert list(TRANSFORMS) == constants.DATA_VARIABLES
+    for variable, transform in TRANSFORMS.items():
+        assert transform.dtype == constants.COG_ASSETS[variable]["data_type"]
+        assert transform.nodata == constants.COG_ASSETS[variable].get("nodata")
+    assert TRANSFORMS["lccs_class"].overview_resampling == "mode"
+    assert TRANSFORMS["lccs_class"].colormap
+
+
+def test_flag_lut() -> None:
+    transform = TRANSFORMS["processed_flag"]
+    data = np.array([[-1, 0, 1], [6, 100, -1]], dtype=np.int8)
+    out = np.empty(data.shape, dtype=np.uint8)
+
+    result = transform.apply(data, out=out)
+    assert result is out
+    assert result.tolist() == [[255, 0, 1], [6, 100, 255]]
+
+
+def test_no_lut() -> None:
+    transform = TRANSFORMS["observation_count"]
+    data = np.array([[0, 1000]], dtype=np.uint16)
+    assert transform.apply(data) is data
+
+
+def test_colormap_lut() -> None:
+    assert COLORMAP_LUT.shape == (256, 4)
+    assert COLORMAP_LUT[210].tolist() == [0, 70, 200, 255]
+    assert COLORMAP_LUT[1].tolist() == [0, 0, 0, 0]
+    assert COLORMAP[210] == (0, 70, 200, 255)
+    assert len(COLORMAP) == len(classes.TABLE)
@@ -0,0 +1,58 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc.netcdf import stac
+from stactools.esa_cci_lc.netcdf.header import HeaderCache, NetCDFHeader
+
+
+def test_header_cache() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        nc_path = write_synthetic_netcdf(tmp_dir, scale=0.001)
+        cache = HeaderCache(os.path.join(tmp_dir, "cache"))
+        assert cache.get(nc_path) is None
+
+        header = cache.read(nc_path)
+        assert header == NetCDFHeader.read(nc_path)
+        assert header.attributes["product_version"] == "2.1.1"
+        assert header.dimensions["lat"] == 64800
+
+        # A cached header is used without opening the file
+        with mock.patch.object(NetCDFHeader, "read") as read:
+            assert cache.read(nc_path) == header
+            item = stac.create_item(nc_path, cache)
+            read.assert_not_called()
+        assert item.id == "C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1"
+        assert item.properties["proj:shape"] == [129600, 64800]
+
+        # A modified file is read again
+        os.utime(nc_path, (0, 0))
+        assert cache.get(nc_path) is None
+
+
+def test_header_cache_eviction() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        nc_path = write_synthetic_netcdf(tmp_dir, scale=0.001)
+        header = NetCDFHeader.read(nc_path)
+        cache_dir = os.path.join(tmp_dir, "cache")
+        cache = HeaderCache(cache_dir)
+        hrefs = []
+        for index in range(3):
+            href = os.path.join(tmp_dir, f"{index}.nc")
+            Path(href).write_bytes(b"")
+            cache.put(href, header)
+            os.utime(cache._path(str(cache.key(href))), (index, index))
+            hrefs.append(href)
+        entry_size = os.path.getsize(cache._path(str(cache.key(hrefs[0]))))
+
+        # Room for two entries evicts the least recently used one
+        cache = HeaderCache(cache_dir, max_bytes=2 * entry_size)
+        cache.evict()
+        assert cache.get(hrefs[0]) is None
+        assert cache.get(hrefs[1]) == header
+        cache.put(nc_path, header)
+        assert cache.get(hrefs[2]) is None
+        assert cache.get(hrefs[1]) == header
+        assert len(os.listdir(cache_dir)) == 2
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from netCDF4 import Dataset
+
+from stactools.esa_cci_lc.netcdf.netcdf import to_cube_dimensions
+
+
+def test_to_cube_dimensions() -> None:
+    with Dataset("in-memory.nc", "w", diskless=True) as dataset:
+        dataset.createDimension("time", 1)
+        dataset.createDimension("lat", 64800)
+        dataset.createDimension("lon", 129600)
+        dataset.createDimension("level", 4)
+        dataset.createDimension("bounds", 2)
+        dataset.createDimension("band", 10)
+
+        dataset.createVariable("time", "f8", ("time",))[:] = [17532]
+        # Regularly spaced, decreasing and without valid range
+        dataset.createVariable("lat", "f8", ("lat",))[:] = (
+            90 - 1 / 720 - np.arange(64800) / 360
+        )
+        lon = dataset.createVariable("lon", "f8", ("lon",))
+        lon.valid_min = -180.0
+        lon.valid_max = 180.0
+        dataset.createVariable("level", "f4", ("level",))[:] = [1, 2, 5, 10]
+
+        cube_dims = to_cube_dimensions(dataset)
+
+    assert cube_dims["time"] == {"type": "time", "values": [17532.0]}
+    assert cube_dims["lat"]["extent"] == pytest.approx([-90 + 1 / 720, 90 - 1 / 720])
+    assert cube_dims["lat"]["step"] == pytest.approx(1 / 360)
+    assert "values" not in cube_dims["lat"]
+    assert cube_dims["lon"] == {"type": "lon", "extent": [-180.0, 180.0]}
+    assert cube_dims["level"] == {"type": "level", "values": [1.0, 2.0, 5.0, 10.0]}
+    assert cube_dims["bounds"] == {"type": "bounds", "values": [0, 1]}
+    assert cube_dims["band"] == {"type": "band", "values": list(range(10))}
@@ -0,0 +1,53 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+
+import pytest
+
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
+from stactools.esa_cci_lc.netcdf import stac
+from stactools.esa_cci_lc.netcdf.references import (
+    combine_references,
+    create_references_asset,
+    write_references,
+)
+
+
+def test_create_references_asset() -> None:
+    asset = create_references_asset("/data/refs.parquet", "parquet")
+    assert asset["href"] == "/data/refs.parquet"
+    assert asset["type"] == "application/vnd.apache.parquet"
+    assert "index" in asset["roles"]
+    with pytest.raises(ValueError):
+        write_references({"version": 1, "refs": {}}, "/data/refs.csv", "csv")
+
+
+def test_create_item_with_references() -> None:
+    pytest.importorskip("kerchunk")
+    with TemporaryDirectory() as tmp_dir:
+        reference_hrefs = []
+        for year in [2018, 2019]:
+            nc_path = write_synthetic_netcdf(tmp_dir, year=year, scale=0.001)
+            references_href = os.path.join(tmp_dir, f"{year}.json")
+            item = stac.create_item(nc_path, references_href=references_href)
+            assert item.assets[constants.REFERENCES_KEY].href == references_href
+            reference_hrefs.append(references_href)
+
+        with open(reference_hrefs[0]) as f:
+            refs = json.load(f)["refs"]
+        variables = {key.split("/")[0] for key in refs if "/" in key}
+        assert variables == set(constants.DATA_VARIABLES) | {
+            "lat",
+            "lon",
+            "time",
+            "crs",
+        }
+        # The first chunk of each data variable holds data
+        for variable in constants.DATA_VARIABLES:
+            assert f"{variable}/0.0.0" in refs
+
+        combined = combine_references(reference_hrefs)
+        assert "time/0" in combined["refs"]
+        zarray = json.loads(combined["refs"]["lccs_class/.zarray"])
+        assert zarray["shape"] == [2, *constants.NETCDF_DATA_SHAPE]
@@ -0,0 +1,22 @@
+import click
+import pytest
+
+from stactools.esa_cci_lc.memory import parse_memory, parse_memory_option
+
+
+def test_parse_memory() -> None:
+    assert parse_memory("6GiB") == 6 * 1024**3
+    assert parse_memory("512MB") == 512 * 1000**2
+    assert parse_memory("1.5 gib") == int(1.5 * 1024**3)
+    assert parse_memory("1000") == 1000
+    with pytest.raises(ValueError):
+        parse_memory("6 gigs")
+
+
+def test_parse_memory_option() -> None:
+    ctx = click.Context(click.Command("test"))
+    param = click.Option(["--max-memory"])
+    assert parse_memory_option(ctx, param, None) is None
+    assert parse_memory_option(ctx, param, "64MiB") == 64 * 1024**2
+    with pytest.raises(click.BadParameter):
+        parse_memory_option(ctx, param, "6 gigs")
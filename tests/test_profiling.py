@@ -0,0 +1,82 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from typing import List
+
+from stactools.esa_cci_lc import profiling
+from stactools.esa_cci_lc.profiling import Profiler, StageRecord
+
+
+def test_stage_emits_record() -> None:
+    records: List[StageRecord] = []
+    profiling.add_metrics_hook(records.append)
+    try:
+        assert profiling.enabled()
+        with profiling.stage("read", "lccs_class", "N00E000") as record:
+            record.bytes_read = 10
+            record.pixels = 10
+    finally:
+        profiling.remove_metrics_hook(records.append)
+    assert not profiling.enabled()
+
+    assert records == [record]
+    assert record.stage == "read"
+    assert record.variable == "lccs_class"
+    assert record.tile == "N00E000"
+    assert record.seconds > 0
+
+
+def test_collect() -> None:
+    with profiling.collect() as records:
+        with profiling.stage("read"):
+            pass
+    with profiling.stage("remap"):
+        pass
+    assert [record.stage for record in records] == ["read"]
+    assert not profiling.enabled()
+
+
+def test_profiler() -> None:
+    with Profiler() as profiler:
+        profiling.emit(StageRecord("read", seconds=2.0, bytes_read=100, pixels=50))
+        profiling.emit(StageRecord("read", seconds=3.0, bytes_read=100, pixels=50))
+        profiling.emit(StageRecord("checksum", seconds=1.0, bytes_read=100))
+    profiling.emit(StageRecord("read", seconds=1.0))
+
+    summary = profiler.summary()
+    assert list(summary) == ["read", "checksum"]
+    assert summary["read"]["count"] == 2
+    assert summary["read"]["seconds"] == 5.0
+    assert summary["read"]["bytes_read"] == 200
+    assert summary["read"]["pixels_per_second"] == 20.0
+    assert summary["checksum"]["pixels_per_second"] is None
+
+    table = profiler.format_table().splitlines()
+    assert table[0].split()[0] == "stage"
+    assert table[1].split()[:4] == ["read", "2", "5.00", "83.3%"]
+    assert table[-1].startswith("Wall time")
+
+    with TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "profile.json")
+        profiler.save(path)
+        with open(path) as f:
+            report = json.load(f)
+    assert report["stages"] == json.loads(json.dumps(summary))
+    assert len(report["records"]) == 3
+    assert report["records"][2]["stage"] == "checksum"
+
+
+def test_profile_report() -> None:
+    lines: List[str] = []
+    with profiling.profile_report(None, lines.append) as profiler:
+        assert profiler is None
+    assert not lines
+
+    with TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "profile.json")
+        with profiling.profile_report(path, lines.append) as profiler:
+            with profiling.stage("item"):
+                pass
+        assert os.path.exists(path)
+    assert len(lines) == 1
+    assert "item" in lines[0]
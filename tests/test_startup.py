@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.startup import measure_startup
+
+
+def test_startup() -> None:
+    # The time budget is checked by the benchmark script only, as wall-clock
+    # times vary too much between test machines
+    result = measure_startup(repeat=1)
+    assert result.lazy_modules_imported == []
+
+
+@pytest.mark.parametrize(
+    "module", ["stactools.esa_cci_lc.cog.stac", "stactools.esa_cci_lc.netcdf.stac"]
+)
+def test_stac_modules_use_fsspec(module: str) -> None:
+    # In a fresh process, as other tests may have set fsspec already
+    script = (
+        f"import pystac, {module}; " "print(type(pystac.StacIO.default()).__name__)"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert completed.stdout.strip() == "FsspecStacIO"
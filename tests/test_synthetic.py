@@ -0,0 +1,27 @@
+from tempfile import TemporaryDirectory
+
+import rasterio
+
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
+from stactools.esa_cci_lc.netcdf import stac
+
+
+def test_write_synthetic_netcdf() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        nc_path = write_synthetic_netcdf(
+            tmp_dir, year=2008, version=constants.V1, scale=0.01
+        )
+        assert nc_path.endswith("ESACCI-LC-L4-LCCS-Map-300m-P1Y-2008-v2.0.7cds.nc")
+
+        item = stac.create_item(nc_path)
+        assert item.id == "ESACCI-LC-L4-LCCS-Map-300m-P1Y-2008-v2.0.7cds"
+        assert item.properties["esa_cci_lc:version"] == constants.V1
+        assert item.properties["proj:shape"] == constants.NETCDF_DATA_SHAPE[::-1]
+
+        with rasterio.open(f"netcdf:{nc_path}:lccs_class") as src:
+            assert src.shape == tuple(constants.NETCDF_DATA_SHAPE)
+            assert src.block_shapes == [(2025, 2025)]
+            # The first chunk holds data, the last one only the fill value
+            assert src.read(1, window=((0, 10), (0, 10))).all()
+            assert not src.read(1, window=((64790, 64800), (129590, 129600))).any()
@@ -0,0 +1,97 @@
+import json
+import os
+from tempfile import TemporaryDirectory
+from typing import List
+
+import pytest
+from pystac import Item, ItemCollection
+
+from stactools.esa_cci_lc import constants, writers
+from stactools.esa_cci_lc.cog import stac
+
+
+def _items(tiles: int) -> List[Item]:
+    return [
+        stac.create_item_from_asset_list(
+            [
+                f"C3S-LC-L4-LCCS-Map-300m-P1Y-2018-v2.1.1-N45W{180 - 45 * tile:03d}-"
+                f"{variable}.tif"
+                for variable in constants.DATA_VARIABLES
+            ],
+            cog_tile_dim=16200,
+        )
+        for tile in range(tiles)
+    ]
+
+
+def test_ndjson_writer() -> None:
+    items = _items(3)
+    with TemporaryDirectory() as tmp_dir:
+        path = writers.item_file_path(tmp_dir, "ndjson")
+        assert path.endswith("items.ndjson")
+        with writers.ItemWriter(path) as writer:
+            assert writer.write_all(iter(items)) == 3
+            assert not os.path.exists(path)
+        assert os.listdir(tmp_dir) == ["items.ndjson"]
+
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 3
+        loaded = [Item.from_dict(json.loads(line)) for line in lines]
+        assert [item.id for item in loaded] == [item.id for item in items]
+        assert loaded[0].assets["lccs_class"].href == items[0].assets["lccs_class"].href
+
+
+@pytest.mark.parametrize("tiles", [0, 1, 3])
+def test_item_collection_writer(tiles: int) -> None:
+    items = _items(tiles)
+    with TemporaryDirectory() as tmp_dir:
+        path = writers.item_file_path(tmp_dir, "json")
+        assert path.endswith("items.json")
+        with writers.ItemWriter(path, "json") as writer:
+            writer.write_all(iter(items))
+        assert os.listdir(tmp_dir) == ["items.json"]
+
+        loaded = ItemCollection.from_file(path)
+        assert [item.id for item in loaded] == [item.id for item in items]
+
+
+def test_ndjson_writer_item_dicts() -> None:
+    items = _items(2)
+    with TemporaryDirectory() as tmp_dir:
+        path = writers.item_file_path(tmp_dir, "ndjson")
+        with writers.ItemWriter(path) as writer:
+            writer.write(items[0])
+            writer.write(
+                items[1].to_dict(include_self_link=False, transform_hrefs=False)
+            )
+        with open(path) as f:
+            lines = f.read().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [item.id for item in items]
+
+
+def test_ndjson_writer_failure_leaves_no_file() -> None:
+    with TemporaryDirectory() as tmp_dir:
+        path = writers.item_file_path(tmp_dir, "ndjson")
+        with pytest.raises(RuntimeError):
+            with writers.ItemWriter(path) as writer:
+                writer.write(_items(1)[0])
+                raise RuntimeError("interrupted")
+        assert os.listdir(tmp_dir) == []
+
+
+def test_geoparquet_writer() -> None:
+    pytest.importorskip("stac_geoparquet")
+    import pyarrow.parquet
+
+    with TemporaryDirectory() as tmp_dir:
+        path = writers.item_file_path(tmp_dir, "geoparquet")
+        with writers.ItemWriter(path, "geoparquet") as writer:
+            writer.write_all(_items(2))
+        assert os.listdir(tmp_dir) == ["items.parquet"]
+        assert pyarrow.parquet.read_table(path).num_rows == 2
+
+
+def test_invalid_output_format() -> None:
+    with pytest.raises(ValueError):
+        writers.ItemWriter("items.csv", "csv")
@@ -0,0 +1,66 @@
+import os
+from tempfile import TemporaryDirectory
+from typing import Callable, List
+
+import pystac
+import pytest
+from click import Command, Group
+from stactools.testing.cli_test import CliTestCase
+
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
+from stactools.esa_cci_lc.commands import create_esaccilc_command
+
+
+class CommandsTest(CliTestCase):
+    def create_subcommand_functions(self) -> List[Callable[[Group], Command]]:
+        return [create_esaccilc_command]
+
+    def test_convert(self) -> None:
+        pytest.importorskip("zarr")
+        with TemporaryDirectory() as tmp_dir:
+            nc_path = write_synthetic_netcdf(tmp_dir, shape=(2025, 4050), scale=0.5)
+            zarr_path = os.path.join(tmp_dir, "lc.zarr")
+            item_path = os.path.join(tmp_dir, "item.json")
+
+            result = self.run_command(
+                f"esa-cci-lc zarr convert {nc_path} {zarr_path} {item_path} "
+                "--chunks 2025 2025 --compressor lz4 --shuffle shuffle --threads 2"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            item = pystac.Item.from_file(item_path)
+            assert item.assets[constants.ZARR_KEY].href == zarr_path
+            assert os.path.exists(os.path.join(zarr_path, ".zmetadata"))
+
+    def test_append(self) -> None:
+        pytest.importorskip("zarr")
+        with TemporaryDirectory() as tmp_dir:
+            nc_paths = [
+                write_synthetic_netcdf(tmp_dir, year=year, shape=(2025, 4050))
+                for year in [2018, 2019, 2020]
+            ]
+            cube_path = os.path.join(tmp_dir, "cube.zarr")
+            item_path = os.path.join(tmp_dir, "cube.json")
+
+            result = self.run_command(
+                f"esa-cci-lc zarr append {nc_paths[0]} {nc_paths[1]} {cube_path} "
+                f"{item_path} --variable lccs_class --variable current_pixel_state "
+                "--chunks 2025 2025 --time-chunk 4"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+            result = self.run_command(
+                f"esa-cci-lc zarr append {nc_paths[2]} {cube_path} {item_path}"
+            )
+            assert result.exit_code == 0, "\n{}".format(result.output)
+
+            item = pystac.Item.from_file(item_path)
+            assert item.properties["end_datetime"] == "2020-12-31T23:59:59Z"
+            cube_dimensions = item.assets[constants.ZARR_KEY].extra_fields[
+                "cube:dimensions"
+            ]
+            assert cube_dimensions["time"]["values"] == [17532, 17897, 18262]
+            assert (
+                "current_pixel_state"
+                in item.assets[constants.ZARR_KEY].extra_fields["cube:variables"]
+            )
@@ -0,0 +1,57 @@
+import os
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pytest
+from netCDF4 import Dataset
+
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
+from stactools.esa_cci_lc.zarr import stac
+from stactools.esa_cci_lc.zarr.convert import convert, create_codec
+
+
+def test_convert() -> None:
+    zarr = pytest.importorskip("zarr")
+    with TemporaryDirectory() as tmp_dir:
+        nc_path = write_synthetic_netcdf(tmp_dir, shape=(2025, 4050), scale=0.5)
+        zarr_path = os.path.join(tmp_dir, "lc.zarr")
+        convert(nc_path, zarr_path, chunks=[1000, 1500], threads=2, max_memory=10**7)
+
+        group = zarr.open_consolidated(zarr_path)
+        with Dataset(nc_path) as dataset:
+            dataset.set_auto_maskandscale(False)
+            for variable in constants.DATA_VARIABLES + ["lat", "lon", "time"]:
+                array = group[variable]
+                assert array.attrs["_ARRAY_DIMENSIONS"] == list(
+                    dataset.variables[variable].dimensions
+                )
+                assert np.array_equal(array[...], dataset.variables[variable][...])
+        lccs_class = group["lccs_class"]
+        assert lccs_class.chunks == (1, 1000, 1500)
+        assert lccs_class.compressor == create_codec("zstd", 5, "bitshuffle")
+        # Only the chunks overlapping the upper left NetCDF chunk hold data,
+        # the others aren't written
+        assert lccs_class.nchunks == 9
+        assert lccs_class.nchunks_initialized == 6
+        assert group.attrs["product_version"] == constants.V2
+
+        with pytest.raises(Exception):
+            convert(nc_path, zarr_path)
+        convert(nc_path, zarr_path, overwrite=True)
+
+        item = stac.create_item(nc_path, zarr_path)
+        assert list(item.assets) == [constants.ZARR_KEY]
+        asset = item.assets[constants.ZARR_KEY].to_dict()
+        assert asset["type"] == constants.ZARR_MEDIA_TYPE
+        assert set(asset["cube:dimensions"]) == {"time", "lat", "lon"}
+        assert set(asset["cube:variables"]) == set(
+            constants.DATA_VARIABLES + ["lat", "lon", "time", "crs"]
+        )
+
+
+def test_create_codec() -> None:
+    with pytest.raises(ValueError):
+        create_codec("brotli")
+    with pytest.raises(ValueError):
+        create_codec(shuffle="byteshuffle")
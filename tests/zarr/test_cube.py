@@ -0,0 +1,82 @@
+import os
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pytest
+from netCDF4 import Dataset
+
+from benchmarks.synthetic import write_synthetic_netcdf
+from stactools.esa_cci_lc import constants
+from stactools.esa_cci_lc.zarr import stac
+from stactools.esa_cci_lc.zarr.cube import append_year, read_cube
+
+
+def test_append_year() -> None:
+    zarr = pytest.importorskip("zarr")
+    with TemporaryDirectory() as tmp_dir:
+        cube_path = os.path.join(tmp_dir, "cube.zarr")
+        nc_paths = [
+            write_synthetic_netcdf(
+                tmp_dir, year=year, shape=(2025, 4050), scale=0.5, seed=year
+            )
+            for year in [2018, 2019, 2020]
+        ]
+
+        item = None
+        for index, nc_path in enumerate(nc_paths):
+            assert (
+                append_year(
+                    nc_path,
+                    cube_path,
+                    variables=["lccs_class", "processed_flag"],
+                    chunks=[1000, 1500],
+                    time_chunk=2,
+                    threads=2,
+                )
+                == index
+            )
+            item = stac.create_cube_item(nc_path, cube_path, item)
+
+        cube = zarr.open_consolidated(cube_path)
+        assert cube["lccs_class"].shape == (3, 2025, 4050)
+        assert cube["lccs_class"].chunks == (2, 1000, 1500)
+        assert "observation_count" not in cube
+        # Chunks holding only the fill value aren't written
+        assert cube["lccs_class"].nchunks_initialized == 2 * 6
+        for index, nc_path in enumerate(nc_paths):
+            with Dataset(nc_path) as dataset:
+                dataset.set_auto_maskandscale(False)
+                for variable in ["lccs_class", "processed_flag"]:
+                    assert np.array_equal(
+                        cube[variable][index], dataset.variables[variable][0]
+                    )
+        assert sorted(cube.attrs["years"]) == ["17532", "17897", "18262"]
+
+        variables, times = read_cube(cube_path)
+        assert variables == ["lccs_class", "processed_flag"]
+        assert times == [17532, 17897, 18262]
+
+        # Years are appended in time order, with the variables of the cube
+        with pytest.raises(ValueError):
+            append_year(nc_paths[1], cube_path)
+        with pytest.raises(ValueError):
+            append_year(
+                write_synthetic_netcdf(tmp_dir, year=2021, shape=(2025, 4050)),
+                cube_path,
+                variables=["lccs_class"],
+            )
+
+        assert item is not None
+        assert item.id == constants.CUBE_ID
+        assert item.properties["start_datetime"] == "2018-01-01T00:00:00Z"
+        assert item.properties["end_datetime"] == "2020-12-31T23:59:59Z"
+        asset = item.assets[constants.ZARR_KEY].to_dict()
+        assert asset["cube:dimensions"]["time"]["values"] == times
+        assert set(asset["cube:variables"]) == {
+            "lccs_class",
+            "processed_flag",
+            "lat",
+            "lon",
+            "time",
+            "crs",
+        }